@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, close_old_connections
+
+from news.serializers import NewsSerializer
+from news.views import NewsFeedListMixin
+from students.roles import get_role
+from students.serializers import ReportCardSerializer
+from sync.resources import RESOURCES
+
+
+DEFAULT_DASHBOARD_SETTINGS = {
+    'WORKERS': 4,
+    'NEWS_COUNT': 5,
+    'MATERIALS_COUNT': 5,
+}
+
+
+def get_dashboard_setting(name):
+    return getattr(settings, 'DASHBOARD', {}).get(name, DEFAULT_DASHBOARD_SETTINGS[name])
+
+
+def load_news(request):
+    news = RESOURCES['news'].get_queryset(request).with_feed_data()
+    news_list = list(news[:get_dashboard_setting('NEWS_COUNT')])
+    NewsFeedListMixin().attach_latest_comments(news_list)
+
+    return NewsSerializer(news_list, many=True, context={'request': request}).data
+
+
+def load_resource(name, count=None):
+    def load(request):
+        resource = RESOURCES[name]
+        queryset = resource.get_queryset(request)
+
+        if count is not None:
+            queryset = queryset.order_by('-last_edited_on')[:get_dashboard_setting(count)]
+
+        return resource.serialize(queryset, request)
+
+    return load
+
+
+def load_grades(request):
+    return ReportCardSerializer(get_role(request).student).data
+
+
+SECTIONS = OrderedDict([
+    ('news', load_news),
+    ('exams', load_resource('exams')),
+    ('homeworks', load_resource('homeworks')),
+    ('materials', load_resource('materials', count='MATERIALS_COUNT')),
+    ('grades', load_grades),
+])
+
+
+class SectionLoader(object):
+    """
+    Loads independent sections of a response on a bounded thread pool, each
+    worker querying through its own connection. The request must have been
+    authenticated and its role resolved beforehand, since workers only read
+    from it.
+
+    Inside a transaction (e.g. ATOMIC_REQUESTS or tests) the sections are
+    loaded in the request's thread, as other connections would not see its
+    uncommitted rows.
+    """
+    def __init__(self):
+        self.executor = None
+        self.executor_lock = threading.Lock()
+
+    def get_executor(self):
+        with self.executor_lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(get_dashboard_setting('WORKERS'))
+
+            return self.executor
+
+    @staticmethod
+    def run(load, request):
+        started = time.perf_counter()
+        data = load(request)
+
+        return data, time.perf_counter() - started
+
+    @classmethod
+    def run_in_worker(cls, load, request):
+        try:
+            return cls.run(load, request)
+        finally:
+            # Like at the end of a request: keeps the worker's connection for
+            # CONN_MAX_AGE, but never a broken one.
+            close_old_connections()
+
+    def load(self, request, sections):
+        """
+        Returns an OrderedDict of section name -> (data, seconds spent).
+        """
+        if connection.in_atomic_block or get_dashboard_setting('WORKERS') == 0:
+            return OrderedDict(
+                (name, self.run(load, request)) for name, load in sections.items()
+            )
+
+        executor = self.get_executor()
+        futures = OrderedDict(
+            (name, executor.submit(self.run_in_worker, load, request))
+            for name, load in sections.items()
+        )
+
+        return OrderedDict((name, future.result()) for name, future in futures.items())
+
+
+section_loader = SectionLoader()
@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.reverse import reverse
+from rest_framework import status
+
+from exams.models import Exam
+from homeworks.models import Homework
+from materials.models import Material
+from news.models import News
+from students.models import Class, Subject, Student, Teacher, Grade
+from students.testing import APITestCase, APITransactionTestCase
+from students.roles import get_role
+
+from .sections import SECTIONS, section_loader
+
+
+class DashboardTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('dashboard:dashboard')
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.other_clazz = Class.objects.create(number=11, letter='B')
+        self.subject = Subject.objects.create(title='Maths')
+
+        self.student_user = User.objects.create(username='student', password='pass')
+        self.student = Student.objects.create(user=self.student_user, clazz=self.clazz)
+
+        self.teacher_user = User.objects.create(username='teacher', password='pass')
+        self.teacher = Teacher.objects.create(user=self.teacher_user, subject=self.subject)
+
+        self.news = News.objects.create(
+            title='test news', content='test content', class_number=10, class_letter='A',
+            author=self.teacher_user
+        )
+        self.exam = Exam.objects.create(
+            subject=self.subject, clazz=self.clazz, date=date.today() + timedelta(days=7),
+            topic='test topic', author=self.teacher
+        )
+        Exam.objects.create(
+            subject=self.subject, clazz=self.other_clazz, date=date.today() + timedelta(days=7),
+            topic='other class', author=self.teacher
+        )
+        self.homework = Homework.objects.create(
+            subject=self.subject, clazz=self.clazz, deadline=date.today(),
+            details='detailed explanation', author=self.teacher
+        )
+        self.material = Material.objects.create(
+            title='test material', section='test section', content='test content',
+            class_number=10, subject=self.subject, author=self.teacher
+        )
+        Grade.objects.create(value=5, subject=self.subject, student=self.student)
+
+        self.client.force_authenticate(user=self.student_user)
+
+    def test_dashboard_with_anonymous_user(self):
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_dashboard_as_teacher(self):
+        self.client.force_authenticate(user=self.teacher_user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_dashboard_sections(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), list(SECTIONS))
+        self.assertEqual(response.data['news'][0]['id'], self.news.id)
+        self.assertEqual([exam['id'] for exam in response.data['exams']], [self.exam.id])
+        self.assertEqual(response.data['homeworks'][0]['id'], self.homework.id)
+        self.assertEqual(response.data['materials'][0]['id'], self.material.id)
+        self.assertEqual(response.data['grades']['average'], 5)
+
+    def test_dashboard_timings(self):
+        response = self.client.get(self.url)
+
+        timings = [timing.split(';')[0] for timing in response['Server-Timing'].split(', ')]
+        self.assertEqual(timings, list(SECTIONS))
+
+    @override_settings(DASHBOARD={'MATERIALS_COUNT': 1})
+    def test_dashboard_materials_count(self):
+        Material.objects.create(
+            title='new material', section='test section', content='test content',
+            class_number=10, subject=self.subject, author=self.teacher
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual([material['title'] for material in response.data['materials']], [
+            'new material'
+        ])
+
+
+class SectionLoaderTestCase(APITransactionTestCase):
+    def setUp(self):
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.subject = Subject.objects.create(title='Maths')
+        self.user = User.objects.create(username='student', password='pass')
+        self.student = Student.objects.create(user=self.user, clazz=self.clazz)
+        Grade.objects.create(value=5, subject=self.subject, student=self.student)
+
+    def test_sections_are_loaded_by_workers(self):
+        request = APIRequestFactory().get('/')
+        request.user = self.user
+        get_role(request)
+
+        sections = section_loader.load(request, SECTIONS)
+
+        self.assertEqual(list(sections), list(SECTIONS))
+        self.assertEqual(sections['grades'][0]['average'], 5)
@@ -0,0 +1,10 @@
+from django.conf.urls import url
+
+from . import views
+
+
+app_name = 'dashboard'
+
+urlpatterns = [
+    url(r'^dashboard/$', views.Dashboard.as_view(), name='dashboard'),
+]
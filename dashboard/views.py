@@ -0,0 +1,31 @@
+from collections import OrderedDict
+
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from students.permissions import IsStudent
+
+from .sections import SECTIONS, section_loader
+
+
+class Dashboard(generics.GenericAPIView):
+    """
+    Everything the student home screen shows: the latest news, upcoming exams
+    and homeworks, the latest materials and the report card. The time spent
+    on each section is sent in the `Server-Timing` header.
+    """
+    permission_classes = (IsAuthenticated, IsStudent)
+
+    def get(self, request, *args, **kwargs):
+        sections = section_loader.load(request, SECTIONS)
+
+        response = Response(OrderedDict(
+            (name, data) for name, (data, elapsed) in sections.items()
+        ))
+        response['Server-Timing'] = ', '.join(
+            '{};dur={:.1f}'.format(name, elapsed * 1000)
+            for name, (data, elapsed) in sections.items()
+        )
+
+        return response
@@ -7,4 +7,6 @@ urlpatterns = [
     url(r'^', include('homeworks.urls', namespace='homeworks')),
     url(r'^', include('materials.urls', namespace='materials')),
     url(r'^', include('talks.urls', namespace='talks')),
+    url(r'^', include('sync.urls', namespace='sync')),
+    url(r'^', include('dashboard.urls', namespace='dashboard')),
 ]
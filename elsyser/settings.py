@@ -54,6 +54,10 @@ INSTALLED_APPS = [
     'homeworks',
     'materials',
     'talks',
+    'outbox',
+    'search',
+    'sync',
+    'dashboard',
 ]
 
 MIDDLEWARE = [
@@ -99,6 +103,15 @@ DATABASES = {
 }
 
 
+# Authentication backends
+# Users log in with their email or username; password checks are cached and
+# throttled, see `students.credentials`
+
+AUTHENTICATION_BACKENDS = (
+    'students.backends.EmailOrUsernameBackend',
+)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/1.10/ref/settings/#auth-password-validators
 
@@ -181,13 +194,124 @@ EMAIL_USE_TLS = True
 DEFAULT_FROM_EMAIL = 'elsyser.bot@gmail.com'
 
 
+# Email outbox settings (delivered by `python3 manage.py send_outbox`)
+
+OUTBOX = {
+    'BATCH_SIZE': 50,
+    'LEASE_SECONDS': 60,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF_SECONDS': 30,
+}
+
+
+# Delta sync settings (old tombstones are deleted by `python3 manage.py prune_tombstones`)
+# Long-poll requests wait up to WAIT_TIMEOUT seconds and check NOTIFY_CACHE for
+# notifications from other workers every CHECK_INTERVAL seconds
+
+SYNC = {
+    'OVERLAP_SECONDS': 5,
+    'TOMBSTONE_RETENTION_DAYS': 30,
+    'WAIT_TIMEOUT': 25,
+    'MAX_WAIT_TIMEOUT': 55,
+    'CHECK_INTERVAL': 1,
+    'NOTIFY_CACHE': 'default',
+}
+
+
+# Student dashboard settings
+# Sections are loaded concurrently by WORKERS threads per process, each with its own connection
+
+DASHBOARD = {
+    'WORKERS': 4,
+    'NEWS_COUNT': 5,
+    'MATERIALS_COUNT': 5,
+}
+
+
+# Profile image URL validation settings
+# MODE is either 'sync' (check before saving) or 'background' (save, then check)
+
+PROFILE_IMAGE_URL_VALIDATION = {
+    'MODE': 'sync',
+    'CONNECT_TIMEOUT': 2,
+    'READ_TIMEOUT': 3,
+    'CACHE_SIZE': 1024,
+    'POSITIVE_TTL': 60 * 60,
+    'NEGATIVE_TTL': 5 * 60,
+}
+
+
+# Cache settings
+# Use a shared backend (e.g. FileBasedCache or DatabaseCache after
+# `python3 manage.py createcachetable`) when running several gunicorn workers
+# `manage.py check --deploy` fails while the caches below are per-process
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+# Shared response cache for class-wide list endpoints
+# Tests clear every cache before each test, see `students.testing`
+
+RESPONSE_CACHE = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'TIMEOUT': 5 * 60,
+    'MAX_VARIANTS': 20,
+}
+
+
+# Per-process copies of the Subject and Class tables
+
+REFERENCE_DATA = {
+    'ENABLED': True,
+    'CACHE': 'default',
+}
+
+
+# Signed access and refresh tokens, see `students.authentication`
+# Revocations are kept in this cache, so it has to be shared between workers in production;
+# `manage.py check --deploy` fails while it is a per-process LocMemCache
+
+SIGNED_TOKENS = {
+    'ACCESS_LIFETIME': 15 * 60,
+    'REFRESH_LIFETIME': 14 * 24 * 60 * 60,
+    'CACHE': 'default',
+}
+
+
+# Cached password checks for Basic auth and login, kept in each worker's memory
+# Checks that have to hash a password are throttled with token buckets of
+# (capacity, seconds to refill) per IP address and per account
+
+CREDENTIALS = {
+    'CACHE_TIMEOUT': 5 * 60,
+    'CACHE_MAX_ENTRIES': 10000,
+    'THROTTLE_CACHE': 'default',
+    'IP_THROTTLE': (100, 60),
+    'ACCOUNT_THROTTLE': (10, 60),
+}
+
+
+# Pagination settings
+# Clients pick a page size with `?page_size=` up to MAX_PAGE_SIZE
+
+PAGINATION = {
+    'MAX_PAGE_SIZE': 100,
+}
+
+
 # Django REST Framework settings
 
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'students.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.BasicAuthentication',
+        'students.authentication.ThrottledBasicAuthentication',
+        'students.authentication.SignedTokenAuthentication',
         'rest_framework.authentication.TokenAuthentication',
     )
 }
@@ -0,0 +1,168 @@
+import re
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.utils import timezone
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from students.models import Class, Subject, Student, Teacher, Grade
+from students.testing import TestCase
+from students.views import GradesList
+from news.models import News, Comment
+from news.views import NewsStudentsViewSet, NewsTeachersViewSet, CommentsViewSet
+from exams.models import Exam
+from exams.views import ExamsViewSet
+from homeworks.models import Homework, Submission
+from homeworks.views import HomeworksViewSet, SubmissionsViewSet
+from materials.models import Material
+from materials.views import MaterialsListViewSet
+
+
+def get_query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Tables in tests are tiny, so make the planner prefer any usable index.
+            cursor.execute('SET enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + sql, params)
+            plan = [row[0] for row in cursor.fetchall()]
+            cursor.execute('SET enable_seqscan = on')
+        else:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = [row[-1] for row in cursor.fetchall()]
+
+    return plan
+
+
+def get_full_scans(plan, table):
+    if connection.vendor == 'postgresql':
+        pattern = r'Seq Scan on {}\b'.format(table)
+    else:
+        pattern = r'^SCAN (TABLE )?{}$'.format(table)
+
+    return [line for line in plan if re.search(pattern, line.strip())]
+
+
+class QueryPlanTestCase(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.subject = Subject.objects.create(title='Maths')
+
+        self.student_user = User.objects.create(username='student', password='pass')
+        self.student = Student.objects.create(
+            user=self.student_user, clazz=self.clazz, activation_key='key'
+        )
+
+        self.teacher_user = User.objects.create(username='teacher', password='pass')
+        self.teacher = Teacher.objects.create(user=self.teacher_user, subject=self.subject)
+
+        self.news = News.objects.create(
+            title='news', content='content', author=self.teacher_user,
+            class_number=self.clazz.number, class_letter=self.clazz.letter
+        )
+        Comment.objects.create(news=self.news, author=self.student_user, content='comment')
+
+        date = timezone.now().date() + timedelta(days=7)
+        Exam.objects.create(
+            subject=self.subject, date=date, clazz=self.clazz, topic='exam', author=self.teacher
+        )
+        self.homework = Homework.objects.create(
+            subject=self.subject, clazz=self.clazz, deadline=date, author=self.teacher
+        )
+        Submission.objects.create(homework=self.homework, student=self.student, content='done')
+        Material.objects.create(
+            title='material', content='content', class_number=10,
+            subject=self.subject, author=self.teacher
+        )
+        Grade.objects.create(value=5, subject=self.subject, student=self.student)
+
+    def get_list_queryset(self, view_class, user, query_params=None, **kwargs):
+        request = Request(self.factory.get('/', query_params or {}))
+        request.user = user
+
+        view = view_class()
+        view.request = request
+        view.kwargs = kwargs
+        view.args = ()
+        view.action = 'list'
+        view.format_kwarg = None
+
+        return view.filter_queryset(view.get_queryset())
+
+    def assertUsesIndex(self, queryset, table):
+        plan = get_query_plan(queryset)
+
+        self.assertFalse(get_full_scans(plan, table), '\n'.join(plan))
+
+    def test_students_news_list_uses_index(self):
+        queryset = self.get_list_queryset(NewsStudentsViewSet, self.student_user)
+
+        self.assertUsesIndex(queryset, 'news_news')
+
+    def test_teachers_news_list_uses_index(self):
+        queryset = self.get_list_queryset(
+            NewsTeachersViewSet, self.teacher_user, class_number=10, class_letter='A'
+        )
+
+        self.assertUsesIndex(queryset, 'news_news')
+
+    def test_comments_list_uses_index(self):
+        queryset = self.get_list_queryset(
+            CommentsViewSet, self.student_user, students_news_pk=self.news.id
+        )
+
+        self.assertUsesIndex(queryset, 'news_comment')
+
+    def test_exams_list_uses_index(self):
+        for user in (self.student_user, self.teacher_user):
+            queryset = self.get_list_queryset(ExamsViewSet, user)
+
+            self.assertUsesIndex(queryset, 'exams_exam')
+
+    def test_homeworks_list_uses_index(self):
+        for user in (self.student_user, self.teacher_user):
+            queryset = self.get_list_queryset(HomeworksViewSet, user)
+
+            self.assertUsesIndex(queryset, 'homeworks_homework')
+
+    def test_submissions_list_uses_index(self):
+        for user in (self.student_user, self.teacher_user):
+            queryset = self.get_list_queryset(
+                SubmissionsViewSet, user, homeworks_pk=self.homework.id
+            )
+
+            self.assertUsesIndex(queryset, 'homeworks_submission')
+
+    def test_unchecked_submissions_use_partial_index(self):
+        queryset = self.homework.submissions.unchecked().order_by('posted_on', 'id')
+        plan = get_query_plan(queryset)
+
+        self.assertTrue(
+            any('homeworks_submission_unchecked' in line for line in plan), '\n'.join(plan)
+        )
+
+    def test_materials_list_uses_index(self):
+        for user in (self.student_user, self.teacher_user):
+            queryset = self.get_list_queryset(MaterialsListViewSet, user)
+
+            self.assertUsesIndex(queryset, 'materials_material')
+
+    def test_grades_list_uses_index(self):
+        queryset = self.get_list_queryset(
+            GradesList, self.teacher_user,
+            query_params={'class_number': 10, 'class_letter': 'A'},
+            subject_pk=self.subject.id
+        )
+
+        self.assertUsesIndex(queryset, 'students_grade')
+
+    def test_activation_lookup_uses_index(self):
+        queryset = User.objects.filter(student__activation_key='key')
+
+        self.assertUsesIndex(queryset, 'students_student')
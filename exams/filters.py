@@ -1,11 +1,13 @@
 from rest_framework import filters
 
-from students.permissions import IsTeacher
+from students.roles import get_role
 
 
 class ExamsFilterBackend(filters.BaseFilterBackend):
     def filter_queryset(self, request, queryset, view):
-        if IsTeacher().has_permission(request, self):
-            return queryset.filter(subject=request.user.teacher.subject)
+        role = get_role(request)
 
-        return queryset.filter(clazz=request.user.student.clazz)
+        if role.is_teacher:
+            return queryset.filter(subject=role.subject)
+
+        return queryset.filter(clazz=role.clazz)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.2 on 2026-10-16 21:01
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0003_auto_20170919_2248'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='exam',
+            index_together=set([('subject', 'date'), ('clazz', 'date')]),
+        ),
+    ]
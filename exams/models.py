@@ -12,9 +12,14 @@ class Exam(models.Model):
     topic = models.CharField(max_length=60)
     details = models.TextField(max_length=10000, blank=True)
     author = models.ForeignKey(Teacher, null=True, related_name='exams', on_delete=models.CASCADE)
+    last_edited_on = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return '{} - {} ({})'.format(self.subject, self.clazz, self.date)
 
     class Meta:
         ordering = ['date', 'subject', 'clazz']
+        index_together = [
+            ['clazz', 'date'],
+            ['subject', 'date'],
+        ]
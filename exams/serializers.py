@@ -1,11 +1,13 @@
 from django.contrib.auth.models import User
 
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
 
-from students.models import Class
-from students.serializers import ClassSerializer, SubjectSerializer, TeacherAuthorSerializer
-from students.utils import send_creation_email
+from students.reference import get_class_or_404
+from students.roles import get_role
+from students.serializers import (
+    ClassSerializer, SubjectSerializer, TeacherAuthorSerializer, ClassScheduleSerializerMixin
+)
+from students.utils import send_creation_emails
 
 from .models import Exam
 
@@ -23,15 +25,14 @@ class ExamSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         request = self.context['request']
 
-        author = request.user.teacher
+        author = get_role(request).teacher
         subject = author.subject
-        clazz = get_object_or_404(Class, **validated_data.pop('clazz'))
+        clazz = get_class_or_404(**validated_data.pop('clazz'))
 
         exam = Exam.objects.create(subject=subject, author=author, clazz=clazz, **validated_data)
 
         recipient_list = User.objects.filter(student__clazz=clazz)
-        for user in recipient_list:
-            send_creation_email(user, model=exam)
+        send_creation_emails(recipient_list, model=exam)
 
         return exam
 
@@ -46,3 +47,10 @@ class ExamReadSerializer(ExamSerializer):
     subject = SubjectSerializer(read_only=True)
     clazz = ClassSerializer(read_only=True)
     author = TeacherAuthorSerializer(read_only=True)
+
+
+class ExamScheduleSerializer(ClassScheduleSerializerMixin, ExamSerializer):
+    classes = ClassSerializer(many=True)
+
+    class Meta(ExamSerializer.Meta):
+        fields = ('id', 'subject', 'date', 'classes', 'topic', 'details', 'author')
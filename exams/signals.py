@@ -0,0 +1,40 @@
+from collections import OrderedDict
+
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from students.caching import invalidate_responses, get_saved_values
+from students.signals import post_bulk_create
+
+from .models import Exam
+
+
+def get_exam_audiences(clazz_id, subject_id):
+    return [('class', clazz_id), ('subject', subject_id)]
+
+
+def remember_exam_audiences(sender, instance, raw=False, **kwargs):
+    saved = None if raw else get_saved_values(instance, 'clazz', 'subject')
+    instance.previous_audiences = (
+        get_exam_audiences(saved['clazz'], saved['subject']) if saved else []
+    )
+
+
+def invalidate_exams(sender, instance, **kwargs):
+    audiences = get_exam_audiences(instance.clazz_id, instance.subject_id)
+    invalidate_responses('exams', audiences + getattr(instance, 'previous_audiences', []))
+
+
+def invalidate_created_exams(sender, objects, **kwargs):
+    audiences = OrderedDict(
+        (audience, None)
+        for obj in objects for audience in get_exam_audiences(obj.clazz_id, obj.subject_id)
+    )
+    invalidate_responses('exams', list(audiences))
+
+
+pre_save.connect(remember_exam_audiences, sender=Exam, dispatch_uid='exam_responses_pre_save')
+post_save.connect(invalidate_exams, sender=Exam, dispatch_uid='exam_responses_save')
+post_delete.connect(invalidate_exams, sender=Exam, dispatch_uid='exam_responses_delete')
+post_bulk_create.connect(
+    invalidate_created_exams, sender=Exam, dispatch_uid='exam_responses_bulk_create'
+)
@@ -1,12 +1,16 @@
-from datetime import datetime
+import gzip
+import json
+from datetime import date, datetime, timedelta
 
 from django.contrib.auth.models import User
 
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APIClient
 from rest_framework.reverse import reverse
 from rest_framework import status
 
+from outbox.models import Message
 from students.models import Class, Subject, Teacher, Student
+from students.testing import APITestCase
 
 from .serializers import ExamSerializer
 from .models import Exam
@@ -265,3 +269,144 @@ class ExamsViewSetTestCase(APITestCase):
 
         self.assertEqual(Exam.objects.count(), 1)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class ExamsResponseCacheTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('exams:exams-list')
+
+        self.subject = Subject.objects.create(title='Maths')
+        self.teacher_user = User.objects.create(username='teacher', password='123456')
+        self.teacher = Teacher.objects.create(user=self.teacher_user, subject=self.subject)
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.first_user = User.objects.create(username='first', password='pass')
+        self.second_user = User.objects.create(username='second', password='pass')
+        Student.objects.create(user=self.first_user, clazz=self.clazz)
+        Student.objects.create(user=self.second_user, clazz=self.clazz)
+
+        self.exam = Exam.objects.create(
+            subject=self.subject,
+            date=date.today() + timedelta(days=7),
+            clazz=self.clazz,
+            topic='test topic',
+            author=self.teacher
+        )
+
+    def test_exams_list_is_shared_within_class(self):
+        self.client.force_authenticate(user=self.first_user)
+        response = self.client.get(self.url)
+
+        self.client.force_authenticate(user=self.second_user)
+        with self.assertNumQueries(1):
+            cached_response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(cached_response['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            json.loads(gzip.decompress(cached_response.content).decode('utf-8')),
+            json.loads(response.content.decode('utf-8'))
+        )
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+
+    def test_exams_list_from_cache_without_gzip(self):
+        self.client.force_authenticate(user=self.first_user)
+        response = self.client.get(self.url)
+        cached_response = self.client.get(self.url)
+
+        self.assertNotIn('Content-Encoding', cached_response)
+        self.assertEqual(cached_response.content, response.content)
+
+    def test_exams_list_not_modified_from_cache(self):
+        self.client.force_authenticate(user=self.first_user)
+        etag = self.client.get(self.url)['ETag']
+
+        self.client.force_authenticate(user=self.second_user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_exams_list_cache_is_invalidated_on_change(self):
+        self.client.force_authenticate(user=self.first_user)
+        self.client.get(self.url)
+
+        self.exam.topic = 'changed topic'
+        self.exam.save()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['results'][0]['topic'], 'changed topic')
+
+        self.exam.delete()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['count'], 0)
+
+    def test_exams_list_cache_is_not_shared_with_teachers(self):
+        self.client.force_authenticate(user=self.first_user)
+        self.client.get(self.url)
+
+        self.client.force_authenticate(user=self.teacher_user)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ExamsScheduleTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('exams:exams-list')
+
+        self.subject = Subject.objects.create(title='Maths')
+        self.teacher_user = User.objects.create(username='teacher', password='123456')
+        self.teacher = Teacher.objects.create(user=self.teacher_user, subject=self.subject)
+
+        self.classes = [Class.objects.create(number=10, letter=letter) for letter in 'ABV']
+        for clazz in self.classes:
+            for index in range(2):
+                user = User.objects.create(
+                    username='{}{}'.format(clazz, index), email='student@test.com'
+                )
+                Student.objects.create(user=user, clazz=clazz)
+
+        self.post_data = {
+            'date': str(date.today() + timedelta(days=7 - date.today().weekday())),
+            'topic': 'test topic',
+            'details': 'detailed information',
+            'classes': [{'number': 10, 'letter': 'A'}, {'number': 10, 'letter': 'B'}]
+        }
+
+        self.client.force_authenticate(user=self.teacher_user)
+
+    def test_exams_schedule_for_many_classes(self):
+        response = self.client.post(self.url, self.post_data, format='json')
+
+        self.assertEqual(
+            [exam['clazz']['letter'] for exam in response.data], ['A', 'B']
+        )
+        self.assertEqual(
+            sorted(Exam.objects.values_list('id', flat=True)),
+            sorted(exam['id'] for exam in response.data)
+        )
+        self.assertEqual(
+            sorted(Message.objects.values_list('subject', flat=True)),
+            ['ELSYSER exam added'] * 4
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_exams_schedule_with_unknown_class(self):
+        self.post_data['classes'].append({'number': 10, 'letter': 'G'})
+
+        response = self.client.post(self.url, self.post_data, format='json')
+
+        self.assertEqual(response.data['classes'][:2], [{}, {}])
+        self.assertIn('non_field_errors', response.data['classes'][2])
+        self.assertFalse(Exam.objects.exists())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_exams_schedule_without_classes(self):
+        self.post_data['classes'] = []
+
+        response = self.client.post(self.url, self.post_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -7,14 +7,17 @@ from rest_framework.permissions import IsAuthenticated
 
 from rest_framework_word_filter import FullWordSearchFilter
 
+from students.caching import ResponseCacheMixin
+from students.conditional import ConditionalResponseMixin
 from students.permissions import IsTeacher, IsTeacherAuthor
+from students.roles import get_role
 
-from .serializers import ExamSerializer, ExamReadSerializer
+from .serializers import ExamSerializer, ExamReadSerializer, ExamScheduleSerializer
 from .models import Exam
 from .filters import ExamsFilterBackend
 
 
-class ExamsViewSet(viewsets.ModelViewSet):
+class ExamsViewSet(ResponseCacheMixin, ConditionalResponseMixin, viewsets.ModelViewSet):
     permission_classes_by_action = {
         'list': (IsAuthenticated,),
         'retrieve': (IsAuthenticated,),
@@ -25,6 +28,8 @@ class ExamsViewSet(viewsets.ModelViewSet):
     queryset = Exam.objects.filter(date__gte=datetime.now())
     filter_backends = (ExamsFilterBackend, FullWordSearchFilter)
     word_fields = ('topic',)
+    cache_namespace = 'exams'
+    timestamp_fields = ('last_edited_on',)
 
     def get_permissions(self):
         return [
@@ -36,7 +41,20 @@ class ExamsViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         return ExamReadSerializer if self.request.method in ('GET',) else ExamSerializer
 
+    def get_cache_audience(self):
+        role = get_role(self.request)
+
+        if role.is_teacher:
+            return ('subject', role.subject.id)
+        if role.is_student:
+            return ('class', role.clazz.id)
+
+        return None
+
     def create(self, request, *args, **kwargs):
+        if 'classes' in request.data:
+            return self.schedule(request)
+
         context = {'request': request}
 
         serializer = self.get_serializer(data=request.data, context=context)
@@ -47,6 +65,15 @@ class ExamsViewSet(viewsets.ModelViewSet):
 
         return Response(serializer.validated_data, status=status.HTTP_201_CREATED, headers=headers)
 
+    def schedule(self, request):
+        serializer = ExamScheduleSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        exams = serializer.save()
+
+        return Response(
+            ExamReadSerializer(exams, many=True).data, status=status.HTTP_201_CREATED
+        )
+
     def update(self, request, *args, **kwargs):
         exam = get_object_or_404(Exam, id=kwargs['pk'])
         self.check_object_permissions(request, exam)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class HomeworksConfig(AppConfig):
     name = 'homeworks'
+
+    def ready(self):
+        from . import signals  # noqa
@@ -1,19 +1,23 @@
 from rest_framework import filters
 
-from students.permissions import IsTeacher, IsStudent
+from students.roles import get_role
 
 
 class HomeworksFilterBackend(filters.BaseFilterBackend):
     def filter_queryset(self, request, queryset, view):
-        if IsTeacher().has_permission(request, self):
-            return queryset.filter(subject=request.user.teacher.subject)
+        role = get_role(request)
 
-        return queryset.filter(clazz=request.user.student.clazz)
+        if role.is_teacher:
+            return queryset.filter(subject=role.subject)
+
+        return queryset.filter(clazz=role.clazz)
 
 
 class SubmissionsFilterBackend(filters.BaseFilterBackend):
     def filter_queryset(self, request, queryset, view):
-        if IsStudent().has_permission(request, self):
-            return queryset.filter(student=request.user.student)
+        role = get_role(request)
+
+        if role.is_student:
+            return queryset.filter(student=role.student)
 
-        return queryset.filter(checked=False)
+        return queryset.unchecked()
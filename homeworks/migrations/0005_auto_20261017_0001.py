@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.2 on 2026-10-16 21:01
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+# Django filters booleans as `checked = 0` on SQLite and `checked = false` on
+# PostgreSQL; the index predicate has to be written the same way for the
+# planner to match it.
+UNCHECKED_PREDICATES = {
+    'sqlite': 'checked = 0',
+    'postgresql': 'NOT checked',
+}
+
+
+def create_unchecked_submissions_index(apps, schema_editor):
+    predicate = UNCHECKED_PREDICATES.get(schema_editor.connection.vendor)
+
+    if predicate is not None:
+        schema_editor.execute(
+            'CREATE INDEX homeworks_submission_unchecked '
+            'ON homeworks_submission (homework_id, posted_on) WHERE ' + predicate
+        )
+
+
+def drop_unchecked_submissions_index(apps, schema_editor):
+    if schema_editor.connection.vendor in UNCHECKED_PREDICATES:
+        schema_editor.execute('DROP INDEX homeworks_submission_unchecked')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homeworks', '0004_auto_20171118_1854'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='homework',
+            index_together=set([('clazz', 'deadline'), ('subject', 'deadline')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='submission',
+            index_together=set([('homework', 'student')]),
+        ),
+        migrations.RunPython(
+            create_unchecked_submissions_index,
+            drop_unchecked_submissions_index
+        ),
+    ]
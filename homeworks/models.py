@@ -1,10 +1,44 @@
-from django.db import models
+from django.db import connections, models
 
 from students.models import Class, Subject, Teacher, Student
 
 from news.models import BaseAbstractPost
 
 
+class HomeworkQuerySet(models.QuerySet):
+    def with_submission_counts(self):
+        """
+        Annotates `submitted` and `unchecked` submission counts and the
+        homework's `class_size` in one grouped query.
+        """
+        class_size = 'SELECT COUNT(*) FROM {students} WHERE {students}.clazz_id = {table}.clazz_id'
+
+        return self.annotate(
+            submitted=models.Count('submissions'),
+            unchecked=models.Sum(models.Case(
+                models.When(submissions__checked=False, then=1),
+                default=0,
+                output_field=models.IntegerField()
+            ))
+        ).extra(select={
+            'class_size': class_size.format(
+                students=Student._meta.db_table, table=self.model._meta.db_table
+            )
+        })
+
+
+class SubmissionQuerySet(models.QuerySet):
+    def unchecked(self):
+        """
+        SQLite only uses the partial index on unchecked submissions when the
+        query repeats its predicate with a constant, not a bound parameter.
+        """
+        if connections[self.db].vendor == 'sqlite':
+            return self.extra(where=['{}.checked = 0'.format(self.model._meta.db_table)])
+
+        return self.filter(checked=False)
+
+
 class Homework(models.Model):
     topic = models.CharField(default='Homework', max_length=50)
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
@@ -12,12 +46,19 @@ class Homework(models.Model):
     deadline = models.DateField(auto_now=False)
     details = models.TextField(max_length=256, blank=True)
     author = models.ForeignKey(Teacher, null=True, related_name='homeworks', on_delete=models.CASCADE)
+    last_edited_on = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = HomeworkQuerySet.as_manager()
 
     def __str__(self):
         return '{} ({}) - {}'.format(self.topic, self.subject, self.clazz)
 
     class Meta:
         ordering = ['deadline', 'clazz', 'subject']
+        index_together = [
+            ['clazz', 'deadline'],
+            ['subject', 'deadline'],
+        ]
 
 
 class Submission(BaseAbstractPost):
@@ -27,8 +68,13 @@ class Submission(BaseAbstractPost):
     solution_url = models.URLField(blank=True)
     checked = models.BooleanField(default=False)
 
+    objects = SubmissionQuerySet.as_manager()
+
     def __str__(self):
         return '{} - {} ({})'.format(self.student, self.homework, self.posted_on)
 
     class Meta:
         ordering = ['-posted_on', '-last_edited_on']
+        index_together = [
+            ['homework', 'student'],
+        ]
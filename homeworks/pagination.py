@@ -0,0 +1,11 @@
+from students.pagination import CursorPagination, TimeOrderedPagination
+
+
+class SubmissionsPagination(TimeOrderedPagination):
+    ordering = ('-posted_on', '-id')
+    default_pagination_class = None
+
+
+class UncheckedSubmissionsPagination(CursorPagination):
+    def __init__(self):
+        super().__init__(('posted_on', 'id'))
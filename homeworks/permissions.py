@@ -1,16 +1,18 @@
 from rest_framework import permissions
 
+from students.roles import get_role
+
 
 class HasOnlyOneSubmission(permissions.BasePermission):
     message = 'You can submit only one submission.'
 
     def has_object_permission(self, request, view, obj):
-        return not obj.submissions.filter(student=request.user.student).exists()
+        return not obj.submissions.filter(student=get_role(request).student).exists()
 
 
 class IsValidStudent(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.student == request.user.student
+        return obj.student == get_role(request).student
 
 
 class IsNotChecked(permissions.BasePermission):
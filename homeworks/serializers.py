@@ -2,10 +2,12 @@ from django.contrib.auth.models import User
 
 from rest_framework import serializers
 
+from students.roles import get_role
 from students.serializers import (
-    ClassSerializer, SubjectSerializer, TeacherAuthorSerializer, StudentAuthorSerializer
+    ClassSerializer, SubjectSerializer, TeacherAuthorSerializer, StudentAuthorSerializer,
+    ClassScheduleSerializerMixin
 )
-from students.utils import send_creation_email
+from students.utils import send_creation_emails
 
 from .models import Homework, Submission
 
@@ -23,7 +25,7 @@ class SubmissionSerializer(serializers.ModelSerializer):
         homework = self.context['homework']
         request = self.context['request']
 
-        student = request.user.student
+        student = get_role(request).student
 
         return Submission.objects.create(homework=homework, student=student, **validated_data)
 
@@ -43,7 +45,7 @@ class HomeworkSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         request = self.context['request']
 
-        author = request.user.teacher
+        author = get_role(request).teacher
         subject = author.subject
         clazz = self.context['clazz']
 
@@ -55,8 +57,7 @@ class HomeworkSerializer(serializers.ModelSerializer):
         )
 
         recipient_list = User.objects.filter(student__clazz=clazz)
-        for user in recipient_list:
-            send_creation_email(user, model=homework)
+        send_creation_emails(recipient_list, model=homework)
 
         return homework
 
@@ -65,3 +66,47 @@ class HomeworkReadSerializer(HomeworkSerializer):
     subject = SubjectSerializer(read_only=True)
     clazz = ClassSerializer(read_only=True)
     author = TeacherAuthorSerializer(read_only=True)
+
+
+class HomeworkScheduleSerializer(ClassScheduleSerializerMixin, HomeworkSerializer):
+    classes = ClassSerializer(many=True)
+
+    class Meta(HomeworkSerializer.Meta):
+        fields = ('id', 'topic', 'subject', 'classes', 'deadline', 'details', 'author')
+
+
+class HomeworkQueueSerializer(serializers.ModelSerializer):
+    subject = SubjectSerializer(read_only=True)
+    clazz = ClassSerializer(read_only=True)
+    submitted = serializers.IntegerField(read_only=True)
+    unchecked = serializers.IntegerField(read_only=True)
+    class_size = serializers.IntegerField(read_only=True)
+    missing = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Homework
+        fields = (
+            'id', 'topic', 'subject', 'clazz', 'deadline',
+            'submitted', 'unchecked', 'class_size', 'missing'
+        )
+
+    def get_missing(self, obj):
+        return max(obj.class_size - obj.submitted, 0)
+
+
+class UncheckedSubmissionSerializer(serializers.ModelSerializer):
+    student = StudentAuthorSerializer(read_only=True)
+
+    class Meta:
+        model = Submission
+        fields = ('id', 'student', 'content', 'solution_url', 'posted_on')
+
+
+class CheckSubmissionsSerializer(serializers.Serializer):
+    submissions = serializers.ListField(child=serializers.IntegerField())
+
+    def validate_submissions(self, value):
+        if not value:
+            raise serializers.ValidationError('This list may not be empty.')
+
+        return value
@@ -0,0 +1,42 @@
+from collections import OrderedDict
+
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from students.caching import invalidate_responses, get_saved_values
+from students.signals import post_bulk_create
+
+from .models import Homework
+
+
+def get_homework_audiences(clazz_id, subject_id):
+    return [('class', clazz_id), ('subject', subject_id)]
+
+
+def remember_homework_audiences(sender, instance, raw=False, **kwargs):
+    saved = None if raw else get_saved_values(instance, 'clazz', 'subject')
+    instance.previous_audiences = (
+        get_homework_audiences(saved['clazz'], saved['subject']) if saved else []
+    )
+
+
+def invalidate_homeworks(sender, instance, **kwargs):
+    audiences = get_homework_audiences(instance.clazz_id, instance.subject_id)
+    invalidate_responses('homeworks', audiences + getattr(instance, 'previous_audiences', []))
+
+
+def invalidate_created_homeworks(sender, objects, **kwargs):
+    audiences = OrderedDict(
+        (audience, None)
+        for obj in objects for audience in get_homework_audiences(obj.clazz_id, obj.subject_id)
+    )
+    invalidate_responses('homeworks', list(audiences))
+
+
+pre_save.connect(
+    remember_homework_audiences, sender=Homework, dispatch_uid='homework_responses_pre_save'
+)
+post_save.connect(invalidate_homeworks, sender=Homework, dispatch_uid='homework_responses_save')
+post_delete.connect(invalidate_homeworks, sender=Homework, dispatch_uid='homework_responses_delete')
+post_bulk_create.connect(
+    invalidate_created_homeworks, sender=Homework, dispatch_uid='homework_responses_bulk_create'
+)
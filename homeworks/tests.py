@@ -2,10 +2,11 @@ from datetime import datetime, timedelta
 
 from django.contrib.auth.models import User
 
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APIClient
 from rest_framework.reverse import reverse
 from rest_framework import status
 
+from students.testing import APITestCase
 from students.models import Class, Subject, Student, Teacher
 
 from .serializers import HomeworkSerializer, SubmissionSerializer
@@ -479,3 +480,152 @@ class SubmissionsViewSetTestCase(APITestCase):
             'You do not have permission to perform this action.'
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class HomeworksScheduleTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('homeworks:homeworks-list')
+
+        self.subject = Subject.objects.create(title='test_subject')
+        self.teacher_user = User.objects.create(username='author', password='pass123')
+        self.teacher = Teacher.objects.create(user=self.teacher_user, subject=self.subject)
+
+        for letter in 'AB':
+            Class.objects.create(number=11, letter=letter)
+
+        self.client.force_authenticate(user=self.teacher_user)
+
+    def test_homeworks_schedule_for_many_classes(self):
+        post_data = {
+            'topic': 'Homework',
+            'deadline': str(datetime.now().date() + timedelta(days=3)),
+            'details': 'details',
+            'classes': [{'number': 11, 'letter': 'A'}, {'number': 11, 'letter': 'B'}]
+        }
+
+        response = self.client.post(self.url, post_data, format='json')
+
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(Homework.objects.filter(author=self.teacher).count(), 2)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class SubmissionQueueTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('homeworks:queue')
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.subject = Subject.objects.create(title='test_subject')
+
+        self.teacher_user = User.objects.create(username='author', password='pass123')
+        self.teacher = Teacher.objects.create(user=self.teacher_user, subject=self.subject)
+        self.other_teacher = Teacher.objects.create(
+            user=User.objects.create(username='other', password='pass123'), subject=self.subject
+        )
+
+        self.students = [
+            Student.objects.create(
+                user=User.objects.create(username='student{}'.format(index), password='pass'),
+                clazz=self.clazz
+            )
+            for index in range(4)
+        ]
+
+        self.homework = Homework.objects.create(
+            subject=self.subject, clazz=self.clazz, deadline=datetime.now().date(),
+            details='detailed explanation', author=self.teacher
+        )
+        self.empty_homework = Homework.objects.create(
+            subject=self.subject, clazz=self.clazz,
+            deadline=datetime.now().date() + timedelta(days=1), author=self.teacher
+        )
+        Homework.objects.create(
+            subject=self.subject, clazz=self.clazz, deadline=datetime.now().date(),
+            author=self.other_teacher
+        )
+
+        self.submissions = [
+            Submission.objects.create(homework=self.homework, student=student, content='solution')
+            for student in self.students[:3]
+        ]
+        self.submissions[0].checked = True
+        self.submissions[0].save()
+
+        self.client.force_authenticate(user=self.teacher_user)
+
+    def test_queue_as_student(self):
+        self.client.force_authenticate(user=self.students[0].user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_queue_counts(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+
+        homeworks = response.data['results']
+        self.assertEqual([homework['id'] for homework in homeworks], [
+            self.homework.id, self.empty_homework.id
+        ])
+        self.assertEqual(
+            [homeworks[0][field] for field in ('submitted', 'unchecked', 'class_size', 'missing')],
+            [3, 2, 4, 1]
+        )
+        self.assertEqual(
+            [homeworks[1][field] for field in ('submitted', 'unchecked', 'class_size', 'missing')],
+            [0, 0, 4, 4]
+        )
+
+    def test_queue_pending_only(self):
+        response = self.client.get(self.url, {'pending': 'true'})
+
+        self.assertEqual(
+            [homework['id'] for homework in response.data['results']], [self.homework.id]
+        )
+
+    def test_unchecked_submissions(self):
+        response = self.client.get(
+            reverse('homeworks:queue_submissions', kwargs={'homeworks_pk': self.homework.id}),
+            {'page_size': 1}
+        )
+
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+
+        self.assertEqual(
+            [submission['id'] for submission in response.data['results']],
+            [self.submissions[2].id]
+        )
+        self.assertIsNone(response.data['next'])
+
+    def test_unchecked_submissions_of_other_teacher(self):
+        self.client.force_authenticate(user=self.other_teacher.user)
+
+        response = self.client.get(
+            reverse('homeworks:queue_submissions', kwargs={'homeworks_pk': self.homework.id})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_check_submissions(self):
+        url = reverse('homeworks:queue_check', kwargs={'homeworks_pk': self.homework.id})
+        ids = [submission.id for submission in self.submissions]
+
+        with self.assertNumQueries(3):
+            response = self.client.post(url, {'submissions': ids}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['checked'], 2)
+        self.assertFalse(self.homework.submissions.filter(checked=False).exists())
+
+    def test_check_submissions_without_ids(self):
+        url = reverse('homeworks:queue_check', kwargs={'homeworks_pk': self.homework.id})
+
+        response = self.client.post(url, {'submissions': []}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
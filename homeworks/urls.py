@@ -1,6 +1,11 @@
+from django.conf.urls import url
+
 from rest_framework_nested import routers
 
-from .views import HomeworksViewSet, SubmissionsViewSet
+from .views import (
+    HomeworksViewSet, SubmissionsViewSet,
+    SubmissionQueue, UncheckedSubmissions, CheckSubmissions
+)
 
 
 app_name = 'homeworks'
@@ -11,5 +16,16 @@ router.register(r'homeworks', HomeworksViewSet, base_name='homeworks')
 homework_submissions_router = routers.NestedSimpleRouter(router, r'homeworks', lookup='homeworks')
 homework_submissions_router.register(r'submissions', SubmissionsViewSet, base_name='submissions')
 
-urlpatterns = router.urls
+# Listed before the router's URLs, whose detail route would take `queue` for a pk.
+urlpatterns = [
+    url(r'^homeworks/queue/$', SubmissionQueue.as_view(), name='queue'),
+    url(r'^homeworks/queue/(?P<homeworks_pk>[0-9]+)/$',
+        UncheckedSubmissions.as_view(),
+        name='queue_submissions'),
+    url(r'^homeworks/queue/(?P<homeworks_pk>[0-9]+)/check/$',
+        CheckSubmissions.as_view(),
+        name='queue_check'),
+]
+
+urlpatterns += router.urls
 urlpatterns += homework_submissions_router.urls
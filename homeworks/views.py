@@ -1,24 +1,35 @@
 from datetime import datetime
 
-from rest_framework import viewsets, status
+from django.utils import timezone
+
+from rest_framework import generics, viewsets, status
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from rest_framework_word_filter import FullWordSearchFilter
 
-from students.models import Class
+from search.filters import FullTextSearchFilter
+
+from students.caching import ResponseCacheMixin
+from students.conditional import ConditionalResponseMixin
+from students.pagination import TRUE_VALUES
 from students.permissions import IsStudent, IsTeacher, IsTeacherAuthor
+from students.reference import get_class_or_404
+from students.roles import get_role
 
 from .serializers import (
-    HomeworkSerializer, HomeworkReadSerializer, SubmissionSerializer, SubmissionReadSerializer
+    HomeworkSerializer, HomeworkReadSerializer, HomeworkScheduleSerializer,
+    SubmissionSerializer, SubmissionReadSerializer,
+    HomeworkQueueSerializer, UncheckedSubmissionSerializer, CheckSubmissionsSerializer
 )
 from .models import Homework
 from .permissions import HasOnlyOneSubmission, IsValidStudent, IsNotChecked
 from .filters import HomeworksFilterBackend, SubmissionsFilterBackend
+from .pagination import SubmissionsPagination, UncheckedSubmissionsPagination
 
 
-class HomeworksViewSet(viewsets.ModelViewSet):
+class HomeworksViewSet(ResponseCacheMixin, ConditionalResponseMixin, viewsets.ModelViewSet):
     permission_classes_by_action = {
         'list': (IsAuthenticated,),
         'retrieve': (IsAuthenticated,),
@@ -27,8 +38,9 @@ class HomeworksViewSet(viewsets.ModelViewSet):
         'destroy': (IsAuthenticated, IsTeacher, IsTeacherAuthor)
     }
     queryset = Homework.objects.filter(deadline__gte=datetime.now())
-    filter_backends = (HomeworksFilterBackend, FullWordSearchFilter)
-    word_fields = ('topic', 'subject__title', 'author__user__username')
+    filter_backends = (HomeworksFilterBackend, FullTextSearchFilter)
+    cache_namespace = 'homeworks'
+    timestamp_fields = ('last_edited_on',)
 
     def get_permissions(self):
         return [
@@ -40,9 +52,22 @@ class HomeworksViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         return HomeworkReadSerializer if self.request.method in ('GET',) else HomeworkSerializer
 
+    def get_cache_audience(self):
+        role = get_role(self.request)
+
+        if role.is_teacher:
+            return ('subject', role.subject.id)
+        if role.is_student:
+            return ('class', role.clazz.id)
+
+        return None
+
     def create(self, request, *args, **kwargs):
+        if 'classes' in request.data:
+            return self.schedule(request)
+
         clazz_data = request.data.get('clazz', {})
-        clazz = get_object_or_404(Class, **clazz_data)
+        clazz = get_class_or_404(clazz_data.get('number'), clazz_data.get('letter'))
         context = {'request': request, 'clazz': clazz}
 
         serializer = self.get_serializer_class()(data=request.data, context=context)
@@ -53,6 +78,15 @@ class HomeworksViewSet(viewsets.ModelViewSet):
 
         return Response(serializer.validated_data, status=status.HTTP_201_CREATED, headers=headers)
 
+    def schedule(self, request):
+        serializer = HomeworkScheduleSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        homeworks = serializer.save()
+
+        return Response(
+            HomeworkReadSerializer(homeworks, many=True).data, status=status.HTTP_201_CREATED
+        )
+
 
 class SubmissionsViewSet(viewsets.ModelViewSet):
     permission_classes_by_action = {
@@ -63,7 +97,7 @@ class SubmissionsViewSet(viewsets.ModelViewSet):
     }
     filter_backends = (SubmissionsFilterBackend, FullWordSearchFilter)
     word_fields = ('student__user__username',)
-    pagination_class = None
+    pagination_class = SubmissionsPagination
 
     def get_permissions(self):
         return [
@@ -123,3 +157,65 @@ class SubmissionsViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(serializer.data)
 
         return Response(serializer.validated_data, status=status.HTTP_200_OK, headers=headers)
+
+
+class SubmissionQueue(generics.ListAPIView):
+    """
+    The teacher's homeworks with how many submissions they got, how many of
+    them are unchecked and how many students have not submitted yet.
+    `?pending=true` leaves out homeworks without unchecked submissions.
+    """
+    permission_classes = (IsAuthenticated, IsTeacher)
+    serializer_class = HomeworkQueueSerializer
+
+    def get_queryset(self):
+        homeworks = Homework.objects.filter(
+            author=get_role(self.request).teacher
+        ).select_related('subject', 'clazz').with_submission_counts()
+
+        if self.request.query_params.get('pending', '').lower() in TRUE_VALUES:
+            homeworks = homeworks.filter(unchecked__gt=0)
+
+        return homeworks.order_by('deadline', 'id')
+
+
+class TeacherHomeworkMixin(object):
+    def get_related_homework(self):
+        return get_object_or_404(
+            Homework, id=self.kwargs['homeworks_pk'], author=get_role(self.request).teacher
+        )
+
+
+class UncheckedSubmissions(TeacherHomeworkMixin, generics.ListAPIView):
+    """
+    Unchecked submissions of one of the teacher's homeworks, oldest first.
+    """
+    permission_classes = (IsAuthenticated, IsTeacher)
+    serializer_class = UncheckedSubmissionSerializer
+    pagination_class = UncheckedSubmissionsPagination
+
+    def get_queryset(self):
+        return self.get_related_homework().submissions.unchecked().select_related(
+            'student__user', 'student__clazz'
+        )
+
+
+class CheckSubmissions(TeacherHomeworkMixin, generics.GenericAPIView):
+    """
+    Marks the given submissions of one of the teacher's homeworks as checked.
+    """
+    permission_classes = (IsAuthenticated, IsTeacher)
+    serializer_class = CheckSubmissionsSerializer
+
+    def post(self, request, *args, **kwargs):
+        homework = self.get_related_homework()
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # update() skips auto_now, so last_edited_on is set here.
+        checked = homework.submissions.unchecked().filter(
+            id__in=serializer.validated_data['submissions']
+        ).update(checked=True, last_edited_on=timezone.now())
+
+        return Response({'checked': checked}, status=status.HTTP_200_OK)
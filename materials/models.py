@@ -9,11 +9,13 @@ class Material(models.Model):
     content = models.TextField(blank=False)
     class_number = models.IntegerField(
         choices=Class.CLASS_NUMBERS,
-        validators=[Class.CLASS_NUMBER_VALIDATORS]
+        validators=[Class.CLASS_NUMBER_VALIDATORS],
+        db_index=True
     )
     subject = models.ForeignKey(Subject, related_name='materials', on_delete=models.CASCADE)
     video_url = models.URLField(blank=True)
     author = models.ForeignKey(Teacher, null=True, on_delete=models.CASCADE)
+    last_edited_on = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return '{} - {} ({} class) posted by {}'.format(
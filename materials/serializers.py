@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from students.roles import get_role
 from students.serializers import SubjectSerializer, TeacherAuthorSerializer
 
 from .models import Material
@@ -23,7 +24,7 @@ class MaterialSerializer(serializers.ModelSerializer):
         request = self.context['request']
         subject = self.context['subject']
 
-        author = request.user.teacher
+        author = get_role(request).teacher
 
         return Material.objects.create(subject=subject, author=author, **validated_data)
 
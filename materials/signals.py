@@ -0,0 +1,30 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from students.caching import invalidate_responses, get_saved_values
+
+from .models import Material
+
+
+def get_material_audiences(class_number, subject_id):
+    return [('class', class_number), ('subject', subject_id)]
+
+
+def remember_material_audiences(sender, instance, raw=False, **kwargs):
+    saved = None if raw else get_saved_values(instance, 'class_number', 'subject')
+    instance.previous_audiences = (
+        get_material_audiences(saved['class_number'], saved['subject']) if saved else []
+    )
+
+
+def invalidate_materials(sender, instance, **kwargs):
+    audiences = get_material_audiences(instance.class_number, instance.subject_id)
+    invalidate_responses('materials', audiences + getattr(instance, 'previous_audiences', []))
+
+
+pre_save.connect(
+    remember_material_audiences, sender=Material, dispatch_uid='material_responses_pre_save'
+)
+post_save.connect(invalidate_materials, sender=Material, dispatch_uid='material_responses_save')
+post_delete.connect(
+    invalidate_materials, sender=Material, dispatch_uid='material_responses_delete'
+)
@@ -1,9 +1,10 @@
 from django.contrib.auth.models import User
 
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APIClient
 from rest_framework.reverse import reverse
 from rest_framework import status
 
+from students.testing import APITestCase
 from students.models import Class, Subject, Student, Teacher
 
 from .serializers import MaterialSerializer
@@ -3,10 +3,13 @@ from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from rest_framework_word_filter import FullWordSearchFilter
+from search.filters import FullTextSearchFilter
 
-from students.models import Subject
+from students.caching import ResponseCacheMixin
+from students.conditional import ConditionalListMixin, ConditionalResponseMixin
 from students.permissions import IsTeacher, IsTeacherAuthor
+from students.reference import get_subject_or_404
+from students.roles import get_role
 
 from .serializers import MaterialSerializer, MaterialReadSerializer
 from .models import Material
@@ -33,19 +36,34 @@ class MaterialsViewSet(viewsets.GenericViewSet):
         ]
 
 
-class MaterialsListViewSet(mixins.ListModelMixin, MaterialsViewSet):
+class MaterialsListViewSet(ResponseCacheMixin,
+                           ConditionalListMixin,
+                           mixins.ListModelMixin,
+                           MaterialsViewSet):
     queryset = Material.objects.all()
-    filter_backends = (MaterialListFilterBackend, FullWordSearchFilter)
-    word_fields = ('title', 'section')
+    filter_backends = (MaterialListFilterBackend, FullTextSearchFilter)
+    cache_namespace = 'materials'
+    timestamp_fields = ('last_edited_on',)
 
+    def get_cache_audience(self):
+        role = get_role(self.request)
 
-class NestedMaterialsViewSet(mixins.RetrieveModelMixin,
+        if role.is_teacher:
+            return ('subject', role.subject.id)
+        if role.is_student:
+            return ('class', role.clazz.number)
+
+        return None
+
+
+class NestedMaterialsViewSet(ConditionalResponseMixin,
+                             mixins.RetrieveModelMixin,
                              mixins.CreateModelMixin,
                              mixins.UpdateModelMixin,
                              mixins.DestroyModelMixin,
                              MaterialsListViewSet):
     def get_related_subject(self):
-        return get_object_or_404(Subject, id=self.kwargs['subject_pk'])
+        return get_subject_or_404(self.kwargs['subject_pk'])
 
     def get_queryset(self):
         subject = self.get_related_subject()
@@ -61,14 +79,6 @@ class NestedMaterialsViewSet(mixins.RetrieveModelMixin,
 
         return context
 
-
-    def retrieve(self, request, *args, **kwargs):
-        material = self.get_object()
-
-        serializer = self.get_serializer(material)
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
-
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.2 on 2026-10-16 21:01
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0012_auto_20170919_2248'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='comment',
+            index_together=set([('news', 'posted_on')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='news',
+            index_together=set([('class_number', 'class_letter', 'last_edited_on')]),
+        ),
+    ]
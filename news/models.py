@@ -20,6 +20,11 @@ class AbstractPost(BaseAbstractPost):
         abstract = True
 
 
+class NewsQuerySet(models.QuerySet):
+    def with_feed_data(self):
+        return self.select_related('author').annotate(comments_count=models.Count('comments'))
+
+
 class News(AbstractPost):
     title = models.CharField(max_length=100, blank=False)
     content = models.TextField(max_length=10000, blank=False)
@@ -34,12 +39,35 @@ class News(AbstractPost):
         choices=Class.CLASS_LETTERS
     )
 
+    objects = NewsQuerySet.as_manager()
+
     def __str__(self):
         return '{} ({})'.format(self.title, self.posted_on.date())
 
     class Meta:
         ordering = ['-last_edited_on']
         verbose_name_plural = 'news'
+        index_together = [
+            ['class_number', 'class_letter', 'last_edited_on'],
+        ]
+
+
+class CommentQuerySet(models.QuerySet):
+    def with_authors(self):
+        return self.select_related('author__student', 'author__teacher')
+
+    def latest_per_news(self, news_ids, limit):
+        newer_comments_count = (
+            'SELECT COUNT(*) FROM {table} newer '
+            'WHERE newer.news_id = {table}.news_id AND ('
+            'newer.posted_on > {table}.posted_on OR '
+            '(newer.posted_on = {table}.posted_on AND newer.id > {table}.id))'
+        ).format(table=self.model._meta.db_table)
+
+        return self.filter(news_id__in=news_ids).extra(
+            where=['({}) < %s'.format(newer_comments_count)],
+            params=[limit]
+        )
 
 
 class Comment(AbstractPost):
@@ -47,8 +75,13 @@ class Comment(AbstractPost):
     author_image = models.URLField(blank=True)
     content = models.TextField(max_length=2048)
 
+    objects = CommentQuerySet.as_manager()
+
     def __str__(self):
         return '{} - {}'.format(self.author, self.news)
 
     class Meta:
         ordering = ['-posted_on']
+        index_together = [
+            ['news', 'posted_on'],
+        ]
@@ -0,0 +1,9 @@
+from students.pagination import TimeOrderedPagination
+
+
+class NewsPagination(TimeOrderedPagination):
+    ordering = ('-last_edited_on', '-id')
+
+
+class CommentsPagination(TimeOrderedPagination):
+    ordering = ('-posted_on', '-id')
@@ -48,14 +48,28 @@ class CommentReadSerializer(CommentSerializer):
 class NewsSerializer(AbstractPostSerializer):
     title = serializers.CharField(min_length=3, max_length=100)
     content = serializers.CharField(min_length=5, max_length=10000)
-    comments = CommentSerializer(read_only=True, many=True)
+    comments = serializers.SerializerMethodField()
+    comments_count = serializers.SerializerMethodField()
 
     class Meta:
         model = News
         fields = AbstractPostSerializer.Meta.fields + (
-            'id', 'title', 'content', 'class_number', 'class_letter', 'comments'
+            'id', 'title', 'content', 'class_number', 'class_letter', 'comments', 'comments_count'
         )
 
+    def get_comments(self, obj):
+        comments = getattr(obj, 'latest_comments', None)
+
+        if comments is None:
+            comments = obj.comments.with_authors()
+
+        return CommentSerializer(comments, many=True, context=self.context).data
+
+    def get_comments_count(self, obj):
+        comments_count = getattr(obj, 'comments_count', None)
+
+        return obj.comments.count() if comments_count is None else comments_count
+
     def create(self, validated_data):
         author = self.context['request'].user
         validated_data['class_number'] = self.context['class_number']
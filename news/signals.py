@@ -0,0 +1,48 @@
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from students.caching import invalidate_responses, get_saved_values
+from students.models import Class
+
+from .models import News, Comment
+
+
+def get_news_audiences(news):
+    return get_class_audiences(news.class_number, news.class_letter)
+
+
+def get_class_audiences(class_number, class_letter):
+    if class_letter:
+        return [('class', class_number, class_letter)]
+
+    return [('class', class_number, letter) for letter, _ in Class.CLASS_LETTERS]
+
+
+def remember_news_audiences(sender, instance, raw=False, **kwargs):
+    saved = None if raw else get_saved_values(instance, 'class_number', 'class_letter')
+    instance.previous_audiences = (
+        get_class_audiences(saved['class_number'], saved['class_letter']) if saved else []
+    )
+
+
+def invalidate_news(sender, instance, **kwargs):
+    audiences = get_news_audiences(instance)
+    invalidate_responses('news', audiences + getattr(instance, 'previous_audiences', []))
+
+
+def invalidate_comment_news(sender, instance, **kwargs):
+    try:
+        news = instance.news
+    except ObjectDoesNotExist:
+        return
+
+    invalidate_responses('news', get_news_audiences(news))
+
+
+pre_save.connect(remember_news_audiences, sender=News, dispatch_uid='news_responses_pre_save')
+post_save.connect(invalidate_news, sender=News, dispatch_uid='news_responses_save')
+post_delete.connect(invalidate_news, sender=News, dispatch_uid='news_responses_delete')
+post_save.connect(invalidate_comment_news, sender=Comment, dispatch_uid='comment_responses_save')
+post_delete.connect(
+    invalidate_comment_news, sender=Comment, dispatch_uid='comment_responses_delete'
+)
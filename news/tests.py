@@ -1,10 +1,13 @@
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APIClient
 from rest_framework.reverse import reverse
 from rest_framework import status
 
+from students.testing import APITestCase
 from students.models import Class, Subject, Student, Teacher
+from search.documents import has_fts_table
 
 from .models import News, Comment
 from .serializers import NewsSerializer, CommentSerializer
@@ -91,6 +94,7 @@ class NewsStudentsViewSetTestCase(APITestCase):
     def test_news_list_with_different_class(self):
         self.client.force_authenticate(user=self.user)
         self.student.clazz = Class.objects.create(number=11, letter='V')
+        self.student.save()
 
         response = self.client.get(reverse(self.list_view_name))
 
@@ -1466,3 +1470,285 @@ class NewsTeachersCommentsViewSetTestCase(APITestCase):
 
         self.assertEqual(Comment.objects.count(), 0)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class NewsFeedQueriesTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.list_view_name = 'news:students_news-list'
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.subject = Subject.objects.create(title='Maths')
+
+        self.user = User.objects.create(username='student', password='pass')
+        self.student = Student.objects.create(user=self.user, clazz=self.clazz)
+
+        self.teacher_user = User.objects.create(username='teacher', password='pass')
+        self.teacher = Teacher.objects.create(user=self.teacher_user, subject=self.subject)
+
+        self.client.force_authenticate(user=self.user)
+
+    def create_news(self, count, comments_per_news):
+        for i in range(count):
+            news = News.objects.create(
+                title='news {}'.format(i),
+                content='news content',
+                class_number=self.clazz.number,
+                class_letter=self.clazz.letter,
+                author=self.teacher_user
+            )
+
+            for j in range(comments_per_news):
+                Comment.objects.create(
+                    news=news,
+                    author=self.user if j % 2 else self.teacher_user,
+                    content='comment {}'.format(j)
+                )
+
+    def test_news_list_embeds_latest_comments_only(self):
+        self.create_news(1, 5)
+
+        response = self.client.get(reverse(self.list_view_name))
+
+        news_data = response.data['results'][0]
+        self.assertEqual(news_data['comments_count'], 5)
+        self.assertEqual(
+            [comment['content'] for comment in news_data['comments']],
+            ['comment 4', 'comment 3', 'comment 2']
+        )
+        self.assertEqual(
+            news_data['comments'][0]['author_image'], self.teacher.profile_image_url
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_news_list_query_count_does_not_grow(self):
+        self.create_news(1, 1)
+
+        with self.assertNumQueries(5):
+            self.client.get(reverse(self.list_view_name))
+
+        self.create_news(4, 6)
+
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse(self.list_view_name))
+
+        self.assertEqual(len(response.data['results']), 5)
+
+
+class NewsConditionalGetTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse('news:students_news-list')
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.user = User.objects.create(username='student', password='pass')
+        self.student = Student.objects.create(user=self.user, clazz=self.clazz)
+
+        self.news = News.objects.create(
+            title='news',
+            content='news content',
+            class_number=self.clazz.number,
+            class_letter=self.clazz.letter,
+            author=self.user
+        )
+        self.detail_url = reverse('news:students_news-detail', kwargs={'pk': self.news.id})
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_news_list_has_validators(self):
+        response = self.client.get(self.list_url)
+
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_news_list_not_modified_skips_serialization(self):
+        etag = self.client.get(self.list_url)['ETag']
+
+        # The validators are stored with the cached list, so only the user is loaded.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_news_list_etag_changes_with_comments(self):
+        etag = self.client.get(self.list_url)['ETag']
+
+        comment = Comment.objects.create(news=self.news, author=self.user, content='comment')
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        comment.delete()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_news_list_etag_changes_on_deletion(self):
+        other_news = News.objects.create(
+            title='other', content='content', class_number=10, class_letter='A', author=self.user
+        )
+        response = self.client.get(self.list_url)
+
+        other_news.delete()
+        response = self.client.get(
+            self.list_url,
+            HTTP_IF_NONE_MATCH=response['ETag'],
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_news_list_etag_depends_on_query(self):
+        etag = self.client.get(self.list_url)['ETag']
+
+        response = self.client.get(self.list_url, {'page': 1}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_news_detail_not_modified(self):
+        etag = self.client.get(self.detail_url)['ETag']
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.news.title = 'edited'
+        self.news.save()
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.data['title'], 'edited')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleted_news_detail_is_not_found_with_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.news.delete()
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_news_list_search_runs_once(self):
+        # The content type and the FTS table lookup are cached per process.
+        ContentType.objects.get_for_model(News)
+        has_fts_table()
+
+        with self.assertNumQueries(5):
+            response = self.client.get(self.list_url, {'search': 'content'})
+
+        self.assertEqual(response.data['count'], 1)
+
+
+class NewsResponseCacheTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('news:students_news-list')
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.user = User.objects.create(username='student', password='pass')
+        self.student = Student.objects.create(user=self.user, clazz=self.clazz)
+
+        self.news = News.objects.create(
+            title='news',
+            content='news content',
+            class_number=self.clazz.number,
+            class_letter=self.clazz.letter,
+            author=self.user
+        )
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_news_list_hit_skips_queries(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_news_list_cache_is_invalidated_by_comments(self):
+        self.client.get(self.url)
+
+        Comment.objects.create(news=self.news, author=self.user, content='comment')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['results'][0]['comments_count'], 1)
+
+    def test_news_list_cache_is_invalidated_by_common_news(self):
+        self.client.get(self.url)
+
+        News.objects.create(
+            title='common', content='for all letters', class_number=10, author=self.user
+        )
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['count'], 2)
+
+    def test_news_list_cache_varies_by_media_type(self):
+        self.client.get(self.url)
+
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json; indent=4')
+
+        self.assertIn(b'\n    ', response.content)
+        self.assertIn('Accept', response['Vary'])
+
+
+class NewsCursorPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('news:students_news-list')
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.user = User.objects.create(username='student', password='pass')
+        self.student = Student.objects.create(user=self.user, clazz=self.clazz)
+
+        for index in range(7):
+            News.objects.create(
+                title='news {}'.format(index),
+                content='news content',
+                class_number=self.clazz.number,
+                class_letter=self.clazz.letter,
+                author=self.user
+            )
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_news_list_with_page_numbers_by_default(self):
+        response = self.client.get(self.url, {'page_size': 6})
+
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_news_list_with_cursor(self):
+        response = self.client.get(self.url, {'cursor': '', 'page_size': 4})
+
+        self.assertNotIn('count', response.data)
+        self.assertIsNone(response.data['previous'])
+        self.assertEqual(
+            [news['title'] for news in response.data['results']],
+            ['news 6', 'news 5', 'news 4', 'news 3']
+        )
+
+        response = self.client.get(response.data['next'])
+
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(
+            [news['title'] for news in response.data['results']],
+            ['news 2', 'news 1', 'news 0']
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_news_list_with_cursor_and_count(self):
+        response = self.client.get(self.url, {'cursor': '', 'count': 'true'})
+
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_news_list_page_size_is_capped(self):
+        with self.settings(PAGINATION={'MAX_PAGE_SIZE': 2}):
+            response = self.client.get(self.url, {'cursor': '', 'page_size': 50})
+
+        self.assertEqual(len(response.data['results']), 2)
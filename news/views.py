@@ -1,17 +1,56 @@
+from collections import defaultdict
+
 from rest_framework import generics, viewsets
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from rest_framework_word_filter import FullWordSearchFilter
+from search.filters import FullTextSearchFilter
 
+from students.caching import ResponseCacheMixin
+from students.conditional import ConditionalListMixin, ConditionalResponseMixin
 from students.permissions import IsStudent, IsTeacher, IsUserAuthor
+from students.roles import get_role
 
-from .models import News
+from .models import News, Comment
 from .serializers import NewsSerializer, CommentSerializer, CommentReadSerializer
 from .filters import TeachersListFilterBackend, ClassNumberFilterBackend
+from .pagination import NewsPagination, CommentsPagination
+
+
+class NewsFeedListMixin(object):
+    comments_limit = 3
+
+    def attach_latest_comments(self, news_list):
+        latest_comments = defaultdict(list)
+        comments = Comment.objects.with_authors().latest_per_news(
+            [news.id for news in news_list], self.comments_limit
+        )
+
+        for comment in comments:
+            latest_comments[comment.news_id].append(comment)
+
+        for news in news_list:
+            news.latest_comments = latest_comments[news.id]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
 
+        page = self.paginate_queryset(queryset)
+        news_list = list(queryset) if page is None else page
+        self.attach_latest_comments(news_list)
 
-class NewsDefaultViewSet(viewsets.ModelViewSet):
+        serializer = self.get_serializer(news_list, many=True)
+
+        if page is None:
+            return Response(serializer.data)
+
+        return self.get_paginated_response(serializer.data)
+
+
+class NewsDefaultViewSet(ConditionalResponseMixin, NewsFeedListMixin, viewsets.ModelViewSet):
     serializer_class = NewsSerializer
+    timestamp_fields = ('last_edited_on', 'comments__last_edited_on')
+    pagination_class = NewsPagination
 
     def get_clazz_info(self):
         raise NotImplementedError()
@@ -29,10 +68,10 @@ class NewsDefaultViewSet(viewsets.ModelViewSet):
         common_news = News.objects.filter(class_number=class_number, class_letter='')
         news = News.objects.filter(class_number=class_number, class_letter=class_letter)
 
-        return common_news | news
+        return (common_news | news).with_feed_data()
 
 
-class NewsStudentsViewSet(NewsDefaultViewSet):
+class NewsStudentsViewSet(ResponseCacheMixin, NewsDefaultViewSet):
     permission_classes_by_action = {
         'list': (IsAuthenticated, IsStudent),
         'retrieve': (IsAuthenticated, IsStudent),
@@ -40,8 +79,8 @@ class NewsStudentsViewSet(NewsDefaultViewSet):
         'update': (IsAuthenticated, IsStudent, IsUserAuthor),
         'destroy': (IsAuthenticated, IsStudent, IsUserAuthor)
     }
-    filter_backends = (FullWordSearchFilter,)
-    word_fields = ('title', 'author__username')
+    filter_backends = (FullTextSearchFilter,)
+    cache_namespace = 'news'
 
     def get_permissions(self):
         return [
@@ -51,28 +90,37 @@ class NewsStudentsViewSet(NewsDefaultViewSet):
         ]
 
     def get_clazz_info(self):
-        clazz = self.request.user.student.clazz
+        clazz = get_role(self.request).clazz
 
         return {
             'class_number': clazz.number,
             'class_letter': clazz.letter
         }
 
+    def get_cache_audience(self):
+        clazz = get_role(self.request).clazz
+
+        return ('class', clazz.number, clazz.letter)
+
 
-class NewsTeachersList(generics.ListAPIView):
+class NewsTeachersList(ConditionalListMixin, NewsFeedListMixin, generics.ListAPIView):
     permission_classes = (IsAuthenticated, IsTeacher)
     serializer_class = NewsSerializer
-    queryset = News.objects.all()
-    filter_backends = (TeachersListFilterBackend, FullWordSearchFilter)
-    word_fields = ('title',)
+    timestamp_fields = ('last_edited_on', 'comments__last_edited_on')
+    pagination_class = NewsPagination
+    queryset = News.objects.with_feed_data()
+    filter_backends = (TeachersListFilterBackend, FullTextSearchFilter)
 
 
-class NewsTeachersClassNumberList(generics.ListCreateAPIView):
+class NewsTeachersClassNumberList(ConditionalListMixin,
+                                  NewsFeedListMixin,
+                                  generics.ListCreateAPIView):
     permission_classes = (IsAuthenticated, IsTeacher)
     serializer_class = NewsSerializer
-    queryset = News.objects.all()
-    filter_backends = (TeachersListFilterBackend, ClassNumberFilterBackend, FullWordSearchFilter)
-    word_fields = ('title',)
+    timestamp_fields = ('last_edited_on', 'comments__last_edited_on')
+    pagination_class = NewsPagination
+    queryset = News.objects.with_feed_data()
+    filter_backends = (TeachersListFilterBackend, ClassNumberFilterBackend, FullTextSearchFilter)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -89,8 +137,7 @@ class NewsTeachersViewSet(NewsDefaultViewSet):
         'update': (IsAuthenticated, IsTeacher, IsUserAuthor),
         'destroy': (IsAuthenticated, IsTeacher, IsUserAuthor)
     }
-    filter_backends = (TeachersListFilterBackend, FullWordSearchFilter)
-    word_fields = ('title',)
+    filter_backends = (TeachersListFilterBackend, FullTextSearchFilter)
 
     def get_permissions(self):
         return [
@@ -103,7 +150,7 @@ class NewsTeachersViewSet(NewsDefaultViewSet):
         return self.kwargs
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class CommentsViewSet(ConditionalResponseMixin, viewsets.ModelViewSet):
     permission_classes_by_action = {
         'list': (IsAuthenticated,),
         'retrieve': (IsAuthenticated,),
@@ -111,6 +158,8 @@ class CommentsViewSet(viewsets.ModelViewSet):
         'update': (IsAuthenticated, IsUserAuthor),
         'destroy': (IsAuthenticated, IsUserAuthor)
     }
+    timestamp_fields = ('last_edited_on',)
+    pagination_class = CommentsPagination
 
     def get_permissions(self):
         return [
@@ -137,4 +186,4 @@ class CommentsViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         news = self.get_related_news()
 
-        return news.comments.all()
+        return news.comments.with_authors()
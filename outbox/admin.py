@@ -0,0 +1,12 @@
+from django.contrib import admin
+from django.contrib.admin.decorators import register
+
+from .models import Message
+
+
+@register(Message)
+class MessageAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'to', 'created_on', 'attempts', 'sent_on')
+    date_hierarchy = 'created_on'
+    list_filter = ('sent_on', 'attempts')
+    search_fields = ('to', 'subject')
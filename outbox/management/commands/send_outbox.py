@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from outbox.utils import get_outbox_setting, process_outbox
+
+
+class Command(BaseCommand):
+    help = 'Delivers queued outbox emails in batches over a single SMTP connection.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=get_outbox_setting('BATCH_SIZE'))
+        parser.add_argument(
+            '--lease-seconds', type=int, default=get_outbox_setting('LEASE_SECONDS')
+        )
+        parser.add_argument('--max-attempts', type=int, default=get_outbox_setting('MAX_ATTEMPTS'))
+        parser.add_argument(
+            '--sleep', type=float, default=5.0,
+            help='Seconds to wait when the outbox is empty.'
+        )
+        parser.add_argument(
+            '--once', action='store_true', default=False,
+            help='Drain the outbox and exit instead of polling forever.'
+        )
+
+    def handle(self, *args, **options):
+        total_sent, total_failed = 0, 0
+        started = time.time()
+
+        while True:
+            batch_started = time.time()
+            sent, failed = process_outbox(
+                batch_size=options['batch_size'],
+                lease_seconds=options['lease_seconds'],
+                max_attempts=options['max_attempts']
+            )
+
+            if sent or failed:
+                elapsed = time.time() - batch_started
+                total_sent += sent
+                total_failed += failed
+
+                self.stdout.write('Sent {} message(s), {} failed in {:.2f}s ({:.1f} msg/s)'.format(
+                    sent, failed, elapsed, sent / elapsed if elapsed else sent
+                ))
+                continue
+
+            if options['once']:
+                break
+
+            time.sleep(options['sleep'])
+
+        elapsed = time.time() - started
+        self.stdout.write(self.style.SUCCESS(
+            'Done: {} sent, {} failed in {:.2f}s ({:.1f} msg/s)'.format(
+                total_sent, total_failed, elapsed, total_sent / elapsed if elapsed else total_sent
+            )
+        ))
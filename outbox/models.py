@@ -0,0 +1,59 @@
+from django.db import models
+from django.utils import timezone
+from django.core.mail import EmailMultiAlternatives
+
+
+class MessageQuerySet(models.QuerySet):
+    def pending(self):
+        return self.filter(sent_on__isnull=True)
+
+    def sent(self):
+        return self.filter(sent_on__isnull=False)
+
+    def available(self, now, max_attempts):
+        return self.pending().filter(
+            available_on__lte=now,
+            attempts__lt=max_attempts
+        ).filter(
+            models.Q(leased_until__isnull=True) | models.Q(leased_until__lt=now)
+        )
+
+
+class Message(models.Model):
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.EmailField(max_length=254)
+    created_on = models.DateTimeField(auto_now_add=True)
+    available_on = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    lease_token = models.CharField(max_length=32, blank=True, null=True, db_index=True)
+    leased_until = models.DateTimeField(blank=True, null=True)
+    sent_on = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+
+    objects = MessageQuerySet.as_manager()
+
+    def __str__(self):
+        return '{} -> {}'.format(self.subject, self.to)
+
+    def as_email(self, connection=None):
+        email = EmailMultiAlternatives(
+            self.subject,
+            self.body,
+            self.from_email,
+            [self.to],
+            connection=connection
+        )
+
+        if self.html_body:
+            email.attach_alternative(self.html_body, 'text/html')
+
+        return email
+
+    class Meta:
+        ordering = ['available_on', 'id']
+        index_together = [
+            ['sent_on', 'available_on'],
+        ]
@@ -0,0 +1,157 @@
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from students.models import Class, Subject, Student, Teacher
+from students.testing import TestCase
+from students.utils import send_creation_emails
+from homeworks.models import Homework
+
+from .models import Message
+from .utils import queue_email, claim_messages, deliver_messages, process_outbox
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException('Connection unexpectedly closed')
+
+
+class CountingEmailBackend(BaseEmailBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened = 0
+        self.batches = []
+
+    def open(self):
+        self.opened += 1
+
+    def send_messages(self, email_messages):
+        self.batches.append(len(email_messages))
+        mail.outbox.extend(email_messages)
+
+        return len(email_messages)
+
+
+class FlakyEmailBackend(CountingEmailBackend):
+    def send_messages(self, email_messages):
+        if any(email.subject == 'Subject 1' for email in email_messages):
+            raise SMTPException('Recipient refused')
+
+        return super().send_messages(email_messages)
+
+
+class OutboxTestCase(TestCase):
+    def setUp(self):
+        for i in range(3):
+            queue_email('Subject {}'.format(i), 'Body', 'user{}@elsyser.com'.format(i))
+
+    def test_queued_emails_are_not_sent_immediately(self):
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Message.objects.pending().count(), 3)
+
+    def test_send_outbox_command_delivers_all_messages(self):
+        out = StringIO()
+
+        call_command('send_outbox', once=True, stdout=out)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(Message.objects.pending().count(), 0)
+        self.assertIn('Done: 3 sent, 0 failed', out.getvalue())
+
+    def test_messages_are_sent_over_one_connection(self):
+        connection = CountingEmailBackend()
+
+        sent, failed = process_outbox(batch_size=10, connection=connection)
+
+        self.assertEqual((sent, failed), (3, 0))
+        self.assertEqual(connection.opened, 1)
+        self.assertEqual(connection.batches, [1, 1, 1])
+
+    def test_failure_in_the_middle_of_a_batch_sends_nothing_twice(self):
+        sent, failed = process_outbox(batch_size=10, connection=FlakyEmailBackend())
+
+        self.assertEqual((sent, failed), (2, 1))
+        self.assertEqual(
+            sorted(email.subject for email in mail.outbox), ['Subject 0', 'Subject 2']
+        )
+        self.assertEqual(
+            list(Message.objects.pending().values_list('subject', flat=True)), ['Subject 1']
+        )
+
+    def test_leased_messages_are_not_claimed_twice(self):
+        first = claim_messages(batch_size=2)
+        second = claim_messages(batch_size=10)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse({m.id for m in first} & {m.id for m in second})
+        self.assertEqual(claim_messages(batch_size=10), [])
+
+    def test_expired_leases_are_claimed_again(self):
+        claimed = claim_messages(batch_size=10)
+        Message.objects.update(leased_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(len(claim_messages(batch_size=10)), len(claimed))
+
+    def test_failed_messages_are_retried_with_backoff(self):
+        sent, failed = process_outbox(connection=FailingEmailBackend())
+
+        self.assertEqual((sent, failed), (0, 3))
+
+        message = Message.objects.first()
+        self.assertEqual(message.attempts, 1)
+        self.assertIsNone(message.lease_token)
+        self.assertIn('SMTPException', message.last_error)
+        self.assertGreater(message.available_on, timezone.now())
+        self.assertEqual(claim_messages(), [])
+
+        Message.objects.update(available_on=timezone.now())
+        self.assertEqual(deliver_messages(claim_messages()), (3, 0))
+
+    def test_messages_over_max_attempts_are_not_claimed(self):
+        Message.objects.update(attempts=5)
+
+        self.assertEqual(claim_messages(max_attempts=5), [])
+
+
+class CreationEmailsTestCase(TestCase):
+    def setUp(self):
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.subject = Subject.objects.create(title='Maths')
+
+        teacher_user = User.objects.create(username='teacher', password='pass')
+        self.teacher = Teacher.objects.create(user=teacher_user, subject=self.subject)
+
+        for i in range(5):
+            user = User.objects.create(
+                username='student{}'.format(i),
+                email='student{}@elsyser.com'.format(i),
+                password='pass'
+            )
+            Student.objects.create(user=user, clazz=self.clazz)
+
+        self.homework = Homework.objects.create(
+            subject=self.subject,
+            clazz=self.clazz,
+            deadline=timezone.now().date(),
+            details='details',
+            author=self.teacher
+        )
+
+    def test_creation_emails_are_queued_in_one_query(self):
+        recipients = list(User.objects.filter(student__clazz=self.clazz))
+
+        with self.assertNumQueries(1):
+            send_creation_emails(recipients, model=self.homework)
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            set(Message.objects.values_list('to', flat=True)),
+            {user.email for user in recipients}
+        )
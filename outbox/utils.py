@@ -0,0 +1,134 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.utils import timezone
+
+from .models import Message
+
+
+DEFAULT_OUTBOX_SETTINGS = {
+    'BATCH_SIZE': 50,
+    'LEASE_SECONDS': 60,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF_SECONDS': 30,
+    'MAX_BACKOFF_SECONDS': 60 * 60,
+}
+
+
+def get_outbox_setting(name):
+    return getattr(settings, 'OUTBOX', {}).get(name, DEFAULT_OUTBOX_SETTINGS[name])
+
+
+def build_message(subject, body, to, html_body='', from_email=None):
+    return Message(
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=to
+    )
+
+
+def queue_email(subject, body, to, html_body='', from_email=None):
+    message = build_message(subject, body, to, html_body=html_body, from_email=from_email)
+    message.save()
+
+    return message
+
+
+def queue_emails(messages):
+    return Message.objects.bulk_create(messages, batch_size=get_outbox_setting('BATCH_SIZE'))
+
+
+def get_backoff(attempts):
+    backoff = get_outbox_setting('RETRY_BACKOFF_SECONDS') * 2 ** max(attempts - 1, 0)
+
+    return timedelta(seconds=min(backoff, get_outbox_setting('MAX_BACKOFF_SECONDS')))
+
+
+def claim_messages(batch_size=None, lease_seconds=None, max_attempts=None):
+    batch_size = batch_size or get_outbox_setting('BATCH_SIZE')
+    lease_seconds = lease_seconds or get_outbox_setting('LEASE_SECONDS')
+    max_attempts = max_attempts or get_outbox_setting('MAX_ATTEMPTS')
+
+    now = timezone.now()
+    token = uuid.uuid4().hex
+
+    available = Message.objects.available(now, max_attempts)
+    candidate_ids = list(available.values_list('id', flat=True)[:batch_size])
+
+    if not candidate_ids:
+        return []
+
+    # Re-checking availability inside the UPDATE makes the claim atomic, so two
+    # workers that picked the same candidates never end up sharing a row.
+    available.filter(id__in=candidate_ids).update(
+        lease_token=token,
+        leased_until=now + timedelta(seconds=lease_seconds)
+    )
+
+    return list(Message.objects.filter(lease_token=token, sent_on__isnull=True))
+
+
+def mark_sent(messages):
+    Message.objects.filter(id__in=[message.id for message in messages]).update(
+        sent_on=timezone.now(),
+        lease_token=None,
+        leased_until=None
+    )
+
+
+def mark_failed(message, error):
+    message.attempts += 1
+    message.available_on = timezone.now() + get_backoff(message.attempts)
+    message.last_error = '{}: {}'.format(error.__class__.__name__, error)
+    message.lease_token = None
+    message.leased_until = None
+    message.save(update_fields=[
+        'attempts', 'available_on', 'last_error', 'lease_token', 'leased_until'
+    ])
+
+
+def deliver_messages(messages, connection=None):
+    if not messages:
+        return 0, 0
+
+    connection = connection or get_connection()
+    emails = [message.as_email(connection) for message in messages]
+
+    try:
+        connection.open()
+    except Exception as error:
+        for message in messages:
+            mark_failed(message, error)
+
+        return 0, len(messages)
+
+    # Messages are sent one by one over the open connection, so that a failure
+    # in the middle of a batch tells exactly which messages went out.
+    sent = []
+    failed = 0
+
+    try:
+        for message, email in zip(messages, emails):
+            try:
+                connection.send_messages([email])
+            except Exception as error:
+                mark_failed(message, error)
+                failed += 1
+            else:
+                sent.append(message)
+    finally:
+        connection.close()
+
+    mark_sent(sent)
+
+    return len(sent), failed
+
+
+def process_outbox(batch_size=None, lease_seconds=None, max_attempts=None, connection=None):
+    messages = claim_messages(batch_size, lease_seconds, max_attempts)
+
+    return deliver_messages(messages, connection=connection)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from django.contrib.admin.decorators import register
+
+from .models import SearchDocument
+
+
+@register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ('id', 'content_type', 'object_id')
+    list_filter = ('content_type',)
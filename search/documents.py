@@ -0,0 +1,183 @@
+import re
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+
+from .models import SearchDocument
+
+
+SEARCH_FIELDS = {
+    'news.News': ('title', 'content', 'author__username'),
+    'materials.Material': ('title', 'section', 'content'),
+    'homeworks.Homework': ('topic', 'details', 'subject__title', 'author__user__username'),
+    'talks.Talk': ('topic', 'description', 'author__username'),
+}
+
+FTS_TABLE = 'search_searchdocument_fts'
+
+_fts_tables = {}
+
+
+def get_indexed_models():
+    return [apps.get_model(label) for label in SEARCH_FIELDS]
+
+
+def get_search_fields(model):
+    return SEARCH_FIELDS.get(model._meta.label)
+
+
+def build_body(values):
+    return ' '.join(str(value) for value in values if value)
+
+
+def index_object(instance):
+    model = instance.__class__
+    fields = get_search_fields(model)
+    values = model.objects.filter(pk=instance.pk).values_list(*fields).first()
+
+    if values is None:
+        return
+
+    SearchDocument.objects.update_or_create(
+        content_type=ContentType.objects.get_for_model(model),
+        object_id=instance.pk,
+        defaults={'body': build_body(values)}
+    )
+
+
+def index_objects(objects):
+    """
+    Indexes a batch of new objects of one model, e.g. after bulk_create(),
+    with one query for their fields and one insert.
+    """
+    if not objects:
+        return
+
+    model = objects[0].__class__
+    content_type = ContentType.objects.get_for_model(model)
+    rows = model.objects.filter(pk__in=[obj.pk for obj in objects]).values_list(
+        'pk', *get_search_fields(model)
+    )
+
+    SearchDocument.objects.bulk_create([
+        SearchDocument(content_type=content_type, object_id=row[0], body=build_body(row[1:]))
+        for row in rows
+    ])
+
+
+def unindex_object(instance):
+    SearchDocument.objects.filter(
+        content_type=ContentType.objects.get_for_model(instance.__class__),
+        object_id=instance.pk
+    ).delete()
+
+
+def rebuild_index(model, batch_size=1000):
+    content_type = ContentType.objects.get_for_model(model)
+    rows = model.objects.order_by().values_list('pk', *get_search_fields(model)).iterator()
+    indexed = 0
+
+    with transaction.atomic():
+        SearchDocument.objects.filter(content_type=content_type).delete()
+
+        batch = []
+        for row in rows:
+            batch.append(SearchDocument(
+                content_type=content_type, object_id=row[0], body=build_body(row[1:])
+            ))
+
+            if len(batch) == batch_size:
+                SearchDocument.objects.bulk_create(batch)
+                indexed += len(batch)
+                batch = []
+
+        SearchDocument.objects.bulk_create(batch)
+        indexed += len(batch)
+
+    return indexed
+
+
+def optimize_index():
+    if has_fts_table():
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO {0}({0}) VALUES('optimize')".format(FTS_TABLE))
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE search_searchdocument')
+
+
+def has_fts_table():
+    if connection.vendor != 'sqlite':
+        return False
+
+    key = connection.settings_dict['NAME']
+    if key not in _fts_tables:
+        _fts_tables[key] = FTS_TABLE in connection.introspection.table_names()
+
+    return _fts_tables[key]
+
+
+def get_search_tokens(text):
+    return re.findall(r'\w+', text.lower())
+
+
+def search_queryset(queryset, text):
+    """
+    Restricts `queryset` to the rows whose documents match `text`, best
+    matches first. The documents are joined to the queryset in SQL, so the
+    search is limited by the scoping already applied to it.
+    """
+    tokens = get_search_tokens(text)
+
+    if not tokens:
+        return queryset.none()
+
+    model = queryset.model
+    tables = {
+        'document': SearchDocument._meta.db_table,
+        'fts': FTS_TABLE,
+        'table': model._meta.db_table,
+        'pk': model._meta.pk.column,
+    }
+    tables_list = [tables['document']]
+    where = [
+        '{document}.object_id = {table}.{pk}',
+        '{document}.content_type_id = %s',
+    ]
+    params = [ContentType.objects.get_for_model(model).id]
+    select, select_params, order_by = {}, [], None
+
+    if connection.vendor == 'postgresql':
+        query = ' & '.join('{}:*'.format(token) for token in tokens)
+        where.append("to_tsvector('simple', {document}.body) @@ to_tsquery('simple', %s)")
+        params.append(query)
+        select['search_rank'] = (
+            "ts_rank(to_tsvector('simple', {document}.body), to_tsquery('simple', %s))"
+        ).format(**tables)
+        select_params.append(query)
+        order_by = ['-search_rank']
+    elif has_fts_table():
+        tables_list.append(FTS_TABLE)
+        where.extend(['{fts}.rowid = {document}.id', '{fts} MATCH %s'])
+        params.append(' '.join('"{}"*'.format(token) for token in tokens))
+        select['search_rank'] = '{fts}.rank'.format(**tables)
+        order_by = ['search_rank']
+    else:
+        for token in tokens:
+            where.append("UPPER({document}.body) LIKE UPPER(%s) ESCAPE '!'")
+            params.append('%{}%'.format(token.replace('_', '!_')))
+
+    queryset = queryset.extra(
+        select=select,
+        select_params=select_params,
+        tables=tables_list,
+        where=[condition.format(**tables) for condition in where],
+        params=params
+    )
+
+    return queryset.extra(order_by=order_by) if order_by else queryset
+
+
+def search(model, text):
+    return list(search_queryset(model._default_manager.all(), text).values_list('pk', flat=True))
@@ -0,0 +1,16 @@
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from .documents import search_queryset
+
+
+class FullTextSearchFilter(filters.BaseFilterBackend):
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+
+        if not text:
+            return queryset
+
+        return search_queryset(queryset, text)
@@ -0,0 +1,115 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_word_filter import FullWordSearchFilter
+
+from materials.models import Material
+from students.models import Subject, Teacher
+
+from search.documents import rebuild_index, optimize_index
+from search.filters import FullTextSearchFilter
+
+
+WORDS = (
+    'algebra', 'geometry', 'equation', 'function', 'integral', 'vector', 'matrix', 'graph',
+    'network', 'protocol', 'circuit', 'voltage', 'signal', 'database', 'compiler', 'pointer',
+    'history', 'poetry', 'grammar', 'physics', 'energy', 'motion', 'chemistry', 'reaction',
+)
+
+QUERIES = ('integral', 'vector matrix', 'compiler pointer database', 'quadratic discriminant')
+
+
+class Rollback(Exception):
+    pass
+
+
+class WordSearchView(object):
+    word_fields = ('title', 'section', 'content')
+
+
+class Command(BaseCommand):
+    help = 'Compares word-boundary search with the full-text index on generated materials.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=100000)
+        parser.add_argument('--rounds', type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['documents'], options['rounds'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, documents, rounds):
+        self.generate_materials(documents)
+
+        started = time.time()
+        rebuild_index(Material)
+        optimize_index()
+        self.stdout.write('Indexed {} materials in {:.2f}s'.format(documents, time.time() - started))
+
+        factory = APIRequestFactory()
+        queryset = Material.objects.all()
+
+        for query in QUERIES:
+            request = Request(factory.get('/', {'search': query}))
+
+            word = self.measure(
+                lambda: list(FullWordSearchFilter().filter_queryset(
+                    request, queryset, WordSearchView()
+                ).values_list('id', flat=True)),
+                rounds
+            )
+            full_text = self.measure(
+                lambda: list(FullTextSearchFilter().filter_queryset(
+                    request, queryset, None
+                ).values_list('id', flat=True)),
+                rounds
+            )
+
+            self.stdout.write('"{}": word filter {:.1f} ms, full-text {:.1f} ms ({:.1f}x)'.format(
+                query, word * 1000, full_text * 1000, word / full_text
+            ))
+
+    def generate_materials(self, documents):
+        subject = Subject.objects.create(title='Benchmark')
+        author = Teacher.objects.create(
+            user=User.objects.create(username='bench_search_teacher'), subject=subject
+        )
+        rng = random.Random(0)
+
+        def sentence(length):
+            return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+        # bulk_create skips post_save, so the index is built once afterwards.
+        Material.objects.bulk_create([
+            Material(
+                title=sentence(4),
+                section=sentence(2),
+                content=sentence(60),
+                class_number=rng.randint(8, 12),
+                subject=subject,
+                author=author
+            )
+            for _ in range(documents)
+        ])
+
+    @staticmethod
+    def measure(func, rounds):
+        best = None
+
+        for _ in range(rounds):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        return best
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from search.documents import get_indexed_models, rebuild_index, optimize_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index for news, materials, homeworks and talks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for model in get_indexed_models():
+            started = time.time()
+            indexed = rebuild_index(model, batch_size=options['batch_size'])
+
+            self.stdout.write('Indexed {} {} in {:.2f}s'.format(
+                indexed, model._meta.verbose_name_plural, time.time() - started
+            ))
+
+        optimize_index()
+
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, OperationalError
+
+
+SQLITE_FTS_SQL = [
+    "CREATE VIRTUAL TABLE search_searchdocument_fts USING fts5("
+    "body, content='search_searchdocument', content_rowid='id')",
+    "CREATE TRIGGER search_searchdocument_ai AFTER INSERT ON search_searchdocument BEGIN "
+    "INSERT INTO search_searchdocument_fts(rowid, body) VALUES (new.id, new.body); END",
+    "CREATE TRIGGER search_searchdocument_ad AFTER DELETE ON search_searchdocument BEGIN "
+    "INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, body) "
+    "VALUES ('delete', old.id, old.body); END",
+    "CREATE TRIGGER search_searchdocument_au AFTER UPDATE ON search_searchdocument BEGIN "
+    "INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, body) "
+    "VALUES ('delete', old.id, old.body); "
+    "INSERT INTO search_searchdocument_fts(rowid, body) VALUES (new.id, new.body); END",
+]
+
+SQLITE_DROP_FTS_SQL = [
+    'DROP TRIGGER IF EXISTS search_searchdocument_au',
+    'DROP TRIGGER IF EXISTS search_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS search_searchdocument_ai',
+    'DROP TABLE IF EXISTS search_searchdocument_fts',
+]
+
+POSTGRESQL_GIN_SQL = [
+    "CREATE INDEX search_searchdocument_body_gin ON search_searchdocument "
+    "USING GIN (to_tsvector('simple', body))",
+]
+
+POSTGRESQL_DROP_GIN_SQL = [
+    'DROP INDEX IF EXISTS search_searchdocument_body_gin',
+]
+
+SEARCH_FIELDS = {
+    ('news', 'News'): ('title', 'content', 'author__username'),
+    ('materials', 'Material'): ('title', 'section', 'content'),
+    ('homeworks', 'Homework'): ('topic', 'details', 'subject__title', 'author__user__username'),
+    ('talks', 'Talk'): ('topic', 'description', 'author__username'),
+}
+
+
+def create_full_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        try:
+            schema_editor.execute(SQLITE_FTS_SQL[0])
+        except OperationalError:
+            # SQLite was built without FTS5 - search falls back to LIKE queries.
+            return
+
+        for sql in SQLITE_FTS_SQL[1:]:
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        for sql in POSTGRESQL_GIN_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_full_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        for sql in SQLITE_DROP_FTS_SQL:
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        for sql in POSTGRESQL_DROP_GIN_SQL:
+            schema_editor.execute(sql)
+
+
+def index_existing_objects(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+
+    for (app_label, model_name), fields in SEARCH_FIELDS.items():
+        model = apps.get_model(app_label, model_name)
+        content_type, _ = ContentType.objects.get_or_create(
+            app_label=app_label, model=model_name.lower()
+        )
+
+        SearchDocument.objects.bulk_create([
+            SearchDocument(
+                content_type=content_type,
+                object_id=row[0],
+                body=' '.join(str(value) for value in row[1:] if value)
+            )
+            for row in model.objects.order_by().values_list('pk', *fields).iterator()
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('news', '0013_auto_20261017_0001'),
+        ('materials', '0004_auto_20261017_0001'),
+        ('homeworks', '0005_auto_20261017_0001'),
+        ('talks', '0009_auto_20171205_1633'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+        migrations.RunPython(index_existing_objects, migrations.RunPython.noop),
+    ]
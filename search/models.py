@@ -0,0 +1,14 @@
+from django.db import models
+from django.contrib.contenttypes.models import ContentType
+
+
+class SearchDocument(models.Model):
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    body = models.TextField(blank=True)
+
+    def __str__(self):
+        return '{} #{}'.format(self.content_type, self.object_id)
+
+    class Meta:
+        unique_together = ('content_type', 'object_id')
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save, post_delete
+
+from students.signals import post_bulk_create
+
+from .documents import get_indexed_models, index_object, index_objects, unindex_object
+
+
+def update_search_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_object(instance)
+
+
+def create_search_documents(sender, objects, **kwargs):
+    index_objects(objects)
+
+
+def delete_search_document(sender, instance, **kwargs):
+    unindex_object(instance)
+
+
+for model in get_indexed_models():
+    post_save.connect(update_search_document, sender=model, dispatch_uid='search_save')
+    post_delete.connect(delete_search_document, sender=model, dispatch_uid='search_delete')
+    post_bulk_create.connect(
+        create_search_documents, sender=model, dispatch_uid='search_bulk_create'
+    )
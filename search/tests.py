@@ -0,0 +1,177 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils.six import StringIO
+
+from rest_framework.test import APIClient
+from rest_framework.reverse import reverse
+from rest_framework import status
+
+from students.testing import APITestCase
+from students.models import Class, Subject, Student, Teacher
+from students.utils import bulk_create_with_ids
+from news.models import News
+from materials.models import Material
+from talks.models import Meetup, Talk
+
+from .models import SearchDocument
+from .documents import search, search_queryset, rebuild_index, index_objects
+
+
+class SearchIndexTestCase(APITestCase):
+    def setUp(self):
+        self.subject = Subject.objects.create(title='Maths')
+
+        self.user = User.objects.create(username='teacher', password='pass')
+        self.teacher = Teacher.objects.create(user=self.user, subject=self.subject)
+
+        self.material = Material.objects.create(
+            title='Quadratic equations',
+            section='Algebra',
+            content='Solving equations with the discriminant',
+            class_number=10,
+            subject=self.subject,
+            author=self.teacher
+        )
+
+    def test_documents_are_created_on_save(self):
+        self.assertEqual(search(Material, 'discriminant'), [self.material.id])
+        self.assertEqual(search(Material, 'quadr algeb'), [self.material.id])
+        self.assertEqual(search(Material, 'geometry'), [])
+
+    def test_documents_are_updated_on_save(self):
+        self.material.content = 'Vieta formulas'
+        self.material.save()
+
+        self.assertEqual(search(Material, 'discriminant'), [])
+        self.assertEqual(search(Material, 'vieta'), [self.material.id])
+
+    def test_documents_are_removed_on_delete(self):
+        material_id = self.material.id
+        self.material.delete()
+
+        self.assertEqual(search(Material, 'equations'), [])
+        self.assertFalse(SearchDocument.objects.filter(object_id=material_id).exists())
+
+    def test_search_is_scoped_to_model(self):
+        meetup = Meetup.objects.create(date='2017-12-01T18:00:00Z')
+        talk = Talk.objects.create(
+            meetup=meetup, author=self.user, topic='Equations in Python', description='Talk'
+        )
+
+        self.assertEqual(search(Talk, 'equations'), [talk.id])
+        self.assertEqual(search(Material, 'python'), [])
+
+    def test_search_ranks_better_matches_first(self):
+        other_material = Material.objects.create(
+            title='Equations',
+            section='Equations',
+            content='Equations, equations and more equations',
+            class_number=10,
+            subject=self.subject,
+            author=self.teacher
+        )
+
+        self.assertEqual(search(Material, 'equations'), [other_material.id, self.material.id])
+
+    def test_search_ignores_query_syntax(self):
+        self.assertEqual(search(Material, '"discriminant* (solving) -'), [self.material.id])
+        self.assertEqual(search(Material, '*** ---'), [])
+
+    def test_search_is_scoped_to_queryset(self):
+        other_material = Material.objects.create(
+            title='Equations',
+            section='Equations',
+            content='Equations, equations and more equations',
+            class_number=11,
+            subject=self.subject,
+            author=self.teacher
+        )
+        materials = Material.objects.filter(class_number=10)
+
+        self.assertEqual(list(search_queryset(materials, 'equations')), [self.material])
+        self.assertEqual(
+            list(search_queryset(Material.objects.all(), 'equations')),
+            [other_material, self.material]
+        )
+
+    def test_broad_search(self):
+        Material.objects.bulk_create([
+            Material(
+                title='Equations {}'.format(index),
+                content='More equations',
+                class_number=10,
+                subject=self.subject,
+                author=self.teacher
+            )
+            for index in range(1500)
+        ])
+        rebuild_index(Material)
+
+        self.assertEqual(search_queryset(Material.objects.all(), 'equations').count(), 1501)
+
+    def test_bulk_created_objects_are_indexed_at_once(self):
+        materials = bulk_create_with_ids(Material, [
+            Material(
+                title='Vectors {}'.format(index), section='Geometry', content='Dot product',
+                class_number=10, subject=self.subject, author=self.teacher
+            )
+            for index in range(3)
+        ])
+
+        with self.assertNumQueries(2):
+            index_objects(materials)
+
+        self.assertEqual(
+            sorted(search(Material, 'vectors')), [material.id for material in materials]
+        )
+
+    def test_rebuild_command(self):
+        SearchDocument.objects.all().delete()
+        self.assertEqual(search(Material, 'discriminant'), [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        self.assertEqual(search(Material, 'discriminant'), [self.material.id])
+
+
+class FullTextSearchFilterTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.list_view_name = 'news:students_news-list'
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.user = User.objects.create(username='student', password='pass')
+        self.student = Student.objects.create(user=self.user, clazz=self.clazz)
+
+        self.trip_news = News.objects.create(
+            title='School trip', content='We are going to Rila', author=self.user,
+            class_number=10, class_letter='A'
+        )
+        self.exam_news = News.objects.create(
+            title='Exam postponed', content='The trip exam is moved', author=self.user,
+            class_number=10, class_letter='A'
+        )
+        self.other_class_news = News.objects.create(
+            title='Another trip', content='Trip for 11B', author=self.user,
+            class_number=11, class_letter='B'
+        )
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_search_filters_and_ranks_news(self):
+        response = self.client.get(reverse(self.list_view_name), {'search': 'trip'})
+
+        results = response.data['results']
+        self.assertEqual([news['id'] for news in results], [self.trip_news.id, self.exam_news.id])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_search_by_author_username(self):
+        response = self.client.get(reverse(self.list_view_name), {'search': 'student rila'})
+
+        self.assertEqual(response.data['count'], 1)
+
+    def test_search_without_matches(self):
+        response = self.client.get(reverse(self.list_view_name), {'search': 'holiday'})
+
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,106 @@
+import numpy as np
+
+from .caching import (
+    get_response_cache_setting, get_audience_entry, invalidate_responses, store_response
+)
+from .models import Grade
+from .reference import classes as reference_classes
+
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Marks on the Bulgarian 2-6 scale: Poor, Average, Good, Very good, Excellent
+GRADE_MARKS = (2, 3, 4, 5, 6)
+GRADE_BUCKET_EDGES = (2, 3, 3.5, 4.5, 5.5, 6)
+
+CACHE_NAMESPACE = 'grade_stats'
+
+
+def describe(values):
+    if not values.size:
+        return {'count': 0}
+
+    percentiles = np.percentile(values, PERCENTILES)
+    histogram, _ = np.histogram(values, bins=GRADE_BUCKET_EDGES)
+
+    return {
+        'count': int(values.size),
+        'mean': round(float(values.mean()), 2),
+        'median': round(float(np.median(values)), 2),
+        'std': round(float(values.std()), 2),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'percentiles': {
+            'p{}'.format(rank): round(float(value), 2)
+            for rank, value in zip(PERCENTILES, percentiles)
+        },
+        'histogram': [
+            {'mark': mark, 'count': int(count)}
+            for mark, count in zip(GRADE_MARKS, histogram)
+        ]
+    }
+
+
+def load_grades(subject, class_number=None, class_letter=''):
+    grades = Grade.objects.filter(subject=subject)
+
+    if class_number:
+        grades = grades.filter(student__clazz__number=class_number)
+    if class_letter:
+        grades = grades.filter(student__clazz__letter=class_letter)
+
+    rows = np.array(
+        list(grades.order_by().values_list('student__clazz_id', 'value')), dtype=float
+    ).reshape(-1, 2)
+
+    return rows[:, 0].astype(int), rows[:, 1]
+
+
+def compute_grade_stats(subject, class_number=None, class_letter=''):
+    class_ids, values = load_grades(subject, class_number, class_letter)
+    overall = describe(values)
+
+    # Sort by class, then split the values into one contiguous array per class.
+    order = np.lexsort((values, class_ids))
+    class_ids, values = class_ids[order], values[order]
+    unique_ids, starts = np.unique(class_ids, return_index=True)
+    groups = np.split(values, starts[1:])
+
+    classes = reference_classes.get_snapshot().by_id
+    comparison = []
+
+    for class_id, group in zip(unique_ids.tolist(), groups):
+        stats = describe(group)
+        stats['difference'] = round(stats['mean'] - overall['mean'], 2)
+        stats['class'] = {
+            'id': class_id,
+            'number': classes[class_id].number,
+            'letter': classes[class_id].letter
+        }
+        comparison.append(stats)
+
+    return {
+        'subject': {'id': subject.id, 'title': subject.title},
+        'overall': overall,
+        'classes': comparison
+    }
+
+
+def get_grade_stats(subject, class_number=None, class_letter=''):
+    if not get_response_cache_setting('ENABLED'):
+        return compute_grade_stats(subject, class_number, class_letter)
+
+    key, generation, variants = get_audience_entry(CACHE_NAMESPACE, (subject.id,))
+    variant = '{}:{}'.format(class_number or '', class_letter)
+
+    if variant in variants:
+        return variants[variant]
+
+    stats = compute_grade_stats(subject, class_number, class_letter)
+    store_response(key, generation, variant, stats)
+
+    return stats
+
+
+def invalidate_grade_stats(subject_ids):
+    invalidate_responses(CACHE_NAMESPACE, [(subject_id,) for subject_id in subject_ids])
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class StudentsConfig(AppConfig):
     name = 'students'
+
+    def ready(self):
+        from . import checks, signals  # noqa
@@ -0,0 +1,61 @@
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+
+from rest_framework import authentication, exceptions
+
+from .tokens import ACCESS, InvalidToken, verify_token
+
+
+class SignedTokenAuthentication(authentication.BaseAuthentication):
+    """
+    Authenticates `Authorization: Bearer <token>` headers carrying a signed
+    access token. The user is built from the token payload without querying
+    the database, so it has no name, groups or permissions and `is_staff` and
+    `is_superuser` are always False. `get_role` replaces it with the full user
+    when a view needs it, so check those flags only after calling it.
+
+    `request.auth` is the token payload.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        auth = authentication.get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed('Invalid token header.')
+
+        try:
+            payload = verify_token(auth[1].decode(), ACCESS)
+        except (InvalidToken, UnicodeError) as error:
+            message = str(error) if isinstance(error, InvalidToken) else 'Invalid token.'
+            raise exceptions.AuthenticationFailed(message)
+
+        return User(id=payload['uid'], is_active=True), payload
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class ThrottledBasicAuthentication(authentication.BasicAuthentication):
+    """
+    Passes the request on to the authentication backends, so that password
+    checks are cached and throttled per IP address.
+    """
+    def authenticate(self, request):
+        self.request = request
+
+        return super().authenticate(request)
+
+    def authenticate_credentials(self, userid, password):
+        user = authenticate(username=userid, password=password, request=self.request)
+
+        if user is None:
+            raise exceptions.AuthenticationFailed('Invalid username/password.')
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+        return user, None
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.validators import validate_email, ValidationError
+from django.db.models import Q
+
+from .credentials import check_password, throttle_password_check
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    `ModelBackend` that remembers successful password checks for a few minutes
+    and throttles the ones that have to hash a password. Pass `request` to
+    `authenticate()` to throttle by IP address as well as by account.
+    """
+    def get_login_user(self, username):
+        return get_user_model()._default_manager.get_by_natural_key(username)
+
+    def authenticate(self, username=None, password=None, request=None, **kwargs):
+        UserModel = get_user_model()
+
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+
+        try:
+            user = self.get_login_user(username)
+        except UserModel.DoesNotExist:
+            throttle_password_check(request, username)
+
+            # Hash anyway, so a missing user takes as long as a wrong password.
+            UserModel().set_password(password)
+        else:
+            if check_password(request, user, password) and self.user_can_authenticate(user):
+                return user
+
+
+def is_email(value):
+    try:
+        validate_email(value)
+    except ValidationError:
+        return False
+
+    return True
+
+
+class EmailOrUsernameBackend(CachedModelBackend):
+    """
+    Accepts an email address in place of the username. The user is loaded in
+    a single query, together with its student or teacher profile and API token.
+    """
+    def get_login_user(self, username):
+        UserModel = get_user_model()
+        users = UserModel._default_manager.select_related(
+            'student__clazz', 'teacher__subject', 'auth_token'
+        )
+
+        if not is_email(username):
+            return users.get(username=username)
+
+        # An email address may also be someone's username; the email match wins.
+        matches = list(users.filter(Q(email=username) | Q(username=username))[:2])
+
+        if not matches:
+            raise UserModel.DoesNotExist()
+
+        return min(matches, key=lambda user: user.email != username)
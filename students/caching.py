@@ -0,0 +1,225 @@
+import gzip
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from rest_framework.response import Response
+
+from .conditional import get_not_modified_response
+
+
+DEFAULT_RESPONSE_CACHE_SETTINGS = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'TIMEOUT': 5 * 60,
+    'MAX_VARIANTS': 20,
+    'COMPRESS_LEVEL': 6,
+}
+
+SKIPPED_HEADERS = ('content-type', 'content-length', 'content-encoding')
+
+
+def get_response_cache_setting(name):
+    options = getattr(settings, 'RESPONSE_CACHE', {})
+
+    return options.get(name, DEFAULT_RESPONSE_CACHE_SETTINGS[name])
+
+
+def get_response_cache():
+    return caches[get_response_cache_setting('CACHE')]
+
+
+def get_audience_key(namespace, audience):
+    return 'responses:{}:{}'.format(namespace, ':'.join(str(part) for part in audience))
+
+
+def new_audience_entry():
+    return {'generation': uuid.uuid4().hex, 'variants': OrderedDict()}
+
+
+def get_audience_entry(namespace, audience):
+    """
+    Returns the audience's cache key, the generation of its entry (None when
+    there is none) and its cached responses, as an OrderedDict of
+    variant -> response. This is a single cache lookup.
+    """
+    key = get_audience_key(namespace, audience)
+    entry = get_response_cache().get(key)
+
+    if entry is None:
+        return key, None, OrderedDict()
+
+    return key, entry['generation'], entry['variants']
+
+
+def invalidate_responses(namespace, audiences):
+    """
+    Drops every cached response of the given audiences by replacing their
+    entries with empty ones under a new generation. Inside a transaction this
+    runs again on commit, since other workers may have re-cached the old rows
+    in the meantime.
+    """
+    if not get_response_cache_setting('ENABLED'):
+        return
+
+    keys = [get_audience_key(namespace, audience) for audience in audiences]
+
+    def invalidate():
+        get_response_cache().set_many(
+            {key: new_audience_entry() for key in keys},
+            get_response_cache_setting('TIMEOUT')
+        )
+
+    invalidate()
+
+    if connection.in_atomic_block:
+        transaction.on_commit(invalidate)
+
+
+def get_saved_values(instance, *fields):
+    """
+    Returns the values `fields` have in the database before `instance` is
+    saved, or None for a new instance. Used in pre_save, so that an update
+    also invalidates the audiences the instance is moved away from.
+    """
+    if instance.pk is None or not get_response_cache_setting('ENABLED'):
+        return None
+
+    return instance.__class__._default_manager.filter(pk=instance.pk).values(*fields).first()
+
+
+def store_response(key, generation, variant, cached_response):
+    """
+    Adds a response to the audience's entry, unless the entry has been
+    replaced since `generation` was read, i.e. the response may be stale.
+
+    The check and the write are not atomic: an invalidation landing between
+    them is undone, and only the repeated invalidation on commit or the
+    entry's TIMEOUT drops the stale response. Concurrent stores may also drop
+    each other's variants.
+    """
+    cache = get_response_cache()
+    entry = cache.get(key)
+
+    if entry is None and generation is None:
+        entry = new_audience_entry()
+    elif entry is None or entry['generation'] != generation:
+        return
+
+    variants = entry['variants']
+    variants.pop(variant, None)
+    variants[variant] = cached_response
+
+    while len(variants) > get_response_cache_setting('MAX_VARIANTS'):
+        variants.popitem(last=False)
+
+    cache.set(key, entry, get_response_cache_setting('TIMEOUT'))
+
+
+def accepts_gzip(request):
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+
+class ResponseCacheMixin(object):
+    """
+    Shares rendered list responses between all users of the same audience,
+    e.g. every student in a class. A hit is a single cache lookup and is
+    served gzip-compressed as stored, or decompressed for clients that do
+    not accept gzip. Only JSON responses are cached, per media type.
+
+    ETags are seeded with the audience rather than the user, since the cached
+    headers are sent to everyone in it.
+    """
+    cache_namespace = None
+
+    def get_cache_audience(self):
+        raise NotImplementedError()
+
+    def get_cache_variant(self, request):
+        return '{} {}'.format(request.accepted_media_type, request.get_full_path())
+
+    def get_etag_audience(self):
+        audience = self.get_cache_audience()
+
+        return super().get_etag_audience() if audience is None else audience
+
+    def list(self, request, *args, **kwargs):
+        self.response_cache_miss = None
+        audience = self.get_cache_audience()
+
+        cacheable = (
+            get_response_cache_setting('ENABLED') and
+            audience is not None and
+            request.accepted_renderer.format == 'json'
+        )
+
+        if not cacheable:
+            return super().list(request, *args, **kwargs)
+
+        key, generation, variants = get_audience_entry(self.cache_namespace, audience)
+        variant = self.get_cache_variant(request)
+
+        if variant in variants:
+            return self.build_cached_response(request, variants[variant])
+
+        self.response_cache_miss = (key, generation, variant)
+
+        return super().list(request, *args, **kwargs)
+
+    def build_cached_response(self, request, cached_response):
+        content_type, content, headers, validators = cached_response
+
+        response = get_not_modified_response(request, *validators) if validators else None
+
+        if response is None:
+            if accepts_gzip(request):
+                response = HttpResponse(content, content_type=content_type)
+                response['Content-Encoding'] = 'gzip'
+            else:
+                response = HttpResponse(gzip.decompress(content), content_type=content_type)
+
+            response['Content-Length'] = len(response.content)
+
+        for header, value in headers:
+            response[header] = value
+
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        if getattr(self, 'response_cache_miss', None) is None:
+            return response
+
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+
+        cacheable = (
+            isinstance(response, Response) and
+            response.status_code == 200 and
+            response.accepted_renderer.format == 'json'
+        )
+
+        if cacheable:
+            response.render()
+
+            content = gzip.compress(
+                response.content, get_response_cache_setting('COMPRESS_LEVEL')
+            )
+            headers = [
+                (header, value)
+                for header, value in response.items()
+                if header.lower() not in SKIPPED_HEADERS
+            ]
+            validators = getattr(self, 'response_validators', None)
+
+            store_response(
+                *self.response_cache_miss,
+                cached_response=(response['Content-Type'], content, headers, validators)
+            )
+
+        return response
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core import checks
+
+from .caching import get_response_cache_setting
+from .reference import get_reference_data_setting
+from .tokens import get_signed_token_setting
+
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def check_shared_cache(setting, alias, consequence, error_id):
+    """
+    Returns an error when the cache `alias` is kept in each process, so that
+    what one worker writes there is never seen by the others.
+    """
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+
+    return [checks.Error(
+        '{} uses {}, which is not shared between workers, so {}.'.format(
+            setting, backend, consequence
+        ),
+        hint='Point it at a shared cache such as memcached, FileBasedCache or DatabaseCache.',
+        id=error_id,
+    )]
+
+
+@checks.register(checks.Tags.security, deploy=True)
+def check_revocation_cache(app_configs, **kwargs):
+    """
+    Token revocations have to reach every worker, see `verify_token`.
+    Runs with `manage.py check --deploy`, like the checks below.
+    """
+    return check_shared_cache(
+        "SIGNED_TOKENS['CACHE']", get_signed_token_setting('CACHE'),
+        'revoked tokens keep working in the other workers until they expire',
+        'students.E001'
+    )
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_reference_data_cache(app_configs, **kwargs):
+    if not get_reference_data_setting('ENABLED'):
+        return []
+
+    return check_shared_cache(
+        "REFERENCE_DATA['CACHE']", get_reference_data_setting('CACHE'),
+        'classes and subjects saved in one worker are not seen by the others until a restart',
+        'students.E002'
+    )
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_response_cache(app_configs, **kwargs):
+    if not get_response_cache_setting('ENABLED'):
+        return []
+
+    return check_shared_cache(
+        "RESPONSE_CACHE['CACHE']", get_response_cache_setting('CACHE'),
+        'the other workers keep serving cached lists for up to TIMEOUT seconds after a change',
+        'students.E003'
+    )
@@ -0,0 +1,142 @@
+import calendar
+import hashlib
+import json
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def get_timestamp_validator(queryset, fields):
+    queryset = queryset.model._default_manager.filter(pk__in=queryset.order_by().values('pk'))
+
+    aggregates = {}
+    for index, field in enumerate(fields):
+        relation = field.rpartition('__')[0] or 'pk'
+        aggregates['max_{}'.format(index)] = Max(field)
+        aggregates['count_{}'.format(index)] = Count(relation, distinct=True)
+
+    values = queryset.order_by().aggregate(**aggregates)
+
+    timestamps = [
+        values['max_{}'.format(index)]
+        for index in range(len(fields))
+        if values['max_{}'.format(index)] is not None
+    ]
+    last_modified = max(timestamps) if timestamps else None
+
+    validator = [
+        (str(values['max_{}'.format(index)]), values['count_{}'.format(index)])
+        for index in range(len(fields))
+    ]
+
+    return validator, last_modified
+
+
+def get_content_validator(queryset, fields):
+    digest = hashlib.md5()
+
+    for row in queryset.order_by('pk').values_list('pk', *fields).iterator():
+        digest.update(repr(row).encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+def get_not_modified_response(request, etag, last_modified):
+    # Deleting a row does not move max(last_edited_on), so If-Modified-Since
+    # is only trusted together with a matching ETag.
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified if 'HTTP_IF_NONE_MATCH' in request.META else None
+    )
+
+
+class ConditionalListMixin(object):
+    timestamp_fields = ()
+    content_fields = ()
+    cache_control = {'private': True, 'no_cache': True}
+
+    def get_validator(self, queryset):
+        if self.timestamp_fields:
+            return get_timestamp_validator(queryset, self.timestamp_fields)
+
+        return get_content_validator(queryset, self.content_fields), None
+
+    def get_etag_audience(self):
+        return self.request.user.pk
+
+    def get_validators(self, queryset):
+        validator, last_modified = self.get_validator(queryset)
+
+        seed = json.dumps([
+            self.request.get_full_path(),
+            self.request.accepted_media_type,
+            self.get_etag_audience(),
+            validator
+        ])
+        etag = hashlib.md5(seed.encode('utf-8')).hexdigest()
+
+        if last_modified is not None:
+            last_modified = calendar.timegm(last_modified.utctimetuple())
+
+        return etag, last_modified
+
+    def patch_conditional_headers(self, response, etag, last_modified):
+        response['ETag'] = quote_etag(etag)
+
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+
+        patch_cache_control(response, **self.cache_control)
+        patch_vary_headers(response, ('Accept', 'Authorization'))
+
+        return response
+
+    def conditional_response(self, request, queryset, handler, *args, **kwargs):
+        etag, last_modified = self.get_validators(queryset)
+        self.response_validators = (etag, last_modified)
+
+        response = get_not_modified_response(request, etag, last_modified)
+
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+            if response.status_code != 200:
+                return response
+
+        return self.patch_conditional_headers(response, etag, last_modified)
+
+    filtered_queryset = None
+
+    def filter_queryset(self, queryset):
+        # list() filters once for the validator and the list itself reuses
+        # the result, so that e.g. a full-text search runs only once.
+        if self.filtered_queryset is not None:
+            return self.filtered_queryset
+
+        return super().filter_queryset(queryset)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        self.filtered_queryset = queryset
+
+        return self.conditional_response(request, queryset, super().list, *args, **kwargs)
+
+
+class ConditionalResponseMixin(ConditionalListMixin):
+    retrieved_object = None
+
+    def get_object(self):
+        if self.retrieved_object is not None:
+            return self.retrieved_object
+
+        return super().get_object()
+
+    def retrieve(self, request, *args, **kwargs):
+        # get_object() runs the filter backends and the permission checks and
+        # raises 404 before a 304 can be sent; the handler reuses the object.
+        obj = self.retrieved_object = self.get_object()
+        queryset = obj.__class__._default_manager.filter(pk=obj.pk)
+
+        return self.conditional_response(request, queryset, super().retrieve, *args, **kwargs)
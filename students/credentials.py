@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.crypto import salted_hmac
+
+from rest_framework import exceptions
+from rest_framework.throttling import BaseThrottle
+
+from .tokens import get_password_fingerprint
+
+
+DEFAULT_CREDENTIALS_SETTINGS = {
+    'CACHE_TIMEOUT': 5 * 60,
+    'CACHE_MAX_ENTRIES': 10000,
+    'THROTTLE_CACHE': 'default',
+    # (capacity, seconds to refill it) of the token buckets
+    'IP_THROTTLE': (100, 60),
+    'ACCOUNT_THROTTLE': (10, 60),
+}
+
+
+def get_credentials_setting(name):
+    options = getattr(settings, 'CREDENTIALS', {})
+
+    return options.get(name, DEFAULT_CREDENTIALS_SETTINGS[name])
+
+
+class CredentialCache(object):
+    """
+    A bounded, in-process LRU cache of successful password checks.
+
+    Keys are HMAC digests of the user id and the password, so the plaintext
+    is never kept. Values are a fingerprint of the stored password hash, so an
+    entry stops matching as soon as the password changes.
+    """
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                return None
+
+            fingerprint, expires = entry
+
+            if expires < time.time():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+
+            return fingerprint
+
+    def set(self, key, fingerprint):
+        with self.lock:
+            expires = time.time() + get_credentials_setting('CACHE_TIMEOUT')
+
+            self.entries[key] = (fingerprint, expires)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > get_credentials_setting('CACHE_MAX_ENTRIES'):
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+credential_cache = CredentialCache()
+
+
+def get_credential_key(user, password):
+    return salted_hmac('students.credentials', '{}:{}'.format(user.pk, password)).hexdigest()
+
+
+def take_token(key, capacity, period):
+    """
+    Takes a token from the bucket stored under `key`, which holds up to
+    `capacity` tokens and refills completely in `period` seconds.
+    Returns None on success or the seconds to wait for the next token.
+    """
+    cache = caches[get_credentials_setting('THROTTLE_CACHE')]
+    now = time.time()
+
+    tokens, updated = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated) * capacity / period)
+
+    if tokens < 1:
+        return (1 - tokens) * period / capacity
+
+    cache.set(key, (tokens - 1, now), period)
+
+    return None
+
+
+def throttle_password_check(request, account):
+    """
+    Raises `Throttled` when the client's IP address or the account has run out
+    of password checks. Only checks that have to hash a password are counted.
+    """
+    account = hashlib.md5(str(account).lower().encode()).hexdigest()
+    buckets = [('throttle:account:{}'.format(account), get_credentials_setting('ACCOUNT_THROTTLE'))]
+
+    if request is not None:
+        ident = BaseThrottle().get_ident(request)
+        buckets.insert(0, ('throttle:ip:{}'.format(ident), get_credentials_setting('IP_THROTTLE')))
+
+    for key, (capacity, period) in buckets:
+        wait = take_token(key, capacity, period)
+
+        if wait is not None:
+            raise exceptions.Throttled(wait)
+
+
+def check_password(request, user, password):
+    key = get_credential_key(user, password)
+
+    if credential_cache.get(key) == get_password_fingerprint(user):
+        return True
+
+    throttle_password_check(request, user.pk)
+
+    # `check_password` may upgrade the stored hash, so fingerprint it afterwards.
+    if not user.check_password(password):
+        return False
+
+    credential_cache.set(key, get_password_fingerprint(user))
+
+    return True
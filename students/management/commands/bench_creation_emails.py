@@ -0,0 +1,84 @@
+import time
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from exams.models import Exam
+from students.models import Class, Subject, Teacher
+from students.utils import BASE_CLIENT_URL, CreationEmailRenderer
+
+
+def render_per_recipient(user, model):
+    model_type = model.__class__.__name__.lower()
+    client_resource_link = '{model_type}s/{id}/'.format(model_type=model_type, id=model.id)
+
+    template_context = {
+        'full_name': user.get_full_name(),
+        'type': model_type,
+        'model': model,
+        'author': model.author,
+        'link': BASE_CLIENT_URL + client_resource_link
+    }
+    html_content = render_to_string('utils/email.html', context=template_context)
+
+    return strip_tags(html_content), html_content
+
+
+def render_once(users, model):
+    renderer = CreationEmailRenderer(model)
+
+    return [renderer.render(user) for user in users]
+
+
+class Command(BaseCommand):
+    help = 'Compares per-recipient CPU cost of creation email rendering (no database needed).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=500)
+        parser.add_argument('--rounds', type=int, default=5)
+
+    def handle(self, *args, **options):
+        subject = Subject(title='Maths')
+        author = Teacher(user=User(username='teacher'), subject=subject)
+        exam = Exam(
+            id=1,
+            subject=subject,
+            clazz=Class(number=10, letter='A'),
+            date=date.today(),
+            topic='Benchmark',
+            author=author
+        )
+        users = [
+            User(first_name='Student', last_name=str(i), email='student{}@elsyser.com'.format(i))
+            for i in range(options['recipients'])
+        ]
+
+        legacy = self.measure(
+            lambda: [render_per_recipient(user, exam) for user in users], options['rounds']
+        )
+        current = self.measure(lambda: render_once(users, exam), options['rounds'])
+
+        recipients = len(users)
+        self.stdout.write('Recipients: {}'.format(recipients))
+        self.stdout.write('Per-recipient render: {:.1f} us/recipient'.format(
+            legacy / recipients * 1e6
+        ))
+        self.stdout.write('Render once, personalize: {:.1f} us/recipient'.format(
+            current / recipients * 1e6
+        ))
+        self.stdout.write(self.style.SUCCESS('Speedup: {:.1f}x'.format(legacy / current)))
+
+    @staticmethod
+    def measure(func, rounds):
+        best = None
+
+        for _ in range(rounds):
+            started = time.process_time()
+            func()
+            elapsed = time.process_time() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        return best
@@ -0,0 +1,206 @@
+import csv
+import json
+import operator
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from outbox.utils import queue_emails
+from students.models import Class, Student
+from students.reference import bump_reference_version
+from students.serializers import StudentImportSerializer
+from students.utils import (
+    generate_activation_key, build_verification_email, bulk_create_with_ids
+)
+
+
+# SQLite allows at most 999 parameters per query.
+LOOKUP_BATCH_SIZE = 500
+
+
+def read_csv(source):
+    return list(csv.DictReader(source))
+
+
+def read_ndjson(source):
+    return [json.loads(line) for line in source if line.strip()]
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+}
+
+
+def batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def find_existing(field, values):
+    existing = set()
+
+    for batch in batches(sorted(values), LOOKUP_BATCH_SIZE):
+        existing.update(
+            User.objects.filter(**{field + '__in': batch}).values_list(field, flat=True)
+        )
+
+    return existing
+
+
+def hash_passwords(passwords, workers):
+    if workers <= 1:
+        yield from map(make_password, passwords)
+        return
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(make_password, passwords, chunksize=chunksize)
+
+
+class Command(BaseCommand):
+    help = (
+        'Registers students in bulk from a CSV or NDJSON file with username, first_name, '
+        'last_name, email, password, class_number and class_letter.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format', choices=sorted(READERS), default=None,
+            help='Input format. Defaults to the file extension.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Processes used to hash passwords.'
+        )
+
+    def handle(self, *args, **options):
+        started = time.time()
+
+        rows = self.read_rows(options['path'], options['format'])
+        entries = self.validate(rows)
+
+        if not entries:
+            raise CommandError('No valid students to import.')
+
+        classes = self.resolve_classes(entries)
+        passwords = hash_passwords([entry['password'] for entry in entries], options['workers'])
+        imported = 0
+
+        for chunk in batches(entries, options['chunk_size']):
+            chunk_started = time.time()
+            self.import_chunk(chunk, list(islice(passwords, len(chunk))), classes)
+            imported += len(chunk)
+
+            elapsed = time.time() - chunk_started
+            self.stdout.write('Imported {}/{} students in {:.2f}s ({:.1f} students/s)'.format(
+                imported, len(entries), elapsed, len(chunk) / elapsed if elapsed else len(chunk)
+            ))
+
+        elapsed = time.time() - started
+        self.stdout.write(self.style.SUCCESS(
+            'Done: {} imported, {} skipped in {:.2f}s ({:.1f} students/s)'.format(
+                imported, len(rows) - imported, elapsed, imported / elapsed if elapsed else imported
+            )
+        ))
+
+    def read_rows(self, path, file_format):
+        file_format = file_format or os.path.splitext(path)[1].lstrip('.').lower()
+        reader = READERS.get('ndjson' if file_format == 'jsonl' else file_format)
+
+        if reader is None:
+            raise CommandError('Unknown format "{}", use --format.'.format(file_format))
+
+        with open(path, encoding='utf-8-sig', newline='') as source:
+            return reader(source)
+
+    def validate(self, rows):
+        entries = []
+
+        for line, row in enumerate(rows, start=1):
+            serializer = StudentImportSerializer(data=row)
+
+            if serializer.is_valid():
+                entries.append(dict(serializer.validated_data, line=line))
+            else:
+                self.report(line, serializer.errors)
+
+        for field in ('username', 'email'):
+            existing = find_existing(field, {entry[field] for entry in entries})
+            unique_entries = []
+
+            for entry in entries:
+                if entry[field] in existing:
+                    message = 'User with this {} already exists.'.format(field)
+                    self.report(entry['line'], {field: [message]})
+                else:
+                    existing.add(entry[field])
+                    unique_entries.append(entry)
+
+            entries = unique_entries
+
+        return entries
+
+    def report(self, line, errors):
+        for field, messages in errors.items():
+            self.stderr.write('Row {}: {}: {}'.format(line, field, ' '.join(messages)))
+
+    def resolve_classes(self, entries):
+        keys = {(entry['class_number'], entry['class_letter']) for entry in entries}
+        query = reduce(operator.or_, (Q(number=number, letter=letter) for number, letter in keys))
+        classes = {(clazz.number, clazz.letter): clazz for clazz in Class.objects.filter(query)}
+
+        missing = [Class(number=number, letter=letter) for number, letter in keys - set(classes)]
+
+        with transaction.atomic():
+            bulk_create_with_ids(Class, missing)
+
+            # `bulk_create` sends no `post_save`.
+            if missing:
+                bump_reference_version()
+
+        classes.update({(clazz.number, clazz.letter): clazz for clazz in missing})
+
+        return classes
+
+    def import_chunk(self, entries, passwords, classes):
+        users = [
+            User(
+                username=entry['username'],
+                first_name=entry['first_name'],
+                last_name=entry['last_name'],
+                email=entry['email'],
+                password=password,
+                is_active=False
+            )
+            for entry, password in zip(entries, passwords)
+        ]
+
+        with transaction.atomic():
+            bulk_create_with_ids(User, users)
+
+            students = [
+                Student(
+                    user=user,
+                    clazz=classes[entry['class_number'], entry['class_letter']],
+                    activation_key=generate_activation_key()
+                )
+                for entry, user in zip(entries, users)
+            ]
+            Student.objects.bulk_create(students)
+
+            queue_emails([
+                build_verification_email(user, student.activation_key)
+                for user, student in zip(users, students)
+            ])
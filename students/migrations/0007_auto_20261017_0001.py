@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.2 on 2026-10-16 21:01
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0006_auto_20170919_2248'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='student',
+            name='activation_key',
+            field=models.CharField(blank=True, db_index=True, max_length=40, null=True),
+        ),
+        migrations.AlterField(
+            model_name='teacher',
+            name='activation_key',
+            field=models.CharField(blank=True, db_index=True, max_length=40, null=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='grade',
+            index_together=set([('subject', 'student')]),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.2 on 2026-10-17 00:02
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0007_auto_20261017_0001'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='grade',
+            index_together=set([('subject', 'student'), ('student', 'subject')]),
+        ),
+    ]
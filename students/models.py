@@ -47,7 +47,7 @@ class Account(models.Model):
         default='http://elsyser.herokuapp.com/static/default.png', blank=False
     )
     info = models.TextField(max_length=2048, blank=True)
-    activation_key = models.CharField(max_length=40, blank=True, null=True)
+    activation_key = models.CharField(max_length=40, blank=True, null=True, db_index=True)
 
     class Meta:
         abstract = True
@@ -67,6 +67,18 @@ class Teacher(Account):
         return '{} ({})'.format(self.user.username, self.subject)
 
 
+class GradeQuerySet(models.QuerySet):
+    def subject_averages(self):
+        return self.values('student_id', 'subject_id', 'subject__title').annotate(
+            count=models.Count('id'), average=models.Avg('value')
+        ).order_by('student_id', 'subject__title')
+
+    def report_card_rows(self):
+        return self.order_by('subject__title', 'id').values_list(
+            'subject_id', 'subject__title', 'id', 'value'
+        )
+
+
 class Grade(models.Model):
     GRADE_VALIDATORS = [MinValueValidator(2), MaxValueValidator(6)]
 
@@ -74,5 +86,13 @@ class Grade(models.Model):
     subject = models.ForeignKey(Subject, related_name='grades', on_delete=models.CASCADE)
     student = models.ForeignKey(Student, related_name='grades', on_delete=models.CASCADE)
 
+    objects = GradeQuerySet.as_manager()
+
     def __str__(self):
         return '{} - {} ({})'.format(self.student, self.subject, self.value)
+
+    class Meta:
+        index_together = [
+            ['subject', 'student'],
+            ['student', 'subject'],
+        ]
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+
+from django.conf import settings
+
+from rest_framework import pagination
+from rest_framework.response import Response
+
+
+DEFAULT_PAGINATION_SETTINGS = {
+    'MAX_PAGE_SIZE': 100,
+}
+
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+def get_pagination_setting(name):
+    options = getattr(settings, 'PAGINATION', {})
+
+    return options.get(name, DEFAULT_PAGINATION_SETTINGS[name])
+
+
+def get_requested_page_size(request, default, query_param='page_size'):
+    try:
+        page_size = int(request.query_params[query_param])
+    except (KeyError, ValueError):
+        return default
+
+    if page_size <= 0:
+        return default
+
+    return min(page_size, get_pagination_setting('MAX_PAGE_SIZE'))
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    page_size_query_param = 'page_size'
+
+    def get_page_size(self, request):
+        return get_requested_page_size(request, self.page_size, self.page_size_query_param)
+
+
+class CursorPagination(pagination.CursorPagination):
+    """
+    Keyset pagination: every page is a range scan on the ordering field, so
+    deep pages cost the same as the first one. The total count is skipped
+    unless the client asks for it with `?count=true`.
+    """
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+        self.count = None
+
+    def get_page_size(self, request):
+        return get_requested_page_size(
+            request, pagination.CursorPagination.page_size, self.page_size_query_param
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+
+        if request.query_params.get(self.count_query_param, '').lower() in TRUE_VALUES:
+            self.count = queryset.count()
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+
+        if self.count is not None:
+            response['count'] = self.count
+
+        response['results'] = data
+
+        return Response(response)
+
+
+class TimeOrderedPagination(pagination.BasePagination):
+    """
+    Switches to cursor pagination over `ordering` when the request carries a
+    `cursor` parameter (an empty one for the first page) and keeps the
+    `default_pagination_class` behaviour otherwise.
+    """
+    ordering = None
+    default_pagination_class = PageNumberPagination
+    cursor_query_param = 'cursor'
+
+    def __init__(self):
+        self.paginator = None
+
+    def get_paginator(self, request):
+        if self.cursor_query_param in request.query_params:
+            return CursorPagination(self.ordering)
+        if self.default_pagination_class is not None:
+            return self.default_pagination_class()
+
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+
+        if self.paginator is None:
+            return None
+
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_fields(self, view):
+        paginators = [CursorPagination(self.ordering)]
+
+        if self.default_pagination_class is not None:
+            paginators.insert(0, self.default_pagination_class())
+
+        return [field for paginator in paginators for field in paginator.get_fields(view)]
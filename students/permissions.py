@@ -1,6 +1,6 @@
 from rest_framework import permissions
 
-from .models import Student, Teacher
+from .roles import get_role
 
 
 ROLE_DEFAULT_MESSAGE = 'Only {}s are allowed to view and modify this content.'
@@ -16,14 +16,14 @@ class IsStudent(permissions.BasePermission):
     message = ROLE_DEFAULT_MESSAGE.format('student')
 
     def has_permission(self, request, view):
-        return Student.objects.filter(user=request.user).exists()
+        return get_role(request).is_student
 
 
 class IsTeacher(permissions.BasePermission):
     message = ROLE_DEFAULT_MESSAGE.format('teacher')
 
     def has_permission(self, request, view):
-        return Teacher.objects.filter(user=request.user).exists()
+        return get_role(request).is_teacher
 
 
 class IsUserAuthor(permissions.BasePermission):
@@ -37,18 +37,18 @@ class IsStudentAuthor(permissions.BasePermission):
     message = AUTHOR_DEFAULT_MESSAGE
 
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user.student
+        return obj.author == get_role(request).student
 
 
 class IsTeacherAuthor(permissions.BasePermission):
     message = AUTHOR_DEFAULT_MESSAGE
 
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user.teacher
+        return obj.author == get_role(request).teacher
 
 
 class IsTeachersSubject(permissions.BasePermission):
     message = 'You can modify content linked only with your subject.'
 
     def has_object_permission(self, request, view, obj):
-        return obj == request.user.teacher.subject
+        return obj == get_role(request).subject
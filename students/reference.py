@@ -0,0 +1,147 @@
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.http import Http404
+
+from .models import Class, Subject
+
+
+DEFAULT_REFERENCE_DATA_SETTINGS = {
+    'ENABLED': True,
+    'CACHE': 'default',
+}
+
+VERSION_KEY = 'reference-data:version'
+
+
+def get_reference_data_setting(name):
+    options = getattr(settings, 'REFERENCE_DATA', {})
+
+    return options.get(name, DEFAULT_REFERENCE_DATA_SETTINGS[name])
+
+
+def get_version_cache():
+    return caches[get_reference_data_setting('CACHE')]
+
+
+def get_reference_version():
+    cache = get_version_cache()
+    version = cache.get(VERSION_KEY)
+
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+
+    return version
+
+
+def bump_reference_version():
+    """
+    Makes every process reload its reference data. Inside a transaction this
+    runs again on commit, since other processes may have reloaded the old rows
+    in the meantime.
+    """
+    def bump():
+        get_version_cache().set(VERSION_KEY, uuid.uuid4().hex, None)
+
+    bump()
+
+    if connection.in_atomic_block:
+        transaction.on_commit(bump)
+
+
+class Snapshot(object):
+    def __init__(self, version, objects, fields):
+        self.version = version
+        self.objects = objects
+        self.by_id = {obj.pk: obj for obj in objects}
+        self.data = [
+            OrderedDict((field, getattr(obj, field)) for field in fields) for obj in objects
+        ]
+        self.digest = hashlib.md5(json.dumps(self.data).encode('utf-8')).hexdigest()
+
+
+class ClassSnapshot(Snapshot):
+    def __init__(self, version, objects, fields):
+        super().__init__(version, objects, fields)
+
+        self.by_key = {(clazz.number, clazz.letter): clazz for clazz in objects}
+        self.by_number = OrderedDict()
+
+        for clazz in self.data:
+            self.by_number.setdefault(clazz['number'], []).append(clazz)
+
+
+class ReferenceTable(object):
+    """
+    A per-process copy of a tiny, almost static table, with its rows
+    pre-serialized. It is reloaded whenever the version stamp shared through
+    Django's cache changes, which costs one cache lookup per access.
+
+    The objects are shared between requests and must not be modified.
+    """
+    def __init__(self, model, fields, snapshot_class=Snapshot):
+        self.model = model
+        self.fields = fields
+        self.snapshot_class = snapshot_class
+        self.snapshot = None
+        self.lock = threading.Lock()
+
+    def load(self, version):
+        return self.snapshot_class(version, list(self.model._default_manager.all()), self.fields)
+
+    def get_snapshot(self):
+        if not get_reference_data_setting('ENABLED'):
+            return self.load(None)
+
+        version = get_reference_version()
+        snapshot = self.snapshot
+
+        if snapshot is None or snapshot.version != version:
+            with self.lock:
+                snapshot = self.snapshot
+
+                if snapshot is None or snapshot.version != version:
+                    snapshot = self.snapshot = self.load(version)
+
+        return snapshot
+
+
+classes = ReferenceTable(Class, ('id', 'number', 'letter'), ClassSnapshot)
+subjects = ReferenceTable(Subject, ('id', 'title'))
+
+
+def get_class(number, letter):
+    try:
+        number = int(number)
+    except (TypeError, ValueError):
+        return None
+
+    return classes.get_snapshot().by_key.get((number, letter))
+
+
+def get_class_or_404(number=None, letter=None):
+    clazz = get_class(number, letter)
+
+    if clazz is None:
+        raise Http404('No Class matches the given query.')
+
+    return clazz
+
+
+def get_subject_or_404(pk):
+    try:
+        subject = subjects.get_snapshot().by_id.get(int(pk))
+    except (TypeError, ValueError):
+        subject = None
+
+    if subject is None:
+        raise Http404('No Subject matches the given query.')
+
+    return subject
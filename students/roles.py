@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.core.exceptions import ObjectDoesNotExist
+
+
+ROLE_ATTRIBUTE = '_elsyser_role'
+
+
+class Role(object):
+    STUDENT = 'student'
+    TEACHER = 'teacher'
+
+    def __init__(self, user=None):
+        self.user = user
+        self.student = self._get_related(user, 'student')
+        self.teacher = self._get_related(user, 'teacher')
+
+    @staticmethod
+    def _get_related(user, name):
+        if user is None:
+            return None
+
+        try:
+            return getattr(user, name)
+        except ObjectDoesNotExist:
+            return None
+
+    @property
+    def name(self):
+        if self.teacher is not None:
+            return self.TEACHER
+        if self.student is not None:
+            return self.STUDENT
+
+        return None
+
+    @property
+    def is_student(self):
+        return self.student is not None
+
+    @property
+    def is_teacher(self):
+        return self.teacher is not None
+
+    @property
+    def clazz(self):
+        return self.student.clazz if self.student else None
+
+    @property
+    def subject(self):
+        return self.teacher.subject if self.teacher else None
+
+
+def load_user(user_id):
+    return User.objects.select_related(
+        'student__clazz', 'teacher__subject'
+    ).filter(id=user_id).first()
+
+
+def get_role(request):
+    role = getattr(request, ROLE_ATTRIBUTE, None)
+
+    if role is None:
+        user = getattr(request, 'user', None)
+
+        if user is not None and user.is_authenticated:
+            user = load_user(user.id) or user
+            request.user = user
+            role = Role(user)
+        else:
+            role = Role()
+
+        setattr(request, ROLE_ATTRIBUTE, role)
+
+    return role
@@ -1,17 +1,26 @@
 import re
-
-import requests
+from collections import OrderedDict, defaultdict
+from functools import partial
+from itertools import groupby
 
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password as auth_validate_password
-from django.core.validators import validate_email, ValidationError
+from django.db import transaction
 
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
 from .models import Class, Subject, Student, Teacher, Grade
-from .utils import generate_activation_key, send_verification_email, send_creation_email
+from .analytics import invalidate_grade_stats
+from .reference import get_class
+from .roles import get_role, load_user
+from .tokens import ACCESS, REFRESH, InvalidToken, verify_token, check_password_fingerprint
+from .validators import image_url_validator
+from .utils import (
+    generate_activation_key, send_verification_email, send_creation_email, send_grade_emails,
+    send_class_creation_emails, send_created_signals, bulk_create_with_ids
+)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -57,6 +66,17 @@ class UserSerializer(serializers.ModelSerializer):
         return value
 
 
+class StudentImportSerializer(UserSerializer):
+    # Uniqueness is checked for a whole chunk at once by `import_students`.
+    username = serializers.CharField(min_length=3, max_length=30)
+    email = serializers.EmailField(max_length=100)
+    class_number = serializers.ChoiceField(choices=Class.CLASS_NUMBERS)
+    class_letter = serializers.ChoiceField(choices=Class.CLASS_LETTERS)
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ('class_number', 'class_letter')
+
+
 class UserLoginSerializer(serializers.Serializer):
     email_or_username = serializers.CharField()
     password = serializers.CharField(
@@ -66,32 +86,103 @@ class UserLoginSerializer(serializers.Serializer):
     )
 
     def validate(self, attrs):
-        email_or_username = attrs.get('email_or_username')
-        password = attrs.get('password')
+        user = authenticate(
+            username=attrs.get('email_or_username'),
+            password=attrs.get('password'),
+            request=self.context.get('request')
+        )
+
+        if not user:
+            raise serializers.ValidationError('Unable to log in with provided credentials.')
+
+        attrs['user'] = user
+
+        return attrs
 
+
+class TokenRefreshSerializer(serializers.Serializer):
+    refresh_token = serializers.CharField()
+
+    def validate(self, attrs):
         try:
-            validate_email(email_or_username)
-            user_request = User.objects.get(email=email_or_username)
-            email_or_username = user_request.username
-        except (ValidationError, User.DoesNotExist):
-            pass
+            payload = verify_token(attrs['refresh_token'], REFRESH)
+            user = load_user(payload['uid'])
 
-        user = authenticate(username=email_or_username, password=password)
+            if user is None or not user.is_active:
+                raise InvalidToken('User inactive or deleted.')
 
-        if not user:
-            raise serializers.ValidationError('Unable to log in with provided credentials.')
+            check_password_fingerprint(payload, user)
+        except InvalidToken as error:
+            raise serializers.ValidationError(str(error))
 
+        attrs['payload'] = payload
         attrs['user'] = user
 
         return attrs
 
 
+class TokenRevokeSerializer(serializers.Serializer):
+    refresh_token = serializers.CharField()
+    access_token = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        tokens = [(attrs['refresh_token'], REFRESH)]
+
+        if 'access_token' in attrs:
+            tokens.append((attrs['access_token'], ACCESS))
+
+        try:
+            attrs['payloads'] = [(verify_token(token, kind), kind) for token, kind in tokens]
+        except InvalidToken as error:
+            raise serializers.ValidationError(str(error))
+
+        return attrs
+
+
 class ClassSerializer(serializers.ModelSerializer):
     class Meta:
         model = Class
         fields = ('id', 'number', 'letter')
 
 
+class ClassScheduleSerializerMixin(object):
+    """
+    Creates one copy of the object per class listed in `classes` with the
+    classes taken from the reference cache, one bulk insert and one batch of
+    emails.
+    """
+
+    def validate_classes(self, classes):
+        if not classes:
+            raise serializers.ValidationError('At least one class is required.')
+
+        found = [get_class(clazz['number'], clazz['letter']) for clazz in classes]
+
+        errors = [{} if clazz else {'non_field_errors': ['No such class.']} for clazz in found]
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return list(OrderedDict.fromkeys(found))
+
+    def create(self, validated_data):
+        model = self.Meta.model
+        classes = validated_data.pop('classes')
+
+        author = get_role(self.context['request']).teacher
+
+        objects = [
+            model(subject=author.subject, author=author, clazz=clazz, **validated_data)
+            for clazz in classes
+        ]
+
+        with transaction.atomic():
+            bulk_create_with_ids(model, objects)
+            send_created_signals(model, objects)
+            send_class_creation_emails(objects)
+
+        return objects
+
+
 class StudentSerializer(serializers.ModelSerializer):
     user = UserSerializer()
     clazz = ClassSerializer()
@@ -103,7 +194,10 @@ class StudentSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data['user'], is_active=False)
 
-        clazz, _ = Class.objects.get_or_create(**validated_data['clazz'])
+        clazz = get_class(**validated_data['clazz'])
+
+        if clazz is None:
+            clazz, _ = Class.objects.get_or_create(**validated_data['clazz'])
 
         activation_key = generate_activation_key()
         student = Student.objects.create(user=user, clazz=clazz, activation_key=activation_key)
@@ -147,6 +241,12 @@ class SubjectSerializer(serializers.ModelSerializer):
         fields = ('id', 'title')
 
 
+def reset_profile_image(model, pk, image_url):
+    default_url = model._meta.get_field('profile_image_url').get_default()
+
+    model.objects.filter(pk=pk, profile_image_url=image_url).update(profile_image_url=default_url)
+
+
 class DefaultProfileSerializer(serializers.ModelSerializer):
     user = UserInfoSerializer()
     profile_image_url = serializers.URLField(allow_blank=False)
@@ -155,12 +255,13 @@ class DefaultProfileSerializer(serializers.ModelSerializer):
         fields = ('id', 'user', 'info', 'profile_image_url')
 
     def validate_profile_image_url(self, value):
-        response = requests.head(value)
-        content_type = response.headers.get('content-type')
+        if image_url_validator.in_background:
+            valid = not image_url_validator.is_known_invalid(value)
+        else:
+            valid = image_url_validator.is_valid(value)
 
-        if not content_type.startswith('image/'):
-            if not content_type.startswith('application/json'):
-                raise serializers.ValidationError('URL is not a picture.')
+        if not valid:
+            raise serializers.ValidationError('URL is not a picture.')
 
         return value
 
@@ -172,15 +273,47 @@ class DefaultProfileSerializer(serializers.ModelSerializer):
         instance.__dict__.update(**validated_data)
         instance.save()
 
+        image_url = validated_data.get('profile_image_url')
+        if image_url and image_url_validator.in_background:
+            image_url_validator.validate_in_background(
+                image_url, on_invalid=partial(reset_profile_image, instance.__class__, instance.pk)
+            )
+
         return instance
 
 
+def load_grade_averages(students):
+    averages = defaultdict(list)
+
+    for row in Grade.objects.filter(student__in=students).subject_averages():
+        averages[row['student_id']].append({
+            'subject': {'id': row['subject_id'], 'title': row['subject__title']},
+            'count': row['count'],
+            'average': round(row['average'], 2)
+        })
+
+    return averages
+
+
+def attach_grade_averages(students):
+    averages = load_grade_averages(students)
+
+    for student in students:
+        student.grade_averages = averages[student.id]
+
+
 class StudentProfileSerializer(DefaultProfileSerializer):
     clazz = ClassSerializer()
+    grade_averages = serializers.SerializerMethodField()
 
     class Meta:
         model = Student
-        fields = DefaultProfileSerializer.Meta.fields + ('clazz',)
+        fields = DefaultProfileSerializer.Meta.fields + ('clazz', 'grade_averages')
+
+    def get_grade_averages(self, obj):
+        averages = getattr(obj, 'grade_averages', None)
+
+        return load_grade_averages([obj])[obj.id] if averages is None else averages
 
 
 class TeacherProfileSerializer(DefaultProfileSerializer):
@@ -222,7 +355,169 @@ class GradesSerializer(serializers.ModelSerializer):
         student = self.context['student']
 
         grade = Grade.objects.create(subject=subject, student=student, **validated_data)
-        grade.author = self.context['request'].user.teacher
+        grade.author = get_role(self.context['request']).teacher
         send_creation_email(student.user, model=grade)
 
         return grade
+
+
+class GradeEntrySerializer(serializers.Serializer):
+    student = serializers.IntegerField()
+    value = serializers.FloatField(validators=Grade.GRADE_VALIDATORS)
+
+
+class GradesBulkSerializer(serializers.Serializer):
+    grades = serializers.ListField()
+
+    def validate_grades(self, rows):
+        """
+        Validates every row on its own, so that each row reports all of its
+        errors: the field checks and whether the student exists.
+        """
+        if not rows:
+            raise serializers.ValidationError('At least one grade is required.')
+
+        entries = [GradeEntrySerializer(data=row) for row in rows]
+        user_ids = [self.get_entry_user_id(entry) for entry in entries]
+
+        students = Student.objects.select_related('user', 'clazz').filter(
+            user_id__in={user_id for user_id in user_ids if user_id is not None}
+        )
+        students = {student.user_id: student for student in students}
+
+        grades, errors = [], []
+        for entry, user_id in zip(entries, user_ids):
+            row_errors = dict(entry.errors)
+
+            if user_id is not None and user_id not in students:
+                row_errors['student'] = ['No such student.']
+
+            grades.append(dict(entry.validated_data, student=students.get(user_id)))
+            errors.append(row_errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return grades
+
+    @staticmethod
+    def get_entry_user_id(entry):
+        """
+        Returns the row's student id when it is valid, even if other fields
+        of the row are not.
+        """
+        entry.is_valid()
+
+        if not isinstance(entry.initial_data, dict) or 'student' in entry.errors:
+            return None
+
+        return entry.fields['student'].run_validation(entry.initial_data.get('student'))
+
+    def create(self, validated_data):
+        subject = self.context['subject']
+        teacher = get_role(self.context['request']).teacher
+
+        grades = [
+            Grade(subject=subject, student=entry['student'], value=entry['value'])
+            for entry in validated_data['grades']
+        ]
+
+        with transaction.atomic():
+            bulk_create_with_ids(Grade, grades)
+            invalidate_grade_stats([subject.id])
+
+            for grade in grades:
+                grade.author = teacher
+
+            send_grade_emails(grades)
+
+        return grades
+
+    def to_representation(self, grades):
+        return {
+            'created': len(grades),
+            'grades': [
+                {'id': grade.id, 'student': grade.student.user_id, 'value': grade.value}
+                for grade in grades
+            ]
+        }
+
+
+class GradeStatsQuerySerializer(serializers.Serializer):
+    class_number = serializers.ChoiceField(choices=Class.CLASS_NUMBERS, required=False)
+    class_letter = serializers.ChoiceField(choices=Class.CLASS_LETTERS, required=False)
+
+
+class ReportCardSerializer(object):
+    def __init__(self, student):
+        self.student = student
+
+    @staticmethod
+    def summarize(values):
+        return {
+            'count': len(values),
+            'average': round(sum(values) / len(values), 2) if values else None
+        }
+
+    @property
+    def data(self):
+        rows = Grade.objects.filter(student=self.student).report_card_rows()
+        subjects = []
+
+        for (subject_id, title), grades in groupby(rows, key=lambda row: row[:2]):
+            grades = [{'id': grade_id, 'value': value} for _, _, grade_id, value in grades]
+
+            subject = {'subject': {'id': subject_id, 'title': title}, 'grades': grades}
+            subject.update(self.summarize([grade['value'] for grade in grades]))
+            subjects.append(subject)
+
+        values = [grade['value'] for subject in subjects for grade in subject['grades']]
+
+        report_card = {
+            'student': StudentAuthorSerializer(self.student).data,
+            'subjects': subjects
+        }
+        report_card.update(self.summarize(values))
+
+        return report_card
+
+
+class GradeRowSerializer(object):
+    fields = (
+        'id', 'value',
+        'subject__id', 'subject__title',
+        'student__user__username', 'student__user__first_name',
+        'student__user__last_name', 'student__user__email',
+        'student__clazz__id', 'student__clazz__number', 'student__clazz__letter',
+    )
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @staticmethod
+    def to_representation(row):
+        return {
+            'id': row['id'],
+            'value': row['value'],
+            'subject': {
+                'id': row['subject__id'],
+                'title': row['subject__title']
+            },
+            'student': {
+                'user': {
+                    'username': row['student__user__username'],
+                    'first_name': row['student__user__first_name'],
+                    'last_name': row['student__user__last_name'],
+                    'email': row['student__user__email']
+                },
+                'clazz': {
+                    'id': row['student__clazz__id'],
+                    'number': row['student__clazz__number'],
+                    'letter': row['student__clazz__letter']
+                }
+            }
+        }
+
+    def __iter__(self):
+        for row in self.queryset.values(*self.fields).iterator():
+            yield self.to_representation(row)
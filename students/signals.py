@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal
+
+from .analytics import invalidate_grade_stats
+from .models import Class, Subject, Grade
+from .reference import bump_reference_version
+from .tokens import revoke_user_tokens
+
+
+# Sent once after bulk_create() with the new objects of one model, which
+# bulk_create() inserts without sending post_save.
+post_bulk_create = Signal(providing_args=['objects'])
+
+
+def invalidate_grades(sender, instance, **kwargs):
+    invalidate_grade_stats([instance.subject_id])
+
+
+def reload_reference_data(sender, **kwargs):
+    bump_reference_version()
+
+
+def revoke_inactive_user_tokens(sender, instance, created, **kwargs):
+    if not instance.is_active and not created:
+        revoke_user_tokens(instance.id)
+
+
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    revoke_user_tokens(instance.id)
+
+
+post_save.connect(invalidate_grades, sender=Grade, dispatch_uid='grade_stats_save')
+post_delete.connect(invalidate_grades, sender=Grade, dispatch_uid='grade_stats_delete')
+
+post_save.connect(reload_reference_data, sender=Class, dispatch_uid='reference_class_save')
+post_delete.connect(reload_reference_data, sender=Class, dispatch_uid='reference_class_delete')
+post_save.connect(reload_reference_data, sender=Subject, dispatch_uid='reference_subject_save')
+post_delete.connect(reload_reference_data, sender=Subject, dispatch_uid='reference_subject_delete')
+
+post_save.connect(revoke_inactive_user_tokens, sender=User, dispatch_uid='tokens_user_save')
+post_delete.connect(revoke_deleted_user_tokens, sender=User, dispatch_uid='tokens_user_delete')
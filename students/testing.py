@@ -0,0 +1,29 @@
+from django.core.cache import caches
+from django import test as django_test
+
+from rest_framework import test
+
+
+class CacheClearingMixin(object):
+    """
+    Clears every configured cache before each test. Test rollbacks send no
+    signals, so cached responses and reference data versions would otherwise
+    outlive the rows they were built from.
+    """
+    def _pre_setup(self):
+        super()._pre_setup()
+
+        for cache in caches.all():
+            cache.clear()
+
+
+class TestCase(CacheClearingMixin, django_test.TestCase):
+    pass
+
+
+class APITestCase(CacheClearingMixin, test.APITestCase):
+    pass
+
+
+class APITransactionTestCase(CacheClearingMixin, test.APITransactionTestCase):
+    pass
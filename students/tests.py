@@ -1,12 +1,41 @@
-from django.contrib.auth.models import User
-
-from rest_framework.test import APITestCase, APIClient
+import base64
+import json
+import os
+import tempfile
+import time
+import threading
+from io import StringIO
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from django.contrib.auth.models import User, AnonymousUser
+from django.core.cache import cache
+from django.core.checks import run_checks
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, override_settings
+
+from rest_framework.test import APIClient
 from rest_framework.reverse import reverse
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 
+from outbox.models import Message
+
+from .testing import APITestCase
+from .authentication import SignedTokenAuthentication
+from .checks import check_revocation_cache
+from .credentials import credential_cache
 from .models import Class, Subject, Student, Teacher, Grade
 from .serializers import StudentProfileSerializer
+from .reference import ReferenceTable, ClassSnapshot, get_class, get_subject_or_404
+from .roles import get_role
+from .utils import CreationEmailRenderer
+from .validators import ImageURLValidator
+
+
+def read_streaming_json(response):
+    return json.loads(b''.join(response.streaming_content).decode())
 
 
 class RegisterViewTestCase(APITestCase):
@@ -194,6 +223,8 @@ class LoginViewTestCase(APITestCase):
         self.token = Token.objects.create(user=self.user)
         self.post_data = {'email_or_username': '', 'password': self.user_data['password']}
 
+        cache.clear()
+
     def test_login_with_blank_email_or_username(self):
         response = self.client.post(reverse(self.view_name), self.post_data)
 
@@ -246,6 +277,265 @@ class LoginViewTestCase(APITestCase):
         self.assertEqual(self.token.key, response.data['token'])
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_login_with_email_runs_a_single_query(self):
+        self.post_data['email_or_username'] = self.user.email
+
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse(self.view_name), self.post_data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['is_teacher'])
+
+    def test_login_creates_missing_token(self):
+        self.token.delete()
+        self.post_data['email_or_username'] = self.user.username
+
+        with self.assertNumQueries(2):
+            response = self.client.post(reverse(self.view_name), self.post_data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Token.objects.get(user=self.user).key, response.data['token'])
+
+    def test_login_as_teacher(self):
+        Teacher.objects.create(user=self.user, subject=Subject.objects.create(title='Maths'))
+        self.post_data['email_or_username'] = self.user.email
+
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse(self.view_name), self.post_data)
+
+        self.assertTrue(response.data['is_teacher'])
+
+    def test_login_with_email_shaped_username(self):
+        user = User.objects.create_user(
+            username='other@email.com', email='other@gmail.com', password='p@$$w0rd'
+        )
+
+        response = self.client.post(
+            reverse(self.view_name), {'email_or_username': user.username, 'password': 'p@$$w0rd'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], user.id)
+
+
+class SignedTokenTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+        self.login_view = reverse('students:login')
+        self.refresh_view = reverse('students:token_refresh')
+        self.revoke_view = reverse('students:token_revoke')
+
+        self.user = User.objects.create_user(
+            username='tester', email='tester@gmail.com', password='s3cr3tp@$$'
+        )
+        self.student = Student.objects.create(
+            user=self.user, clazz=Class.objects.create(number=10, letter='A')
+        )
+        self.profile_view = reverse('students:profile-detail', kwargs={'pk': self.user.id})
+
+        self.tokens = self.client.post(
+            self.login_view, {'email_or_username': 'tester', 'password': 's3cr3tp@$$'}
+        ).data
+
+    def authorize(self, access_token):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + access_token)
+
+    def test_login_returns_signed_and_legacy_tokens(self):
+        self.assertEqual(self.tokens['token'], Token.objects.get(user=self.user).key)
+        self.assertIn('access_token', self.tokens)
+        self.assertIn('refresh_token', self.tokens)
+        self.assertFalse(self.tokens['is_teacher'])
+
+    def test_access_token_authenticates_without_queries(self):
+        request = RequestFactory().get(
+            '/', HTTP_AUTHORIZATION='Bearer ' + self.tokens['access_token']
+        )
+
+        with self.assertNumQueries(0):
+            user, payload = SignedTokenAuthentication().authenticate(request)
+
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(payload['uid'], self.user.id)
+        self.assertFalse(user.is_staff)
+
+    def test_access_token_grants_access(self):
+        self.authorize(self.tokens['access_token'])
+
+        response = self.client.get(self.profile_view)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], self.user.username)
+
+    def test_tampered_access_token(self):
+        self.authorize(self.tokens['access_token'] + 'x')
+
+        response = self.client.get(self.profile_view)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_token_is_not_an_access_token(self):
+        self.authorize(self.tokens['refresh_token'])
+
+        response = self.client.get(self.profile_view)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(SIGNED_TOKENS={'ACCESS_LIFETIME': -1})
+    def test_expired_access_token(self):
+        self.authorize(self.tokens['access_token'])
+
+        response = self.client.get(self.profile_view)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data['detail'], 'Token has expired.')
+
+    def test_refresh_rotates_refresh_token(self):
+        data = {'refresh_token': self.tokens['refresh_token']}
+
+        response = self.client.post(self.refresh_view, data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['refresh_token'], self.tokens['refresh_token'])
+
+        self.authorize(response.data['access_token'])
+        self.assertEqual(self.client.get(self.profile_view).status_code, status.HTTP_200_OK)
+
+        self.client.credentials()
+        response = self.client.post(self.refresh_view, data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['non_field_errors'], ['Token has been revoked.'])
+
+    def test_refresh_after_password_change(self):
+        self.user.set_password('n3wp@$$w0rd')
+        self.user.save()
+
+        response = self.client.post(
+            self.refresh_view, {'refresh_token': self.tokens['refresh_token']}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_revoke(self):
+        response = self.client.post(self.revoke_view, {
+            'refresh_token': self.tokens['refresh_token'],
+            'access_token': self.tokens['access_token']
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.authorize(self.tokens['access_token'])
+        response = self.client.get(self.profile_view)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data['detail'], 'Token has been revoked.')
+
+    def test_deactivation_revokes_tokens(self):
+        self.user.is_active = False
+        self.user.save()
+
+        self.authorize(self.tokens['access_token'])
+
+        response = self.client.get(self.profile_view)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    })
+    def test_deploy_check_requires_shared_revocation_cache(self):
+        errors = check_revocation_cache(None)
+
+        self.assertEqual([error.id for error in errors], ['students.E001'])
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'tokens': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'tokens'
+        }
+    }, SIGNED_TOKENS={'CACHE': 'tokens'})
+    def test_deploy_check_with_shared_revocation_cache(self):
+        self.assertEqual(check_revocation_cache(None), [])
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    })
+    def test_deploy_checks_require_shared_caches(self):
+        errors = run_checks(include_deployment_checks=True, tags=['caches'])
+
+        self.assertEqual(
+            sorted(error.id for error in errors), ['students.E002', 'students.E003', 'sync.E001']
+        )
+
+
+class CredentialsTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        credential_cache.clear()
+
+        self.client = APIClient()
+        self.login_view = reverse('students:login')
+        self.view = reverse('students:subjects_list')
+
+        self.user = User.objects.create_user(username='tester', password='s3cr3tp@$$')
+
+    def basic_auth(self, username, password):
+        credentials = base64.b64encode('{}:{}'.format(username, password).encode()).decode()
+        self.client.credentials(HTTP_AUTHORIZATION='Basic ' + credentials)
+
+    @override_settings(CREDENTIALS={'ACCOUNT_THROTTLE': (1, 60)})
+    def test_successful_check_is_cached(self):
+        self.basic_auth('tester', 's3cr3tp@$$')
+
+        # Only one password may be hashed, so the second request is served from the cache.
+        for _ in range(2):
+            response = self.client.get(self.view)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_password_change_invalidates_cached_check(self):
+        self.basic_auth('tester', 's3cr3tp@$$')
+        self.assertEqual(self.client.get(self.view).status_code, status.HTTP_200_OK)
+
+        self.user.set_password('n3wp@$$w0rd')
+        self.user.save()
+
+        response = self.client.get(self.view)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(CREDENTIALS={'ACCOUNT_THROTTLE': (3, 60)})
+    def test_basic_auth_throttled_per_account(self):
+        self.basic_auth('tester', 'wrongpassword')
+
+        for _ in range(3):
+            self.assertEqual(self.client.get(self.view).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.basic_auth('tester', 's3cr3tp@$$')
+
+        response = self.client.get(self.view)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    @override_settings(CREDENTIALS={'IP_THROTTLE': (2, 60)})
+    def test_login_throttled_per_ip(self):
+        for username in ('first', 'second'):
+            response = self.client.post(
+                self.login_view, {'email_or_username': username, 'password': 'password'}
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            self.login_view, {'email_or_username': 'tester', 'password': 's3cr3tp@$$'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
 
 class ProfileViewSetTestCase(APITestCase):
     def setUp(self):
@@ -505,6 +795,79 @@ class ClassesListViewTestCase(APITestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_classes_list_is_cacheable(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertIn('max-age=3600', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('ETag', response)
+
+    def test_classes_list_with_matching_etag(self):
+        self.client.force_authenticate(user=self.user)
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_classes_list_etag_changes_with_classes(self):
+        self.client.force_authenticate(user=self.user)
+        etag = self.client.get(self.url)['ETag']
+
+        Class.objects.create(number=12, letter='B')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(len(response.data), 3)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ReferenceDataTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.subject = Subject.objects.create(title='Maths')
+        self.user = User.objects.create(username='tester', password='pass')
+
+    def test_lookups_are_served_from_memory(self):
+        get_class(10, 'A')
+        get_subject_or_404(self.subject.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_class('10', 'A'), self.clazz)
+            self.assertIsNone(get_class(11, 'A'))
+            self.assertEqual(get_subject_or_404(str(self.subject.id)), self.subject)
+
+    def test_unknown_subject(self):
+        with self.assertRaises(Http404):
+            get_subject_or_404(self.subject.id + 1)
+
+    def test_changes_reload_every_process(self):
+        other_process = ReferenceTable(Class, ('id', 'number', 'letter'), ClassSnapshot)
+        other_process.get_snapshot()
+        get_class(10, 'A')
+
+        clazz = Class.objects.create(number=12, letter='B')
+
+        self.assertEqual(get_class(12, 'B'), clazz)
+        self.assertIn(clazz.id, other_process.get_snapshot().by_id)
+
+        clazz.delete()
+
+        self.assertIsNone(get_class(12, 'B'))
+
+    def test_classes_list_without_queries(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(reverse('students:classes_list'))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('students:classes_list'), {'number': 10})
+
+        self.assertEqual(response.data, {10: [{'id': self.clazz.id, 'number': 10, 'letter': 'A'}]})
+
 
 class GradesListViewTestCase(APITestCase):
     def setUp(self):
@@ -550,20 +913,38 @@ class GradesListViewTestCase(APITestCase):
 
         response = self.client.get(reverse(self.view_name, kwargs={'subject_pk': self.subject.id}))
 
-        results = response.data
+        results = read_streaming_json(response)
         self.assertEqual(results[0]['value'], self.grade2.value)
         self.assertEqual(results[1]['value'], self.grade1.value)
         self.assertEqual(results[0]['student']['user']['username'], self.user.username)
         self.assertEqual(results[1]['student']['user']['username'], self.user.username)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_subject_list_is_streamed_in_one_query(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse(self.view_name, kwargs={'subject_pk': self.subject.id})
+
+        for i in range(10):
+            other_user = User.objects.create(username='student{}'.format(i), password='pass')
+            other_student = Student.objects.create(user=other_user, clazz=self.clazz)
+            Grade.objects.create(value=4, subject=self.subject, student=other_student)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+            results = read_streaming_json(response)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(results), 12)
+        self.assertEqual(results[-1]['student']['clazz']['letter'], self.clazz.letter)
+        self.assertNotIn('password', results[-1]['student']['user'])
+
     def test_subject_list_with_invalid_subject_id(self):
         self.client.force_authenticate(user=self.user)
         response = self.client.get(
             reverse(self.view_name, kwargs={'subject_pk': self.subject.id - 1})
         )
 
-        self.assertEqual(response.data, [])
+        self.assertEqual(read_streaming_json(response), [])
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
@@ -644,8 +1025,9 @@ class GradesDetailViewTestCase(APITestCase):
             )
         )
 
-        self.assertEqual(response.data[0]['value'], self.grade1.value)
-        self.assertEqual(response.data[0]['student']['user']['username'], self.user1.username)
+        results = read_streaming_json(response)
+        self.assertEqual(results[0]['value'], self.grade1.value)
+        self.assertEqual(results[0]['student']['user']['username'], self.user1.username)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_grade_detail_of_another_user(self):
@@ -672,7 +1054,7 @@ class GradesDetailViewTestCase(APITestCase):
             )
         )
 
-        self.assertFalse(response.data)
+        self.assertFalse(read_streaming_json(response))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_grade_detail_with_invalid_user(self):
@@ -804,3 +1186,541 @@ class GradesDetailViewTestCase(APITestCase):
 
         self.assertEqual(response.data['value'], ['Ensure this value is less than or equal to 6.'])
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class GradesBulkCreateViewTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.subject1 = Subject.objects.create(title='Maths')
+        self.subject2 = Subject.objects.create(title='Literature')
+
+        self.student_users = [
+            User.objects.create(username='student{}'.format(index), email='student@test.com')
+            for index in range(3)
+        ]
+        for user in self.student_users:
+            Student.objects.create(user=user, clazz=self.clazz)
+
+        self.teacher_user = User.objects.create(username='teacher', email='teacher@test.com')
+        self.teacher = Teacher.objects.create(user=self.teacher_user, subject=self.subject1)
+
+        self.url = reverse('students:grades_bulk', kwargs={'subject_pk': self.subject1.id})
+
+    def test_grades_bulk_create_with_student_user(self):
+        self.client.force_authenticate(user=self.student_users[0])
+
+        response = self.client.post(self.url, [], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_grades_bulk_create_for_another_subject(self):
+        self.client.force_authenticate(user=self.teacher_user)
+        url = reverse('students:grades_bulk', kwargs={'subject_pk': self.subject2.id})
+
+        response = self.client.post(
+            url, [{'student': self.student_users[0].id, 'value': 5}], format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_grades_bulk_create_with_json(self):
+        self.client.force_authenticate(user=self.teacher_user)
+        data = [
+            {'student': user.id, 'value': 6 - index}
+            for index, user in enumerate(self.student_users)
+        ]
+
+        response = self.client.post(self.url, {'grades': data}, format='json')
+
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(
+            [(grade['student'], grade['value']) for grade in response.data['grades']],
+            [(entry['student'], entry['value']) for entry in data]
+        )
+        self.assertEqual(
+            sorted(Grade.objects.values_list('id', flat=True)),
+            sorted(grade['id'] for grade in response.data['grades'])
+        )
+        self.assertEqual(Message.objects.count(), 3)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_grades_bulk_create_with_csv(self):
+        self.client.force_authenticate(user=self.teacher_user)
+        rows = ['student,value'] + ['{},4.5'.format(user.id) for user in self.student_users]
+        upload = SimpleUploadedFile('grades.csv', '\n'.join(rows).encode(), 'text/csv')
+
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(Grade.objects.filter(subject=self.subject1, value=4.5).count(), 3)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_grades_bulk_create_reports_row_errors(self):
+        self.client.force_authenticate(user=self.teacher_user)
+        data = [
+            {'student': self.student_users[0].id, 'value': 5},
+            {'student': self.student_users[1].id, 'value': 7},
+            {'student': self.teacher_user.id, 'value': 4},
+        ]
+
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.data['grades'][0], {})
+        self.assertIn('value', response.data['grades'][1])
+        self.assertIn('student', response.data['grades'][2])
+        self.assertFalse(Grade.objects.exists())
+        self.assertFalse(Message.objects.exists())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_grades_bulk_create_reports_every_error_of_a_row(self):
+        self.client.force_authenticate(user=self.teacher_user)
+
+        response = self.client.post(self.url, [
+            {'student': self.teacher_user.id, 'value': 7},
+        ], format='json')
+
+        self.assertEqual(set(response.data['grades'][0]), {'student', 'value'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_grades_bulk_create_without_grades(self):
+        self.client.force_authenticate(user=self.teacher_user)
+
+        response = self.client.post(self.url, [], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReportCardViewTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.maths = Subject.objects.create(title='Maths')
+        self.physics = Subject.objects.create(title='Physics')
+
+        self.student_user = User.objects.create(username='student')
+        self.student = Student.objects.create(user=self.student_user, clazz=self.clazz)
+        self.other_user = User.objects.create(username='other')
+        Student.objects.create(user=self.other_user, clazz=self.clazz)
+
+        self.teacher_user = User.objects.create(username='teacher')
+        Teacher.objects.create(user=self.teacher_user, subject=self.maths)
+
+        for subject, value in ((self.maths, 6), (self.maths, 5), (self.physics, 3)):
+            Grade.objects.create(value=value, subject=subject, student=self.student)
+
+        self.url = reverse('students:report_card', kwargs={'user_pk': self.student_user.id})
+
+    def test_report_card_with_own_student_user(self):
+        self.client.force_authenticate(user=self.student_user)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['average'], 4.67)
+        self.assertEqual(
+            [(subject['subject']['title'], subject['count'], subject['average'])
+             for subject in response.data['subjects']],
+            [('Maths', 2, 5.5), ('Physics', 1, 3)]
+        )
+        self.assertEqual(
+            [grade['value'] for grade in response.data['subjects'][0]['grades']], [6, 5]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_report_card_with_other_student_user(self):
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_report_card_with_teacher_user(self):
+        self.client.force_authenticate(user=self.teacher_user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['student']['user']['username'], 'student')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_report_card_without_grades(self):
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.client.get(
+            reverse('students:report_card', kwargs={'user_pk': self.other_user.id})
+        )
+
+        self.assertEqual(response.data['subjects'], [])
+        self.assertIsNone(response.data['average'])
+
+    def test_students_list_has_grade_averages(self):
+        self.client.force_authenticate(user=self.teacher_user)
+
+        response = self.client.get(reverse('students:students_list'))
+        averages = {
+            student['user']['username']: student['grade_averages'] for student in response.data
+        }
+
+        self.assertEqual(averages['other'], [])
+        self.assertEqual(
+            [(average['subject']['title'], average['average']) for average in averages['student']],
+            [('Maths', 5.5), ('Physics', 3)]
+        )
+
+    def test_profile_has_grade_averages(self):
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.client.get(
+            reverse('students:profile-detail', kwargs={'pk': self.student_user.id})
+        )
+
+        self.assertEqual(len(response.data['grade_averages']), 2)
+
+
+class GradesStatsViewTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.subject = Subject.objects.create(title='Maths')
+        self.class_a = Class.objects.create(number=10, letter='A')
+        self.class_b = Class.objects.create(number=10, letter='B')
+
+        self.user = User.objects.create(username='teacher')
+        Teacher.objects.create(user=self.user, subject=self.subject)
+
+        for clazz, values in ((self.class_a, (2, 4, 6)), (self.class_b, (5, 5.5, 6))):
+            student = Student.objects.create(
+                user=User.objects.create(username='student{}'.format(clazz)), clazz=clazz
+            )
+            for value in values:
+                Grade.objects.create(value=value, subject=self.subject, student=student)
+
+        self.url = reverse('students:grades_stats', kwargs={'subject_pk': self.subject.id})
+        self.client.force_authenticate(user=self.user)
+
+    def test_grades_stats_for_subject(self):
+        response = self.client.get(self.url)
+        overall = response.data['overall']
+
+        self.assertEqual(overall['count'], 6)
+        self.assertEqual(overall['mean'], 4.75)
+        self.assertEqual(overall['median'], 5.25)
+        self.assertEqual(overall['min'], 2)
+        self.assertEqual(overall['max'], 6)
+        self.assertEqual(
+            [bucket['count'] for bucket in overall['histogram']], [1, 0, 1, 1, 3]
+        )
+        self.assertEqual(
+            [(stats['class']['letter'], stats['mean']) for stats in response.data['classes']],
+            [('A', 4), ('B', 5.5)]
+        )
+        self.assertEqual(response.data['classes'][1]['difference'], 0.75)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_grades_stats_for_class(self):
+        response = self.client.get(self.url, {'class_number': 10, 'class_letter': 'B'})
+
+        self.assertEqual(response.data['overall']['count'], 3)
+        self.assertEqual(len(response.data['classes']), 1)
+
+    def test_grades_stats_without_grades(self):
+        response = self.client.get(self.url, {'class_number': 12})
+
+        self.assertEqual(response.data['overall'], {'count': 0})
+        self.assertEqual(response.data['classes'], [])
+
+    def test_grades_stats_with_invalid_class_number(self):
+        response = self.client.get(self.url, {'class_number': 'ten'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_grades_stats_are_cached_until_grades_change(self):
+        self.client.get(self.url)
+
+        # The subject comes from the reference data and the stats from the cache.
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['overall']['count'], 6)
+
+        Grade.objects.create(value=3, subject=self.subject, student=Student.objects.first())
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['overall']['count'], 7)
+
+
+class ImportStudentsCommandTestCase(APITestCase):
+    def setUp(self):
+        self.clazz = Class.objects.create(number=10, letter='A')
+        User.objects.create(username='taken', email='taken@test.com')
+
+    def write_file(self, suffix, content):
+        source = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False)
+        self.addCleanup(os.remove, source.name)
+
+        with source:
+            source.write(content)
+
+        return source.name
+
+    def import_students(self, path, **options):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_students', path, stdout=stdout, stderr=stderr, **options)
+
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_students_from_csv(self):
+        path = self.write_file('.csv', '\n'.join([
+            'username,first_name,last_name,email,password,class_number,class_letter',
+            'student1,First,Student,first@test.com,password123,10,A',
+            'student2,Second,Student,second@test.com,password456,11,B',
+            'taken,Third,Student,third@test.com,password789,10,A',
+            'student4,Fourth,Student,not-an-email,password000,10,A',
+        ]))
+
+        stdout, stderr = self.import_students(path, workers=2, chunk_size=1)
+
+        student = Student.objects.select_related('user', 'clazz').get(user__username='student2')
+        self.assertFalse(student.user.is_active)
+        self.assertTrue(student.user.check_password('password456'))
+        self.assertTrue(student.activation_key)
+        self.assertEqual((student.clazz.number, student.clazz.letter), (11, 'B'))
+
+        self.assertEqual(Student.objects.filter(clazz=self.clazz).count(), 1)
+        self.assertEqual(
+            Message.objects.filter(to__in=['first@test.com', 'second@test.com']).count(), 2
+        )
+        self.assertIn('Row 3: username', stderr)
+        self.assertIn('Row 4: email', stderr)
+        self.assertIn('Done: 2 imported, 2 skipped', stdout)
+
+    def test_import_students_from_ndjson(self):
+        rows = [
+            {
+                'username': 'student{}'.format(index),
+                'first_name': 'First',
+                'last_name': 'Student',
+                'email': 'student{}@test.com'.format(index),
+                'password': 'password123',
+                'class_number': 10,
+                'class_letter': 'A'
+            }
+            for index in range(3)
+        ]
+        rows.append(dict(rows[0], email='duplicate@test.com'))
+        path = self.write_file('.ndjson', '\n'.join(json.dumps(row) for row in rows))
+
+        stdout, stderr = self.import_students(path, workers=1)
+
+        self.assertEqual(Student.objects.filter(clazz=self.clazz).count(), 3)
+        self.assertIn('Row 4: username', stderr)
+
+
+class RoleResolverTestCase(APITestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.subject = Subject.objects.create(title='Maths')
+
+        self.student_user = User.objects.create(username='student', password='pass')
+        self.student = Student.objects.create(user=self.student_user, clazz=self.clazz)
+
+        self.teacher_user = User.objects.create(username='teacher', password='pass')
+        self.teacher = Teacher.objects.create(user=self.teacher_user, subject=self.subject)
+
+    def get_request(self, user):
+        request = self.factory.get('/')
+        request.user = user
+
+        return request
+
+    def test_role_with_anonymous_user(self):
+        request = self.get_request(AnonymousUser())
+
+        with self.assertNumQueries(0):
+            role = get_role(request)
+
+        self.assertIsNone(role.name)
+        self.assertFalse(role.is_student)
+        self.assertFalse(role.is_teacher)
+
+    def test_role_with_student_user(self):
+        request = self.get_request(User.objects.get(id=self.student_user.id))
+
+        with self.assertNumQueries(1):
+            role = get_role(request)
+            self.assertEqual(role.name, 'student')
+            self.assertEqual(role.student, self.student)
+            self.assertEqual(role.clazz.letter, self.clazz.letter)
+            self.assertIsNone(role.teacher)
+            self.assertEqual(request.user.student.clazz, self.clazz)
+            self.assertIs(get_role(request), role)
+
+    def test_role_with_teacher_user(self):
+        request = self.get_request(User.objects.get(id=self.teacher_user.id))
+
+        with self.assertNumQueries(1):
+            role = get_role(request)
+            self.assertEqual(role.name, 'teacher')
+            self.assertEqual(role.subject.title, self.subject.title)
+            self.assertIsNone(role.clazz)
+            self.assertEqual(request.user.teacher.subject, self.subject)
+
+
+class CreationEmailRendererTestCase(APITestCase):
+    def setUp(self):
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.subject = Subject.objects.create(title='Maths')
+
+        teacher_user = User.objects.create(username='teacher', password='pass')
+        self.teacher = Teacher.objects.create(user=teacher_user, subject=self.subject)
+
+        self.grade = Grade.objects.create(
+            value=5,
+            subject=self.subject,
+            student=Student.objects.create(
+                user=User.objects.create(username='student', password='pass'),
+                clazz=self.clazz
+            )
+        )
+        self.grade.author = self.teacher
+
+        self.user = User(first_name='Ivan', last_name="O'Neil <b>", email='ivan@elsyser.com')
+
+    def test_renderer_personalizes_shared_body(self):
+        renderer = CreationEmailRenderer(self.grade)
+
+        with self.assertNumQueries(0):
+            text_content, html_content = renderer.render(self.user)
+
+        self.assertIn('Hi, Ivan O&#39;Neil &lt;b&gt;!', html_content)
+        self.assertIn("Hi, Ivan O'Neil <b>!", text_content)
+        self.assertIn('grades/{}/'.format(self.grade.id), html_content)
+        self.assertNotIn('\x00', html_content)
+
+    def test_renderer_output_is_minified_and_text_has_no_styles(self):
+        text_content, html_content = CreationEmailRenderer(self.grade).render(self.user)
+
+        self.assertNotIn('<!--', html_content)
+        self.assertNotIn('  ', html_content)
+        self.assertNotIn('font-family', text_content)
+        self.assertIn('New grade ({}) was added by {} just now.'.format(
+            self.grade, self.teacher
+        ), text_content)
+
+    def test_build_message(self):
+        message = CreationEmailRenderer(self.grade).build_message(self.user)
+
+        self.assertEqual(message.subject, 'ELSYSER grade added')
+        self.assertEqual(message.to, self.user.email)
+        self.assertIn('Ivan', message.body)
+
+
+class ImageHostHandler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_HEAD(self):
+        self.hits.append(self.path)
+
+        if self.path == '/slow.png':
+            time.sleep(1)
+
+        self.send_response(200)
+        if self.path.endswith('.png') or self.path == '/slow.png':
+            self.send_header('Content-Type', 'image/png')
+        elif self.path == '/page':
+            self.send_header('Content-Type', 'text/html')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(PROFILE_IMAGE_URL_VALIDATION={'CONNECT_TIMEOUT': 0.5, 'READ_TIMEOUT': 0.2})
+class ImageURLValidatorTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.server = HTTPServer(('127.0.0.1', 0), ImageHostHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+        super().tearDownClass()
+
+    def setUp(self):
+        ImageHostHandler.hits = []
+        self.validator = ImageURLValidator()
+
+    def test_image_url_is_valid(self):
+        self.assertTrue(self.validator.is_valid(self.base_url + '/picture.png'))
+
+    def test_non_image_url_is_invalid(self):
+        self.assertFalse(self.validator.is_valid(self.base_url + '/page'))
+
+    def test_missing_content_type_is_invalid(self):
+        self.assertFalse(self.validator.is_valid(self.base_url + '/no-type'))
+
+    def test_slow_host_times_out(self):
+        started = time.monotonic()
+
+        self.assertFalse(self.validator.is_valid(self.base_url + '/slow.png'))
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_unreachable_host_is_invalid(self):
+        self.assertFalse(self.validator.is_valid('http://127.0.0.1:1/picture.png'))
+
+    def test_results_are_cached(self):
+        for _ in range(3):
+            self.assertTrue(self.validator.is_valid(self.base_url + '/picture.png'))
+            self.assertFalse(self.validator.is_valid(self.base_url + '/page'))
+
+        self.assertEqual(ImageHostHandler.hits, ['/picture.png', '/page'])
+
+    def test_cache_is_bounded(self):
+        self.validator.cache.maxsize = 2
+
+        for i in range(5):
+            self.validator.is_valid('{}/{}.png'.format(self.base_url, i))
+
+        self.assertEqual(len(self.validator.cache), 2)
+
+    def test_expired_results_are_checked_again(self):
+        self.validator.cache.set(self.base_url + '/picture.png', False, ttl=0)
+
+        self.assertTrue(self.validator.is_valid(self.base_url + '/picture.png'))
+        self.assertEqual(ImageHostHandler.hits, ['/picture.png'])
+
+    def test_background_validation_reports_invalid_url(self):
+        invalid_urls = []
+
+        future = self.validator.validate_in_background(
+            self.base_url + '/page', on_invalid=invalid_urls.append
+        )
+        future.result(timeout=5)
+
+        self.assertEqual(invalid_urls, [self.base_url + '/page'])
+        self.assertTrue(self.validator.is_known_invalid(self.base_url + '/page'))
+
+    def test_profile_update_uses_validator(self):
+        user = User.objects.create(username='tester', password='pass')
+        Student.objects.create(user=user, clazz=Class.objects.create(number=10, letter='A'))
+        self.client.force_authenticate(user=user)
+        url = reverse('students:profile-detail', kwargs={'pk': user.id})
+
+        response = self.client.put(url, {'profile_image_url': self.base_url + '/page'})
+        self.assertEqual(response.data['profile_image_url'], ['URL is not a picture.'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.put(url, {'profile_image_url': self.base_url + '/picture.png'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
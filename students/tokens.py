@@ -0,0 +1,118 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+
+DEFAULT_SIGNED_TOKEN_SETTINGS = {
+    'ACCESS_LIFETIME': 15 * 60,
+    'REFRESH_LIFETIME': 14 * 24 * 60 * 60,
+    'CACHE': 'default',
+}
+
+ACCESS = 'access'
+REFRESH = 'refresh'
+
+SALT = 'students.tokens.{}'
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def get_signed_token_setting(name):
+    options = getattr(settings, 'SIGNED_TOKENS', {})
+
+    return options.get(name, DEFAULT_SIGNED_TOKEN_SETTINGS[name])
+
+
+def get_revocation_cache():
+    return caches[get_signed_token_setting('CACHE')]
+
+
+def get_lifetime(kind):
+    return get_signed_token_setting('{}_LIFETIME'.format(kind.upper()))
+
+
+def get_password_fingerprint(user):
+    return salted_hmac(SALT.format('password'), user.password).hexdigest()[:16]
+
+
+def issue_token(user, kind):
+    payload = {
+        'uid': user.pk,
+        'jti': uuid.uuid4().hex,
+        'iat': time.time(),
+    }
+
+    if kind == REFRESH:
+        payload['pwd'] = get_password_fingerprint(user)
+
+    return signing.dumps(payload, salt=SALT.format(kind), compress=True)
+
+
+def issue_token_pair(user):
+    return {
+        'access_token': issue_token(user, ACCESS),
+        'refresh_token': issue_token(user, REFRESH),
+        'expires_in': get_lifetime(ACCESS),
+    }
+
+
+def get_revocation_keys(payload):
+    return 'revoked-token:{}'.format(payload['jti']), 'revoked-user:{}'.format(payload['uid'])
+
+
+def verify_token(token, kind):
+    """
+    Returns the payload of a valid token of the given kind. Only the signature
+    and a single cache lookup for revocations are checked, the database is
+    never queried.
+
+    Revocations are only seen by every worker if the CACHE is shared between
+    them; with a per-process cache such as LocMemCache, a revoked token keeps
+    working in the other workers until it expires.
+    """
+    try:
+        payload = signing.loads(token, salt=SALT.format(kind), max_age=get_lifetime(kind))
+    except signing.SignatureExpired:
+        raise InvalidToken('Token has expired.')
+    except signing.BadSignature:
+        raise InvalidToken('Invalid token.')
+
+    token_key, user_key = get_revocation_keys(payload)
+    revoked = get_revocation_cache().get_many([token_key, user_key])
+
+    if token_key in revoked or revoked.get(user_key, -1) >= payload['iat']:
+        raise InvalidToken('Token has been revoked.')
+
+    return payload
+
+
+def check_password_fingerprint(payload, user):
+    """
+    Refresh tokens stop working once the user changes their password.
+    """
+    if not constant_time_compare(payload['pwd'], get_password_fingerprint(user)):
+        raise InvalidToken('Token has been revoked.')
+
+
+def revoke_token(payload, kind):
+    token_key, _ = get_revocation_keys(payload)
+    remaining = int(payload['iat'] + get_lifetime(kind) - time.time())
+
+    if remaining > 0:
+        get_revocation_cache().set(token_key, True, remaining)
+
+
+def revoke_user_tokens(user_id):
+    """
+    Revokes every token issued to the user so far, e.g. when the account is
+    deactivated.
+    """
+    _, user_key = get_revocation_keys({'jti': None, 'uid': user_id})
+
+    get_revocation_cache().set(user_key, time.time(), get_lifetime(REFRESH))
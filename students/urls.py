@@ -22,10 +22,19 @@ urlpatterns = [
         PasswordResetConfirmView.as_view(),
         name='password_reset_confirm'),
     url(r'^login/$', views.UserLogin.as_view(), name='login'),
+    url(r'^token/refresh/$', views.TokenRefresh.as_view(), name='token_refresh'),
+    url(r'^token/revoke/$', views.TokenRevoke.as_view(), name='token_revoke'),
     url(r'^subjects/$', views.SubjectsList.as_view(), name='subjects_list'),
     url(r'^classes/$', views.ClassesList.as_view(), name='classes_list'),
     url(r'^students/$', views.StudentsList.as_view(), name='students_list'),
     url(r'^grades/(?P<subject_pk>[0-9]+)/$', views.GradesList.as_view(), name='grades_list'),
+    url(r'^grades/report/(?P<user_pk>[0-9]+)/$', views.ReportCard.as_view(), name='report_card'),
+    url(r'^grades/(?P<subject_pk>[0-9]+)/stats/$',
+        views.GradesStats.as_view(),
+        name='grades_stats'),
+    url(r'^grades/(?P<subject_pk>[0-9]+)/bulk/$',
+        views.GradesBulkCreate.as_view(),
+        name='grades_bulk'),
     url(r'^grades/(?P<subject_pk>[0-9]+)/(?P<user_pk>[0-9]+)/$',
         views.GradesDetail.as_view(),
         name='grades_detail')
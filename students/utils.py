@@ -1,21 +1,33 @@
+import re
 import uuid
+from functools import lru_cache
+from html import unescape
 
-from django.conf import settings
-from django.core.mail import send_mail, EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.template import engines
+from django.template.loader import get_template
+from django.utils.html import escape, strip_tags
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from outbox.utils import build_message, queue_emails
+
+from .signals import post_bulk_create
 
 
 BASE_CLIENT_URL = 'http://elsyser.netlify.com/#/'
 
+
 def generate_activation_key():
     return uuid.uuid4().hex
 
 
-def send_verification_email(user):
+def build_verification_email(user, activation_key):
     subject = 'ELSYSER Account activation'
     client_url = BASE_CLIENT_URL + 'auth/activate/{activation_key}/'.format(
-        activation_key=user.student.activation_key
+        activation_key=activation_key
     )
     message = 'Visit this link to activate your ELSYSER account: {url}'.format(url=client_url)
 
@@ -24,36 +36,141 @@ def send_verification_email(user):
         message=message
     )
 
-    send_mail(
-        subject=subject,
-        message=msg,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-        fail_silently=False
-    )
+    return build_message(subject=subject, body=msg, to=user.email)
+
+
+def send_verification_email(user):
+    build_verification_email(user, user.student.activation_key).save()
+
+
+def minify_html(source):
+    source = re.sub(r'<!--.*?-->', '', source, flags=re.DOTALL)
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.DOTALL)
+    source = re.sub(r'>\s+<', '><', source)
+    source = re.sub(r'\s+', ' ', source)
+
+    return source.strip()
+
+
+def html_to_text(html_content):
+    body = re.search(r'<body[^>]*>(.*)</body>', html_content, flags=re.DOTALL)
+    text = unescape(strip_tags(body.group(1) if body else html_content))
+
+    return '\n'.join(line.strip() for line in text.splitlines() if line.strip())
+
+
+@lru_cache(maxsize=None)
+def get_email_template(template_name):
+    source = get_template(template_name).template.source
+    html = re.sub(r'(</(?:p|tr|table|div|a)>)', '\\1\n', minify_html(source))
+
+    return engines['django'].from_string(html)
+
+
+class CreationEmailRenderer(object):
+    template_name = 'utils/email.html'
+    recipient_placeholder = '\x00full_name\x00'
+
+    def __init__(self, model):
+        model_type = model.__class__.__name__.lower()
+        client_resource_link = '{model_type}s/{id}/'.format(model_type=model_type, id=model.id)
+
+        template_context = {
+            'full_name': self.recipient_placeholder,
+            'type': model_type,
+            'model': model,
+            'author': model.author,
+            'link': BASE_CLIENT_URL + client_resource_link
+        }
+        html_content = get_email_template(self.template_name).render(template_context)
+
+        self.subject = 'ELSYSER {resource} added'.format(resource=model_type)
+        self.html_parts = html_content.split(self.recipient_placeholder)
+        self.text_parts = html_to_text(html_content).split(self.recipient_placeholder)
+
+    def render(self, user):
+        full_name = user.get_full_name()
+
+        text_content = full_name.join(self.text_parts)
+        html_content = escape(full_name).join(self.html_parts)
+
+        return text_content, html_content
+
+    def build_message(self, user):
+        text_content, html_content = self.render(user)
+
+        return build_message(self.subject, text_content, user.email, html_body=html_content)
+
+
+def build_creation_email(user, model):
+    return CreationEmailRenderer(model).build_message(user)
 
 
 def send_creation_email(user, model):
-    model_type = model.__class__.__name__.lower()
-    client_resource_link = '{model_type}s/{id}/'.format(model_type=model_type, id=model.id)
-
-    template_context = {
-        'full_name': user.get_full_name(),
-        'type': model_type,
-        'model': model,
-        'author': model.author,
-        'link': BASE_CLIENT_URL + client_resource_link
-    }
-    html_content = render_to_string('utils/email.html', context=template_context)
-    text_content = strip_tags(html_content)
-
-    subject = 'ELSYSER {resource} added'.format(resource=model_type)
-
-    msg = EmailMultiAlternatives(
-        subject,
-        text_content,
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email]
+    build_creation_email(user, model).save()
+
+
+def send_creation_emails(users, model):
+    renderer = CreationEmailRenderer(model)
+
+    queue_emails([renderer.build_message(user) for user in users])
+
+
+def send_class_creation_emails(models):
+    renderers = {model.clazz_id: CreationEmailRenderer(model) for model in models}
+    recipients = User.objects.filter(student__clazz__in=renderers).select_related('student')
+
+    queue_emails([renderers[user.student.clazz_id].build_message(user) for user in recipients])
+
+
+def send_grade_emails(grades):
+    queue_emails([build_creation_email(grade.student.user, model=grade) for grade in grades])
+
+
+def bulk_create_with_ids(model, objects):
+    model.objects.bulk_create(objects)
+
+    if objects and not connection.features.can_return_ids_from_bulk_insert:
+        # SQLite does not report the new ids, but it holds the write lock
+        # until the surrounding transaction ends, so the newest rows of the
+        # table are the ones just inserted.
+        ids = model.objects.order_by('-pk').values_list('pk', flat=True)[:len(objects)]
+
+        for obj, pk in zip(objects, reversed(list(ids))):
+            obj.pk = pk
+
+    return objects
+
+
+def send_created_signals(model, objects):
+    # bulk_create() skips post_save; the search index and the response cache
+    # are updated once for the whole batch instead.
+    post_bulk_create.send(sender=model, objects=objects)
+
+
+def stream_json_list(items, chunk_size=100):
+    encoder = JSONEncoder()
+    separator = ''
+    chunk = []
+
+    yield '['
+
+    for item in items:
+        chunk.append(encoder.encode(item))
+
+        if len(chunk) == chunk_size:
+            yield separator + ','.join(chunk)
+            separator, chunk = ',', []
+
+    if chunk:
+        yield separator + ','.join(chunk)
+
+    yield ']'
+
+
+def streaming_json_response(items, status=200):
+    return StreamingHttpResponse(
+        stream_json_list(items),
+        status=status,
+        content_type='application/json'
     )
-    msg.attach_alternative(html_content, "text/html")
-    msg.send()
@@ -0,0 +1,133 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from django.conf import settings
+from django.db import connection
+
+
+DEFAULT_IMAGE_URL_SETTINGS = {
+    'MODE': 'sync',
+    'CONNECT_TIMEOUT': 2,
+    'READ_TIMEOUT': 3,
+    'POOL_SIZE': 10,
+    'CACHE_SIZE': 1024,
+    'POSITIVE_TTL': 60 * 60,
+    'NEGATIVE_TTL': 5 * 60,
+    'BACKGROUND_WORKERS': 2,
+}
+
+ALLOWED_CONTENT_TYPES = ('image/', 'application/json')
+
+
+def get_image_url_setting(name):
+    options = getattr(settings, 'PROFILE_IMAGE_URL_VALIDATION', {})
+
+    return options.get(name, DEFAULT_IMAGE_URL_SETTINGS[name])
+
+
+class TTLCache(object):
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return default
+
+            self.entries.move_to_end(key)
+
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ImageURLValidator(object):
+    def __init__(self):
+        pool_size = get_image_url_setting('POOL_SIZE')
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.cache = TTLCache(get_image_url_setting('CACHE_SIZE'))
+        self.executor = None
+        self.executor_lock = threading.Lock()
+
+    @property
+    def in_background(self):
+        return get_image_url_setting('MODE') == 'background'
+
+    def fetch_content_type(self, url):
+        timeout = (get_image_url_setting('CONNECT_TIMEOUT'), get_image_url_setting('READ_TIMEOUT'))
+        response = self.session.head(url, timeout=timeout, allow_redirects=True)
+
+        return response.headers.get('content-type', '')
+
+    def check(self, url):
+        try:
+            content_type = self.fetch_content_type(url)
+        except requests.RequestException:
+            return False
+
+        return content_type.startswith(ALLOWED_CONTENT_TYPES)
+
+    def is_valid(self, url):
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached
+
+        valid = self.check(url)
+        ttl = get_image_url_setting('POSITIVE_TTL' if valid else 'NEGATIVE_TTL')
+        self.cache.set(url, valid, ttl)
+
+        return valid
+
+    def is_known_invalid(self, url):
+        return self.cache.get(url) is False
+
+    def get_executor(self):
+        with self.executor_lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(get_image_url_setting('BACKGROUND_WORKERS'))
+
+            return self.executor
+
+    def validate_in_background(self, url, on_invalid):
+        def run():
+            try:
+                if not self.is_valid(url):
+                    on_invalid(url)
+            finally:
+                connection.close()
+
+        return self.get_executor().submit(run)
+
+
+image_url_validator = ImageURLValidator()
@@ -1,6 +1,4 @@
-from django.contrib.auth import login
-
-from collections import defaultdict
+import csv
 
 from django.contrib.auth.models import User
 
@@ -12,16 +10,23 @@ from rest_framework.authtoken.models import Token
 from rest_framework_word_filter import FullWordSearchFilter
 
 from .serializers import (
-    UserLoginSerializer, UserInfoSerializer,
+    UserLoginSerializer, UserInfoSerializer, TokenRefreshSerializer, TokenRevokeSerializer,
     ClassSerializer,
     StudentSerializer,
     SubjectSerializer,
     StudentProfileSerializer, TeacherProfileSerializer,
-    GradesSerializer
+    GradesSerializer, GradesBulkSerializer, GradeStatsQuerySerializer, GradeRowSerializer,
+    ReportCardSerializer, attach_grade_averages
 )
 from .models import Subject, Class, Student, Teacher, Grade
 from .permissions import IsValidUser, IsStudent, IsTeacher, IsTeachersSubject
+from .conditional import ConditionalListMixin
+from .reference import classes, subjects, get_subject_or_404
+from .roles import Role
+from .tokens import REFRESH, issue_token_pair, revoke_token
+from .analytics import get_grade_stats
 from .filters import GradeFilterBackend
+from .utils import streaming_json_response
 
 
 class StudentRegistration(generics.CreateAPIView):
@@ -57,23 +62,56 @@ class UserLogin(generics.CreateAPIView):
     serializer_class = UserLoginSerializer
 
     def post(self, request, *args, **kwargs):
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        # The authentication backend has already joined the profile and the token.
         user = serializer.validated_data['user']
-        token, _ = Token.objects.get_or_create(user=user)
+        role = Role(user)
 
-        login(request, user)
+        try:
+            token = user.auth_token
+        except Token.DoesNotExist:
+            token = Token.objects.create(user=user)
 
         response_data = UserInfoSerializer(user).data
         response_data['token'] = token.key
-        response_data['is_teacher'] = Teacher.objects.filter(user=user).exists()
+        response_data['is_teacher'] = role.is_teacher
+        response_data.update(issue_token_pair(user))
 
         headers = self.get_success_headers(serializer.data)
 
         return Response(response_data, status=status.HTTP_200_OK, headers=headers)
 
 
+class TokenRefresh(generics.GenericAPIView):
+    authentication_classes = ()
+    serializer_class = TokenRefreshSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = serializer.validated_data['user']
+        revoke_token(serializer.validated_data['payload'], REFRESH)
+
+        return Response(issue_token_pair(user), status=status.HTTP_200_OK)
+
+
+class TokenRevoke(generics.GenericAPIView):
+    authentication_classes = ()
+    serializer_class = TokenRevokeSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        for payload, kind in serializer.validated_data['payloads']:
+            revoke_token(payload, kind)
+
+        return Response(None, status=status.HTTP_204_NO_CONTENT)
+
+
 class ProfileViewSet(viewsets.ModelViewSet):
     permission_classes = (IsAuthenticated,)
     permission_classes_by_action = {
@@ -123,28 +161,53 @@ class ProfileViewSet(viewsets.ModelViewSet):
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
-class SubjectsList(generics.ListAPIView):
+class ReferenceListMixin(ConditionalListMixin):
+    """
+    Serves a list straight from the in-process snapshot of a reference table.
+    """
+    reference_table = None
+    cache_control = {'private': True, 'max_age': 60 * 60}
+
+    def get_validator(self, queryset):
+        return self.snapshot.digest, None
+
+    def list(self, request, *args, **kwargs):
+        self.snapshot = self.reference_table.get_snapshot()
+
+        return self.conditional_response(request, None, self.list_snapshot, *args, **kwargs)
+
+    def list_snapshot(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.snapshot.data)
+
+        if page is not None:
+            return self.get_paginated_response(page)
+
+        return Response(self.snapshot.data)
+
+
+class SubjectsList(ReferenceListMixin, generics.ListAPIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = SubjectSerializer
     queryset = Subject.objects.all()
+    reference_table = subjects
 
 
-class ClassesList(generics.ListAPIView):
+class ClassesList(ReferenceListMixin, generics.ListAPIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = ClassSerializer
+    queryset = Class.objects.all()
+    reference_table = classes
 
-    def get_queryset(self):
-        all_classes = Class.objects.all()
-        class_number = self.request.query_params.get('number')
-
-        return all_classes.filter(number=class_number) if class_number else all_classes
+    def list_snapshot(self, request, *args, **kwargs):
+        data = self.snapshot.by_number
+        class_number = request.query_params.get('number')
 
-    def get(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-
-        data = defaultdict(list)
-        for clazz in serializer.data:
-            data[clazz['number']].append(clazz)
+        if class_number:
+            data = {
+                number: number_classes
+                for number, number_classes in data.items()
+                if str(number) == class_number
+            }
 
         return Response(data, status=status.HTTP_200_OK)
 
@@ -176,6 +239,14 @@ class StudentsList(generics.ListAPIView):
 
         return all_students
 
+    def list(self, request, *args, **kwargs):
+        students = list(self.filter_queryset(self.get_queryset()).select_related('user', 'clazz'))
+        attach_grade_averages(students)
+
+        serializer = self.get_serializer(students, many=True)
+
+        return Response(serializer.data)
+
 
 class GradesList(generics.ListAPIView):
     permission_classes = (IsAuthenticated,)
@@ -184,6 +255,44 @@ class GradesList(generics.ListAPIView):
     filter_backends = (GradeFilterBackend,)
     pagination_class = None
 
+    def list(self, request, *args, **kwargs):
+        grades = self.filter_queryset(self.get_queryset())
+
+        return streaming_json_response(GradeRowSerializer(grades))
+
+
+class GradesStats(generics.GenericAPIView):
+    permission_classes = (IsAuthenticated,)
+    serializer_class = GradeStatsQuerySerializer
+
+    def get(self, request, *args, **kwargs):
+        subject = get_subject_or_404(kwargs['subject_pk'])
+
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        stats = get_grade_stats(
+            subject,
+            class_number=serializer.validated_data.get('class_number'),
+            class_letter=serializer.validated_data.get('class_letter', '')
+        )
+
+        return Response(stats, status=status.HTTP_200_OK)
+
+
+class ReportCard(generics.RetrieveAPIView):
+    permission_classes = (IsAuthenticated, IsValidUser)
+
+    def get(self, request, *args, **kwargs):
+        student = generics.get_object_or_404(
+            Student.objects.select_related('user', 'clazz'), user__id=kwargs['user_pk']
+        )
+
+        if IsStudent().has_permission(request, self):
+            self.check_object_permissions(request, student.user)
+
+        return Response(ReportCardSerializer(student).data, status=status.HTTP_200_OK)
+
 
 class GradesDetail(generics.ListCreateAPIView):
     permission_classes_by_action = {
@@ -208,16 +317,14 @@ class GradesDetail(generics.ListCreateAPIView):
         grades = Grade.objects.filter(
             subject__id=kwargs['subject_pk']
         ).filter(
-            student__id=user.student.pk
+            student__user__id=user.id
         )
 
-        serializer = self.serializer_class(grades, many=True)
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return streaming_json_response(GradeRowSerializer(grades))
 
 
     def post(self, request, *args, **kwargs):
-        subject = generics.get_object_or_404(Subject, id=kwargs['subject_pk'])
+        subject = get_subject_or_404(kwargs['subject_pk'])
         self.check_object_permissions(request, subject)
 
         user = generics.get_object_or_404(User, id=kwargs['user_pk'])
@@ -235,3 +342,36 @@ class GradesDetail(generics.ListCreateAPIView):
         headers = self.get_success_headers(serializer.data)
 
         return Response(serializer.validated_data, status=status.HTTP_201_CREATED, headers=headers)
+
+
+class GradesBulkCreate(generics.CreateAPIView):
+    permission_classes = (IsAuthenticated, IsTeacher, IsTeachersSubject)
+    serializer_class = GradesBulkSerializer
+
+    def get_rows(self, request):
+        upload = request.FILES.get('file')
+
+        if upload is None:
+            return request.data.get('grades') if isinstance(request.data, dict) else request.data
+
+        lines = upload.read().decode('utf-8-sig').splitlines()
+
+        return [
+            {'student': row.get('student'), 'value': row.get('value')}
+            for row in csv.DictReader(lines)
+        ]
+
+    def post(self, request, *args, **kwargs):
+        subject = get_subject_or_404(kwargs['subject_pk'])
+        self.check_object_permissions(request, subject)
+
+        context = {
+            'request': request,
+            'subject': subject
+        }
+
+        serializer = self.serializer_class(context=context, data={'grades': self.get_rows(request)})
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
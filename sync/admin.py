@@ -0,0 +1,11 @@
+from django.contrib import admin
+from django.contrib.admin.decorators import register
+
+from .models import Tombstone
+
+
+@register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ('id', 'resource', 'object_id', 'scope', 'deleted_on')
+    date_hierarchy = 'deleted_on'
+    list_filter = ('resource',)
@@ -0,0 +1,14 @@
+from django.core import checks
+
+from students.checks import check_shared_cache
+
+from .utils import get_sync_setting
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_notify_cache(app_configs, **kwargs):
+    return check_shared_cache(
+        "SYNC['NOTIFY_CACHE']", get_sync_setting('NOTIFY_CACHE'),
+        'waiting requests in the other workers miss notifications until they time out',
+        'sync.E001'
+    )
@@ -0,0 +1,143 @@
+import math
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from news.models import News, Comment
+from news.views import CommentsViewSet
+from students.models import Class, Student
+
+from sync.notifier import notifier, get_channel
+from sync.views import Wait
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the database load of clients polling a comments list with clients '
+        'long-polling for changes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=500)
+        parser.add_argument('--duration', type=int, default=60 * 60)
+        parser.add_argument('--interval', type=int, default=5)
+        parser.add_argument('--comments', type=int, default=120)
+        parser.add_argument('--timeout', type=int, default=25)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(**options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, clients, duration, interval, comments, timeout, **options):
+        user, news = self.generate_news()
+        factory = APIRequestFactory()
+        list_view = CommentsViewSet.as_view({'get': 'list'})
+        wait_view = Wait.as_view()
+
+        def fetch(**headers):
+            request = factory.get('/', **headers)
+            force_authenticate(request, user=user)
+
+            return list_view(request, students_news_pk=news.id)
+
+        def wait():
+            request = factory.get('/', {
+                'news': news.id,
+                'version': notifier.get_version(get_channel('news', news.id)),
+                'timeout': 0
+            })
+            force_authenticate(request, user=user)
+
+            return wait_view(request)
+
+        fetch_queries, response = self.count_queries(fetch)
+        poll_queries, _ = self.count_queries(lambda: fetch(HTTP_IF_NONE_MATCH=response['ETag']))
+        wait_queries, _ = self.count_queries(wait)
+
+        # Every client refetches the list once per new comment either way; a
+        # polling client also asks every `interval` seconds, a long-polling one
+        # only when its wait times out.
+        polls = duration // interval
+        waits = comments + math.ceil(duration / timeout)
+        polling = clients * ((polls - comments) * poll_queries + comments * fetch_queries)
+        long_polling = clients * (waits * wait_queries + comments * fetch_queries)
+
+        self.stdout.write(
+            'Queries per request (without authentication): list {}, conditional list {}, '
+            'wait {}'.format(fetch_queries, poll_queries, wait_queries)
+        )
+        self.stdout.write(
+            '{} clients, {} comments in {}s: polling every {}s {} requests / {} queries, '
+            'long-polling {} requests / {} queries ({:.1f}x fewer queries)'.format(
+                clients, comments, duration, interval,
+                clients * polls, polling,
+                clients * (waits + comments), long_polling,
+                polling / long_polling
+            )
+        )
+
+        self.park_clients(clients, get_channel('news', news.id))
+
+    def park_clients(self, clients, channel):
+        """
+        Parks `clients` threads on the channel, like waiting requests would be,
+        and measures how long one notification takes to wake all of them.
+        """
+        version = notifier.get_version(channel)
+        woken = []
+        threads = [
+            threading.Thread(target=lambda: woken.append(notifier.wait(channel, version, 30)))
+            for _ in range(clients)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        time.sleep(1)
+        started = time.time()
+        notifier.publish(channel)
+
+        for thread in threads:
+            thread.join()
+
+        self.stdout.write(
+            'Woke {} parked clients, holding no database connections, in {:.1f} ms'.format(
+                len(woken), (time.time() - started) * 1000
+            )
+        )
+
+    def generate_news(self):
+        clazz = Class.objects.create(number=8, letter='Z')
+        user = User.objects.create(username='bench_long_poll_student')
+        Student.objects.create(user=user, clazz=clazz)
+
+        news = News.objects.create(
+            title='Benchmark', content='Benchmark', class_number=8, class_letter='Z', author=user
+        )
+        Comment.objects.bulk_create([
+            Comment(news=news, author=user, content='Comment {}'.format(index))
+            for index in range(20)
+        ])
+
+        return user, news
+
+    @staticmethod
+    def count_queries(func):
+        with CaptureQueriesContext(connection) as queries:
+            result = func()
+
+        return len(queries), result
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sync.models import Tombstone
+from sync.utils import get_sync_setting
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes tombstones older than SYNC["TOMBSTONE_RETENTION_DAYS"]. '
+        'Clients with older marks get a full sync anyway.'
+    )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=get_sync_setting('TOMBSTONE_RETENTION_DAYS'))
+        deleted, _ = Tombstone.objects.filter(deleted_on__lt=cutoff).delete()
+
+        self.stdout.write(self.style.SUCCESS('Deleted {} tombstones.'.format(deleted)))
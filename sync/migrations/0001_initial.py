@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.2 on 2026-10-16 23:14
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('deleted_on', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['deleted_on'],
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='tombstone',
+            index_together=set([('resource', 'deleted_on')]),
+        ),
+    ]
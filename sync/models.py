@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class Tombstone(models.Model):
+    resource = models.CharField(max_length=20)
+    object_id = models.PositiveIntegerField()
+    scope = models.CharField(max_length=40, blank=True)
+    deleted_on = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return '{} #{} ({})'.format(self.resource, self.object_id, self.deleted_on)
+
+    class Meta:
+        ordering = ['deleted_on']
+        index_together = [
+            ['resource', 'deleted_on'],
+        ]
@@ -0,0 +1,101 @@
+import threading
+import time
+import uuid
+
+from django.core.cache import caches
+from django.db import connection, connections, transaction
+
+from .utils import get_sync_setting
+
+
+def get_channel(kind, pk):
+    return '{}:{}'.format(kind, pk)
+
+
+def release_connections():
+    """
+    Closes this thread's database connections, so that parked requests hold
+    none; the next query opens a new one. Connections inside a transaction
+    (e.g. in tests) have to stay open.
+    """
+    for alias_connection in connections.all():
+        if not alias_connection.in_atomic_block:
+            alias_connection.close()
+
+
+class Notifier(object):
+    """
+    Wakes up requests waiting for something to change on a channel, e.g.
+    `news:<id>`. Each channel has a version stamp in the shared cache, so a
+    notification sent by any worker is seen by every other one within
+    CHECK_INTERVAL seconds; waiters in the sending process are woken at once.
+    """
+    KEY = 'sync-notifier:{}'
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+
+    @staticmethod
+    def get_cache():
+        return caches[get_sync_setting('NOTIFY_CACHE')]
+
+    def get_version(self, channel):
+        cache = self.get_cache()
+        key = self.KEY.format(channel)
+        version = cache.get(key)
+
+        if version is None:
+            cache.add(key, uuid.uuid4().hex, None)
+            version = cache.get(key)
+
+        return version
+
+    def publish(self, channel):
+        self.get_cache().set(self.KEY.format(channel), uuid.uuid4().hex, None)
+
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def notify(self, channel):
+        """
+        Inside a transaction waiters are only woken on commit, since they
+        would not see the new rows before that.
+        """
+        if connection.in_atomic_block:
+            transaction.on_commit(lambda: self.publish(channel))
+        else:
+            self.publish(channel)
+
+    def wait(self, channel, version, timeout):
+        """
+        Blocks until the channel's version differs from `version`, or for
+        `timeout` seconds, and returns the current version. Local
+        notifications for any channel wake all waiters, which then compare
+        versions again.
+
+        With a database-backed NOTIFY_CACHE every check opens a connection,
+        which is closed again before the waiter goes back to sleep.
+        """
+        deadline = time.time() + timeout
+        interval = get_sync_setting('CHECK_INTERVAL')
+
+        while True:
+            with self.condition:
+                generation = self.generation
+
+            current = self.get_version(channel)
+            release_connections()
+            remaining = deadline - time.time()
+
+            if current != version or remaining <= 0:
+                return current
+
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self.generation != generation, min(remaining, interval)
+                )
+
+
+notifier = Notifier()
@@ -0,0 +1,296 @@
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from django.db.models import Q
+
+from exams.models import Exam
+from exams.serializers import ExamReadSerializer
+from homeworks.models import Homework
+from homeworks.serializers import HomeworkReadSerializer
+from materials.models import Material
+from materials.serializers import MaterialReadSerializer
+from news.models import News, Comment
+from news.serializers import NewsSerializer
+from news.views import NewsFeedListMixin
+from students.roles import get_role
+from talks.models import Meetup
+from talks.serializers import MeetupSerializer
+from talks.utils import get_talk_votes
+
+from .models import Tombstone
+from .serializers import CommentSyncSerializer
+from .utils import get_sync_setting, format_mark
+
+
+class SyncResource(object):
+    """
+    A list that clients keep a local copy of. `get_queryset` returns every
+    row the user may see; a delta holds the rows edited since the client's
+    mark and the ids of the rows deleted since then.
+
+    Tombstones are recorded per scope, e.g. the class and the subject of an
+    exam, and users only get those of their own scopes. A row moved out of a
+    scope gets a tombstone there too, so that clients drop it.
+    """
+    name = None
+    model = None
+    serializer_class = None
+    scope_fields = ()
+
+    def get_queryset(self, request):
+        raise NotImplementedError()
+
+    def get_scopes(self, request):
+        return ['']
+
+    def get_row_scopes(self, row):
+        """
+        Returns the scopes of a row, given the values of its `scope_fields`.
+        """
+        return ['']
+
+    def get_object_scopes(self, obj):
+        return self.get_row_scopes({
+            field: obj.serializable_value(field) for field in self.scope_fields
+        })
+
+    def get_changed(self, request, since):
+        queryset = self.get_queryset(request)
+
+        return queryset if since is None else queryset.filter(last_edited_on__gt=since)
+
+    def get_deleted(self, request, since):
+        tombstones = Tombstone.objects.filter(
+            resource=self.name, scope__in=self.get_scopes(request), deleted_on__gt=since
+        )
+
+        return list(OrderedDict.fromkeys(tombstones.values_list('object_id', flat=True)))
+
+    def serialize(self, objects, request):
+        return self.serializer_class(objects, many=True, context={'request': request}).data
+
+    def get_delta(self, request, mark, now):
+        """
+        Without a mark, or with one older than the tombstones we keep, the
+        client gets every row and `reset` tells it to drop its local copy.
+        Marks are moved back by a few seconds, so that rows committed late
+        are not missed; clients should expect to see some rows twice.
+        """
+        retention = timedelta(days=get_sync_setting('TOMBSTONE_RETENTION_DAYS'))
+        reset = mark is None or mark < now - retention
+        since = None if reset else mark - timedelta(seconds=get_sync_setting('OVERLAP_SECONDS'))
+
+        return OrderedDict([
+            ('mark', format_mark(now)),
+            ('reset', reset),
+            ('changed', self.serialize(self.get_changed(request, since), request)),
+            ('deleted', [] if reset else self.get_deleted(request, since)),
+        ])
+
+
+def get_class_and_subject_scopes(request):
+    role = get_role(request)
+
+    if role.is_teacher:
+        return ['subject:{}'.format(role.subject.id)]
+    if role.is_student:
+        return ['class:{}'.format(role.clazz.id)]
+
+    return []
+
+
+class NewsResource(SyncResource):
+    name = 'news'
+    model = News
+    serializer_class = NewsSerializer
+    scope_fields = ('class_number', 'class_letter', 'author')
+
+    def get_queryset(self, request):
+        role = get_role(request)
+
+        if role.is_student:
+            return News.objects.filter(
+                class_number=role.clazz.number, class_letter__in=('', role.clazz.letter)
+            )
+        if role.is_teacher:
+            return News.objects.filter(author=request.user)
+
+        return News.objects.none()
+
+    def get_scopes(self, request):
+        role = get_role(request)
+
+        if role.is_student:
+            return [
+                'class:{}:{}'.format(role.clazz.number, letter)
+                for letter in ('', role.clazz.letter)
+            ]
+        if role.is_teacher:
+            return ['author:{}'.format(request.user.id)]
+
+        return []
+
+    def get_row_scopes(self, row):
+        return [
+            'class:{}:{}'.format(row['class_number'], row['class_letter']),
+            'author:{}'.format(row['author'])
+        ]
+
+    def serialize(self, objects, request):
+        news_list = list(objects.with_feed_data())
+        NewsFeedListMixin().attach_latest_comments(news_list)
+
+        return super().serialize(news_list, request)
+
+
+class CommentsResource(SyncResource):
+    name = 'comments'
+    model = Comment
+    serializer_class = CommentSyncSerializer
+
+    def get_queryset(self, request):
+        news = NewsResource().get_queryset(request)
+
+        return Comment.objects.filter(news__in=news.values('id')).with_authors()
+
+    def get_scopes(self, request):
+        return NewsResource().get_scopes(request)
+
+    def get_object_scopes(self, obj):
+        """
+        Comments are in the scopes of their news.
+        """
+        news = NewsResource()
+        row = News.objects.filter(pk=obj.news_id).values(*news.scope_fields).first()
+
+        return [] if row is None else news.get_row_scopes(row)
+
+
+class ExamsResource(SyncResource):
+    name = 'exams'
+    model = Exam
+    serializer_class = ExamReadSerializer
+    scope_fields = ('clazz', 'subject')
+
+    def get_queryset(self, request):
+        role = get_role(request)
+        exams = Exam.objects.filter(date__gte=date.today()).select_related(
+            'subject', 'clazz', 'author__user'
+        )
+
+        if role.is_teacher:
+            return exams.filter(subject=role.subject)
+        if role.is_student:
+            return exams.filter(clazz=role.clazz)
+
+        return exams.none()
+
+    def get_scopes(self, request):
+        return get_class_and_subject_scopes(request)
+
+    def get_row_scopes(self, row):
+        return ['class:{}'.format(row['clazz']), 'subject:{}'.format(row['subject'])]
+
+
+class HomeworksResource(SyncResource):
+    name = 'homeworks'
+    model = Homework
+    serializer_class = HomeworkReadSerializer
+    scope_fields = ('clazz', 'subject')
+
+    def get_queryset(self, request):
+        role = get_role(request)
+        homeworks = Homework.objects.filter(deadline__gte=date.today()).select_related(
+            'subject', 'clazz', 'author__user'
+        )
+
+        if role.is_teacher:
+            return homeworks.filter(subject=role.subject)
+        if role.is_student:
+            return homeworks.filter(clazz=role.clazz)
+
+        return homeworks.none()
+
+    def get_scopes(self, request):
+        return get_class_and_subject_scopes(request)
+
+    def get_row_scopes(self, row):
+        return ['class:{}'.format(row['clazz']), 'subject:{}'.format(row['subject'])]
+
+
+class MaterialsResource(SyncResource):
+    name = 'materials'
+    model = Material
+    serializer_class = MaterialReadSerializer
+    scope_fields = ('class_number', 'subject')
+
+    def get_queryset(self, request):
+        role = get_role(request)
+        materials = Material.objects.select_related('subject', 'author__user')
+
+        if role.is_teacher:
+            return materials.filter(subject=role.subject)
+        if role.is_student:
+            return materials.filter(class_number=role.clazz.number)
+
+        return materials.none()
+
+    def get_scopes(self, request):
+        role = get_role(request)
+
+        if role.is_teacher:
+            return ['subject:{}'.format(role.subject.id)]
+        if role.is_student:
+            return ['class_number:{}'.format(role.clazz.number)]
+
+        return []
+
+    def get_row_scopes(self, row):
+        return [
+            'class_number:{}'.format(row['class_number']), 'subject:{}'.format(row['subject'])
+        ]
+
+
+class MeetupsResource(SyncResource):
+    name = 'meetups'
+    model = Meetup
+    serializer_class = MeetupSerializer
+
+    def get_queryset(self, request):
+        return Meetup.objects.prefetch_related('talks__author')
+
+    def get_changed(self, request, since):
+        meetups = self.get_queryset(request)
+
+        if since is None:
+            return meetups
+
+        return meetups.filter(
+            Q(last_edited_on__gt=since) | Q(talks__last_edited_on__gt=since)
+        ).distinct()
+
+    def serialize(self, objects, request):
+        meetups = list(objects)
+        votes_counts, voted_talk_ids = get_talk_votes(
+            [talk for meetup in meetups for talk in meetup.talks.all()], user_id=request.user.id
+        )
+        context = {
+            'request': request,
+            'votes_counts': votes_counts,
+            'voted_talk_ids': voted_talk_ids
+        }
+
+        return self.serializer_class(meetups, many=True, context=context).data
+
+
+RESOURCES = OrderedDict(
+    (resource.name, resource)
+    for resource in (
+        NewsResource(),
+        CommentsResource(),
+        ExamsResource(),
+        HomeworksResource(),
+        MaterialsResource(),
+        MeetupsResource(),
+    )
+)
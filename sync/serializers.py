@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+from news.serializers import CommentReadSerializer
+
+
+class CommentSyncSerializer(CommentReadSerializer):
+    class Meta(CommentReadSerializer.Meta):
+        fields = CommentReadSerializer.Meta.fields + ('news',)
+
+
+class WaitQuerySerializer(serializers.Serializer):
+    news = serializers.IntegerField(required=False)
+    meetup = serializers.IntegerField(required=False)
+    version = serializers.CharField(required=False, allow_blank=True)
+    timeout = serializers.IntegerField(required=False, min_value=0)
+
+    def validate(self, data):
+        if ('news' in data) == ('meetup' in data):
+            raise serializers.ValidationError('Either news or meetup is required.')
+
+        return data
@@ -0,0 +1,91 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.utils import timezone
+
+from vote.models import Vote
+
+from news.models import Comment
+from talks.models import Meetup, Talk
+
+from .models import Tombstone
+from .notifier import notifier, get_channel
+from .resources import RESOURCES
+
+
+RESOURCE_NAMES = {resource.model: name for name, resource in RESOURCES.items()}
+
+
+def record_tombstones(resource, object_id, scopes):
+    Tombstone.objects.bulk_create([
+        Tombstone(resource=resource.name, object_id=object_id, scope=scope) for scope in scopes
+    ])
+
+
+def record_tombstone(sender, instance, **kwargs):
+    resource = RESOURCES[RESOURCE_NAMES[sender]]
+    record_tombstones(resource, instance.pk, resource.get_object_scopes(instance))
+
+
+def remember_scopes(sender, instance, raw=False, **kwargs):
+    resource = RESOURCES[RESOURCE_NAMES[sender]]
+    instance.sync_scopes = []
+
+    if raw or instance.pk is None or not resource.scope_fields:
+        return
+
+    row = sender._default_manager.filter(pk=instance.pk).values(*resource.scope_fields).first()
+
+    if row is not None:
+        instance.sync_scopes = resource.get_row_scopes(row)
+
+
+def record_moved_tombstones(sender, instance, **kwargs):
+    """
+    Records tombstones in the scopes an updated row has left, e.g. the old
+    class of an exam moved to another one.
+    """
+    previous = getattr(instance, 'sync_scopes', [])
+
+    if not previous:
+        return
+
+    resource = RESOURCES[RESOURCE_NAMES[sender]]
+    current = resource.get_object_scopes(instance)
+    record_tombstones(resource, instance.pk, [scope for scope in previous if scope not in current])
+
+
+def touch_talk_meetup(sender, instance, **kwargs):
+    Meetup.objects.filter(pk=instance.meetup_id).update(last_edited_on=timezone.now())
+
+
+def notify_comment(sender, instance, **kwargs):
+    notifier.notify(get_channel('news', instance.news_id))
+
+
+def notify_talk(sender, instance, **kwargs):
+    notifier.notify(get_channel('meetup', instance.meetup_id))
+
+
+def notify_vote(sender, instance, **kwargs):
+    if instance.content_type_id != ContentType.objects.get_for_model(Talk).id:
+        return
+
+    meetup_id = Talk.objects.filter(pk=instance.object_id).values_list(
+        'meetup_id', flat=True
+    ).first()
+
+    if meetup_id is not None:
+        notifier.notify(get_channel('meetup', meetup_id))
+
+
+for model, name in RESOURCE_NAMES.items():
+    pre_save.connect(remember_scopes, sender=model, dispatch_uid='sync_scopes_' + name)
+    post_save.connect(record_moved_tombstones, sender=model, dispatch_uid='sync_moved_' + name)
+    post_delete.connect(record_tombstone, sender=model, dispatch_uid='sync_tombstone_' + name)
+
+post_delete.connect(touch_talk_meetup, sender=Talk, dispatch_uid='sync_talk_delete')
+
+for signal, action in ((post_save, 'save'), (post_delete, 'delete')):
+    signal.connect(notify_comment, sender=Comment, dispatch_uid='sync_notify_comment_' + action)
+    signal.connect(notify_talk, sender=Talk, dispatch_uid='sync_notify_talk_' + action)
+    signal.connect(notify_vote, sender=Vote, dispatch_uid='sync_notify_vote_' + action)
@@ -0,0 +1,294 @@
+import threading
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework.reverse import reverse
+from rest_framework import status
+
+from students.testing import APITestCase, APITransactionTestCase
+from exams.models import Exam
+from news.models import News, Comment
+from students.models import Class, Subject, Student, Teacher
+from talks.models import Meetup, Talk
+
+from .models import Tombstone
+from .notifier import notifier, get_channel
+from .utils import format_mark
+
+
+@override_settings(SYNC={'OVERLAP_SECONDS': 0})
+class SyncViewTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('sync:sync')
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.other_clazz = Class.objects.create(number=11, letter='B')
+        self.subject = Subject.objects.create(title='Maths')
+
+        self.student_user = User.objects.create(username='student', password='pass')
+        self.student = Student.objects.create(user=self.student_user, clazz=self.clazz)
+
+        self.teacher_user = User.objects.create(username='teacher', password='pass')
+        self.teacher = Teacher.objects.create(user=self.teacher_user, subject=self.subject)
+
+        self.news = News.objects.create(
+            title='test news', content='test content', class_number=10, class_letter='A',
+            author=self.teacher_user
+        )
+        self.comment = Comment.objects.create(
+            news=self.news, author=self.student_user, content='test comment'
+        )
+        self.exam = Exam.objects.create(
+            subject=self.subject, clazz=self.clazz, date=date.today() + timedelta(days=7),
+            topic='test topic', author=self.teacher
+        )
+        Exam.objects.create(
+            subject=self.subject, clazz=self.other_clazz, date=date.today() + timedelta(days=7),
+            topic='other class', author=self.teacher
+        )
+        self.meetup = Meetup.objects.create(date=timezone.now() + timedelta(days=7))
+        self.talk = Talk.objects.create(
+            meetup=self.meetup, author=self.student_user, topic='test talk',
+            description='test description'
+        )
+
+        self.client.force_authenticate(user=self.student_user)
+
+    def get_marks(self, response):
+        return {name: delta['mark'] for name, delta in response.data.items()}
+
+    def test_sync_with_anonymous_user(self):
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_initial_sync_sends_everything(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(response.data), ['news', 'comments', 'exams', 'homeworks', 'materials', 'meetups']
+        )
+        self.assertTrue(all(delta['reset'] for delta in response.data.values()))
+        self.assertEqual(response.data['news']['changed'][0]['id'], self.news.id)
+        self.assertEqual(response.data['comments']['changed'][0]['news'], self.news.id)
+        self.assertEqual([exam['id'] for exam in response.data['exams']['changed']], [self.exam.id])
+        self.assertEqual(response.data['meetups']['changed'][0]['talks'][0]['id'], self.talk.id)
+
+    def test_sync_only_requested_resources(self):
+        response = self.client.get(self.url, {'exams': ''})
+
+        self.assertEqual(list(response.data), ['exams'])
+
+    def test_sync_without_changes(self):
+        marks = self.get_marks(self.client.get(self.url))
+
+        response = self.client.get(self.url, marks)
+
+        for delta in response.data.values():
+            self.assertFalse(delta['reset'])
+            self.assertEqual(delta['changed'], [])
+            self.assertEqual(delta['deleted'], [])
+
+    def test_sync_sends_changed_rows(self):
+        marks = self.get_marks(self.client.get(self.url))
+
+        self.exam.topic = 'new topic'
+        self.exam.save()
+        self.talk.topic = 'new talk'
+        self.talk.save()
+
+        response = self.client.get(self.url, marks)
+
+        self.assertEqual(response.data['exams']['changed'][0]['topic'], 'new topic')
+        self.assertEqual(response.data['meetups']['changed'][0]['talks'][0]['topic'], 'new talk')
+        self.assertEqual(response.data['news']['changed'], [])
+
+    def test_sync_sends_deleted_ids(self):
+        marks = self.get_marks(self.client.get(self.url))
+        news_id, comment_id, exam_id = self.news.id, self.comment.id, self.exam.id
+
+        self.news.delete()
+        self.exam.delete()
+        self.talk.delete()
+
+        response = self.client.get(self.url, marks)
+
+        self.assertEqual(response.data['news']['deleted'], [news_id])
+        self.assertEqual(response.data['comments']['deleted'], [comment_id])
+        self.assertEqual(response.data['exams']['deleted'], [exam_id])
+        self.assertEqual(response.data['meetups']['changed'][0]['talks'], [])
+
+    def test_sync_sends_rows_moved_out_of_scope_as_deleted(self):
+        marks = self.get_marks(self.client.get(self.url))
+
+        self.exam.clazz = self.other_clazz
+        self.exam.save()
+        self.news.class_letter = 'B'
+        self.news.save()
+
+        response = self.client.get(self.url, marks)
+
+        self.assertEqual(response.data['exams']['deleted'], [self.exam.id])
+        self.assertEqual(response.data['exams']['changed'], [])
+        self.assertEqual(response.data['news']['deleted'], [self.news.id])
+
+    def test_sync_skips_deletions_of_other_scopes(self):
+        marks = self.get_marks(self.client.get(self.url))
+
+        Exam.objects.filter(clazz=self.other_clazz).delete()
+
+        response = self.client.get(self.url, marks)
+
+        self.assertEqual(response.data['exams']['deleted'], [])
+
+    def test_sync_with_expired_mark(self):
+        mark = format_mark(timezone.now() - timedelta(days=31))
+
+        response = self.client.get(self.url, {'exams': mark})
+
+        self.assertTrue(response.data['exams']['reset'])
+        self.assertEqual(len(response.data['exams']['changed']), 1)
+
+    def test_sync_with_invalid_mark(self):
+        response = self.client.get(self.url, {'exams': 'yesterday'})
+
+        self.assertEqual(response.data['exams'], ['Invalid mark.'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sync_as_teacher(self):
+        self.client.force_authenticate(user=self.teacher_user)
+
+        response = self.client.get(self.url, {'exams': '', 'news': ''})
+
+        self.assertEqual(len(response.data['exams']['changed']), 2)
+        self.assertEqual(len(response.data['news']['changed']), 1)
+
+
+class PruneTombstonesCommandTestCase(APITestCase):
+    def test_prune_tombstones(self):
+        old = Tombstone.objects.create(resource='news', object_id=1)
+        Tombstone.objects.filter(id=old.id).update(deleted_on=timezone.now() - timedelta(days=31))
+        Tombstone.objects.create(resource='news', object_id=2)
+
+        call_command('prune_tombstones', stdout=StringIO())
+
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [2])
+
+
+class WaitViewTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('sync:wait')
+
+        self.clazz = Class.objects.create(number=10, letter='A')
+        self.student_user = User.objects.create(username='student', password='pass')
+        Student.objects.create(user=self.student_user, clazz=self.clazz)
+
+        self.news = News.objects.create(
+            title='test news', content='test content', class_number=10, class_letter='A',
+            author=self.student_user
+        )
+        self.other_news = News.objects.create(
+            title='other news', content='other content', class_number=11, class_letter='B',
+            author=self.student_user
+        )
+        self.meetup = Meetup.objects.create(date=timezone.now() + timedelta(days=7))
+
+        self.client.force_authenticate(user=self.student_user)
+
+    def test_wait_with_anonymous_user(self):
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url, {'news': self.news.id})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_wait_without_channel(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_wait_for_news_of_other_class(self):
+        response = self.client.get(self.url, {'news': self.other_news.id})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_wait_without_version(self):
+        response = self.client.get(self.url, {'news': self.news.id})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['channel'], 'news:{}'.format(self.news.id))
+        self.assertEqual(
+            response.data['version'], notifier.get_version(get_channel('news', self.news.id))
+        )
+        self.assertTrue(response.data['changed'])
+
+    def test_wait_with_stale_version(self):
+        response = self.client.get(self.url, {'meetup': self.meetup.id, 'version': 'stale'})
+
+        self.assertTrue(response.data['changed'])
+
+    def test_wait_times_out(self):
+        version = notifier.get_version(get_channel('meetup', self.meetup.id))
+
+        response = self.client.get(
+            self.url, {'meetup': self.meetup.id, 'version': version, 'timeout': 0}
+        )
+
+        self.assertEqual(response.data['version'], version)
+        self.assertFalse(response.data['changed'])
+
+
+class NotifierTestCase(APITransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='student', password='pass')
+        self.news = News.objects.create(
+            title='test news', content='test content', class_number=10, class_letter='A',
+            author=self.user
+        )
+        self.meetup = Meetup.objects.create(date=timezone.now() + timedelta(days=7))
+        self.talk = Talk.objects.create(
+            meetup=self.meetup, author=self.user, topic='test talk',
+            description='test description'
+        )
+
+    def test_wait_is_woken_by_notification(self):
+        channel = get_channel('news', self.news.id)
+        version = notifier.get_version(channel)
+        results = []
+
+        waiter = threading.Thread(
+            target=lambda: results.append(notifier.wait(channel, version, 10))
+        )
+        waiter.start()
+        notifier.notify(channel)
+        waiter.join(5)
+
+        self.assertFalse(waiter.is_alive())
+        self.assertNotEqual(results[0], version)
+
+    def test_comment_notifies_news_channel(self):
+        channel = get_channel('news', self.news.id)
+        version = notifier.get_version(channel)
+
+        Comment.objects.create(news=self.news, author=self.user, content='test comment')
+
+        self.assertNotEqual(notifier.get_version(channel), version)
+
+    def test_vote_notifies_meetup_channel(self):
+        channel = get_channel('meetup', self.meetup.id)
+        version = notifier.get_version(channel)
+
+        self.talk.votes.up(self.user.id)
+
+        self.assertNotEqual(notifier.get_version(channel), version)
@@ -0,0 +1,11 @@
+from django.conf.urls import url
+
+from . import views
+
+
+app_name = 'sync'
+
+urlpatterns = [
+    url(r'^sync/$', views.Sync.as_view(), name='sync'),
+    url(r'^sync/wait/$', views.Wait.as_view(), name='wait'),
+]
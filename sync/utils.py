@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+
+DEFAULT_SYNC_SETTINGS = {
+    'OVERLAP_SECONDS': 5,
+    'TOMBSTONE_RETENTION_DAYS': 30,
+    'WAIT_TIMEOUT': 25,
+    'MAX_WAIT_TIMEOUT': 55,
+    'CHECK_INTERVAL': 1,
+    'NOTIFY_CACHE': 'default',
+}
+
+
+def get_sync_setting(name):
+    return getattr(settings, 'SYNC', {}).get(name, DEFAULT_SYNC_SETTINGS[name])
+
+
+def format_mark(moment):
+    """
+    Marks are opaque to clients: microseconds since the epoch.
+    """
+    return str(int(moment.timestamp() * 10 ** 6))
+
+
+def parse_mark(value):
+    if not value:
+        return None
+
+    return datetime.fromtimestamp(int(value) / 10 ** 6, timezone.utc)
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+
+from django.utils import timezone
+
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from news.models import News
+from students.roles import get_role
+from talks.models import Meetup
+
+from .notifier import notifier, get_channel, release_connections
+from .resources import RESOURCES, NewsResource
+from .serializers import WaitQuerySerializer
+from .utils import get_sync_setting, parse_mark
+
+
+class Sync(generics.GenericAPIView):
+    """
+    Returns what changed in each requested resource since the client's mark.
+    Every resource passed as a query parameter is synced, e.g.
+    `?news=<mark>&exams=`; an empty mark asks for all rows. Without any
+    resource parameter everything is sent in full.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get_marks(self, request):
+        names = [name for name in RESOURCES if name in request.query_params] or list(RESOURCES)
+        marks, errors = OrderedDict(), {}
+
+        for name in names:
+            try:
+                marks[name] = parse_mark(request.query_params.get(name))
+            except (ValueError, OverflowError, OSError):
+                errors[name] = ['Invalid mark.']
+
+        if errors:
+            raise ValidationError(errors)
+
+        return marks
+
+    def get(self, request, *args, **kwargs):
+        marks = self.get_marks(request)
+        now = timezone.now()
+
+        return Response(OrderedDict(
+            (name, RESOURCES[name].get_delta(request, mark, now))
+            for name, mark in marks.items()
+        ))
+
+
+class Wait(generics.GenericAPIView):
+    """
+    Long poll for a news thread's comments (`?news=<id>`) or a meetup's
+    talks and votes (`?meetup=<id>`). The request is parked until the
+    channel's version differs from `version`, or for up to `timeout`
+    seconds, and then returns the current version; clients refetch the list
+    when `changed` is true. Without a version it returns at once.
+    """
+    permission_classes = (IsAuthenticated,)
+    serializer_class = WaitQuerySerializer
+
+    def get_channel(self, data):
+        if 'news' in data:
+            news = News.objects.all()
+
+            if get_role(self.request).is_student:
+                news = NewsResource().get_queryset(self.request)
+
+            generics.get_object_or_404(news, id=data['news'])
+
+            return get_channel('news', data['news'])
+
+        generics.get_object_or_404(Meetup, id=data['meetup'])
+
+        return get_channel('meetup', data['meetup'])
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        channel = self.get_channel(serializer.validated_data)
+        version = serializer.validated_data.get('version')
+        timeout = min(
+            serializer.validated_data.get('timeout', get_sync_setting('WAIT_TIMEOUT')),
+            get_sync_setting('MAX_WAIT_TIMEOUT')
+        )
+
+        if version:
+            release_connections()
+            current = notifier.wait(channel, version, timeout)
+        else:
+            current = notifier.get_version(channel)
+
+        return Response(OrderedDict([
+            ('channel', channel),
+            ('version', current),
+            ('changed', current != version),
+        ]))
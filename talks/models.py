@@ -7,6 +7,7 @@ from vote.models import VoteModel
 class Meetup(models.Model):
     date = models.DateTimeField()
     description = models.CharField(max_length=10000, blank=True, null=True)
+    last_edited_on = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return '{} ({})'.format(self.__class__.__name__, self.date)
@@ -21,6 +22,7 @@ class Talk(VoteModel):
     topic = models.CharField(max_length=500)
     description = models.CharField(max_length=10000)
     video_url = models.URLField(blank=True, null=True)
+    last_edited_on = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return '{} - {}'.format(self.__class__.__name__, self.topic)
@@ -13,13 +13,23 @@ class TalkSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Talk
-        fields = ('id', 'author', 'topic', 'description', 'video_url', 'votes_count', 'has_voted') 
+        fields = ('id', 'author', 'topic', 'description', 'video_url', 'votes_count', 'has_voted')
 
     def get_votes_count(self, obj):
-        return obj.votes.count()
+        votes_counts = self.context.get('votes_counts')
+
+        if votes_counts is None:
+            return obj.votes.count()
+
+        return votes_counts.get(obj.id, 0)
 
     def get_has_voted(self, obj):
-        return obj.votes.exists(self.context['request'].user.id)
+        voted_talk_ids = self.context.get('voted_talk_ids')
+
+        if voted_talk_ids is None:
+            return obj.votes.exists(self.context['request'].user.id)
+
+        return obj.id in voted_talk_ids
 
     def create(self, validated_data):
         request = self.context['request']
@@ -3,10 +3,12 @@ from datetime import timedelta
 from django.contrib.auth.models import User
 from django.utils import timezone
 
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APIClient
 from rest_framework.reverse import reverse
 from rest_framework import status
 
+from students.testing import APITestCase
+
 from .serializers import MeetupSerializer, TalkSerializer
 from .models import Meetup, Talk
 
@@ -492,3 +494,71 @@ class TalksViewSetTestCase(APITestCase):
         response = self.client.delete(reverse(self.detail_view_name, kwargs=self.first_detail_kwargs))
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class TalkVotesQueriesTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = User.objects.create(username='test', password='pass')
+        self.other_user = User.objects.create(username='other', password='pass')
+        self.meetup = Meetup.objects.create(date=timezone.now())
+
+        self.client.force_authenticate(user=self.user)
+
+    def create_talks(self, count):
+        talks = []
+
+        for i in range(count):
+            talk = Talk.objects.create(
+                meetup=self.meetup,
+                author=self.other_user,
+                topic='topic {}'.format(i),
+                description='description'
+            )
+            talk.votes.up(self.other_user.id)
+            talks.append(talk)
+
+        return talks
+
+    def test_votes_are_aggregated(self):
+        first_talk, second_talk = self.create_talks(2)
+        first_talk.votes.up(self.user.id)
+
+        response = self.client.get(
+            reverse('talks:talks-list', kwargs={'meetups_pk': self.meetup.id})
+        )
+
+        talks = {talk['id']: talk for talk in response.data['results']}
+        self.assertEqual(talks[first_talk.id]['votes_count'], 2)
+        self.assertTrue(talks[first_talk.id]['has_voted'])
+        self.assertEqual(talks[second_talk.id]['votes_count'], 1)
+        self.assertFalse(talks[second_talk.id]['has_voted'])
+
+    def test_meetups_list_query_count_does_not_grow_with_talks(self):
+        self.create_talks(1)
+        url = reverse('talks:meetups-list')
+        self.client.get(url)
+
+        with self.assertNumQueries(7):
+            self.client.get(url)
+
+        self.create_talks(5)
+
+        with self.assertNumQueries(7):
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.data['results'][0]['talks']), 6)
+
+    def test_talks_list_query_count_does_not_grow_with_talks(self):
+        self.create_talks(1)
+        url = reverse('talks:talks-list', kwargs={'meetups_pk': self.meetup.id})
+        self.client.get(url)
+
+        with self.assertNumQueries(6):
+            self.client.get(url)
+
+        self.create_talks(4)
+
+        with self.assertNumQueries(6):
+            self.client.get(url)
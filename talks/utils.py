@@ -0,0 +1,30 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count
+
+from vote.models import Vote, UP
+
+from .models import Talk
+
+
+def get_talk_votes(talks, user_id=None):
+    talk_ids = [talk.id for talk in talks]
+
+    if not talk_ids:
+        return {}, set()
+
+    votes = Vote.objects.filter(
+        content_type=ContentType.objects.get_for_model(Talk),
+        object_id__in=talk_ids,
+        action=UP
+    )
+
+    votes_counts = dict(
+        votes.order_by().values('object_id').annotate(count=Count('id')).values_list(
+            'object_id', 'count'
+        )
+    )
+    voted_talk_ids = set(
+        votes.filter(user_id=user_id).values_list('object_id', flat=True)
+    ) if user_id is not None else set()
+
+    return votes_counts, voted_talk_ids
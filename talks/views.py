@@ -2,15 +2,56 @@ from rest_framework import viewsets, status, generics
 from rest_framework.response import Response
 from rest_framework.decorators import detail_route
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from rest_framework_word_filter import FullWordSearchFilter
 
+from search.filters import FullTextSearchFilter
+from students.conditional import ConditionalResponseMixin
 from students.permissions import IsUserAuthor
 from .serializers import MeetupSerializer, TalkSerializer
 from .filters import MeetupsFilterBackend
 from .models import Meetup
+from .utils import get_talk_votes
 
 
-class MeetupsViewSet(viewsets.ModelViewSet):
+class TalkVotesListMixin(object):
+    def get_page_talks(self, objects):
+        """
+        Returns the talks whose votes the serialized objects show; by default
+        the objects are talks themselves.
+        """
+        return list(objects)
+
+    def get_votes_serializer(self, objects, many=False):
+        votes_counts, voted_talk_ids = get_talk_votes(
+            self.get_page_talks(objects if many else [objects]), user_id=self.request.user.id
+        )
+        context = dict(
+            self.get_serializer_context(),
+            votes_counts=votes_counts,
+            voted_talk_ids=voted_talk_ids
+        )
+
+        return self.get_serializer_class()(objects, many=many, context=context)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        objects = list(queryset) if page is None else page
+
+        serializer = self.get_votes_serializer(objects, many=True)
+
+        if page is None:
+            return Response(serializer.data)
+
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_votes_serializer(self.get_object())
+
+        return Response(serializer.data)
+
+
+class MeetupsViewSet(ConditionalResponseMixin, TalkVotesListMixin, viewsets.ModelViewSet):
     permission_classes_by_action = {
         'list': (IsAuthenticated,),
         'retrieve': (IsAuthenticated,),
@@ -18,9 +59,10 @@ class MeetupsViewSet(viewsets.ModelViewSet):
         'update': (IsAdminUser,),
         'destroy': (IsAdminUser,),
     }
-    queryset = Meetup.objects.all()
+    queryset = Meetup.objects.prefetch_related('talks__author')
     filter_backends = (MeetupsFilterBackend,)
     serializer_class = MeetupSerializer
+    timestamp_fields = ('last_edited_on', 'talks__last_edited_on')
 
     def get_permissions(self):
         return [
@@ -29,8 +71,11 @@ class MeetupsViewSet(viewsets.ModelViewSet):
             in self.permission_classes_by_action[self.action]
         ]
 
+    def get_page_talks(self, objects):
+        return [talk for meetup in objects for talk in meetup.talks.all()]
+
 
-class TalksViewSet(viewsets.ModelViewSet):
+class TalksViewSet(ConditionalResponseMixin, TalkVotesListMixin, viewsets.ModelViewSet):
     permission_classes_by_action = {
         'list': (IsAuthenticated,),
         'retrieve': (IsAuthenticated,),
@@ -41,8 +86,8 @@ class TalksViewSet(viewsets.ModelViewSet):
         'destroy': (IsAdminUser,),
     }
     serializer_class = TalkSerializer
-    filter_backends = (FullWordSearchFilter,)
-    word_filters = ('topic', 'author__username')
+    filter_backends = (FullTextSearchFilter,)
+    timestamp_fields = ('last_edited_on',)
 
     def get_permissions(self):
         return [
@@ -52,11 +97,14 @@ class TalksViewSet(viewsets.ModelViewSet):
         ]
 
     def get_related_meetup(self):
-        return generics.get_object_or_404(Meetup, id=self.kwargs['meetups_pk'])
+        if not hasattr(self, 'meetup'):
+            self.meetup = generics.get_object_or_404(Meetup, id=self.kwargs['meetups_pk'])
+
+        return self.meetup
 
     def get_queryset(self):
         meetup = self.get_related_meetup()
-        return meetup.talks.all()
+        return meetup.talks.select_related('author')
 
     def get_object(self):
         return generics.get_object_or_404(self.get_queryset(), id=self.kwargs['pk'])